@@ -18,12 +18,15 @@ def main():
 
     running = True
     while running:
-        if client.has_new_frame:
-            texture = client.new_frame_image
-            image = copy_mtl_texture_to_image(texture)
+        frame = client.wait_for_frame(timeout=1.0)
+        if frame is None:
+            continue
 
-            cv2.imshow("Image", image)
-            cv2.waitKey(1)
+        texture, metadata = frame
+        image = copy_mtl_texture_to_image(texture)
+
+        cv2.imshow("Image", image)
+        cv2.waitKey(1)
 
     client.stop()
 
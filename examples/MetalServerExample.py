@@ -7,6 +7,7 @@ import syphon
 def main():
     print("starting server...")
     server = syphon.SyphonMetalServer("Metal Test")
+    server.set_target_fps(60)
 
     # create texture and load image onto texture
     texture_width, texture_height = 640, 480
@@ -40,8 +41,8 @@ def main():
             bytes_per_row
         )
 
-        # publish texture
-        server.publish_frame_texture(metal_texture)
+        # publish texture (paced to 60 fps)
+        server.publish_frame(metal_texture)
 
     server.stop()
 
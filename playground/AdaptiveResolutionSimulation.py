@@ -0,0 +1,48 @@
+import argparse
+import itertools
+import random
+
+from syphon.adaptive import ResolutionController
+
+
+def simulate(controller: ResolutionController, loads, overhead: float, jitter: float):
+    """
+    Drive the controller with synthetic frame times, which grow with the pixel count of the current scale.
+    """
+    scales = []
+    for load in loads:
+        frame_time = load * controller.scale ** 2 + overhead
+        frame_time *= 1.0 + random.uniform(-jitter, jitter)
+        scales.append(controller.update(frame_time))
+    return scales
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the adaptive resolution controller.")
+    parser.add_argument("--fps", type=float, default=60.0, help="Target frame rate.")
+    parser.add_argument("--idle", type=float, default=0.010, help="Full resolution frame time while idle.")
+    parser.add_argument("--busy", type=float, default=0.030, help="Full resolution frame time under load.")
+    parser.add_argument("--overhead", type=float, default=0.001, help="Frame time independent of the resolution.")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Relative noise of the frame times.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    controller = ResolutionController(1.0 / args.fps)
+
+    # idle, saturated, idle again
+    loads = [args.idle] * 120 + [args.busy] * 300 + [args.idle] * 300
+    scales = simulate(controller, loads, args.overhead, args.jitter)
+
+    for scale, group in itertools.groupby(scales):
+        print(f"{scale:>5.0%} for {len(list(group))} frames")
+
+    stats = controller.stats
+    print(f"step downs: {stats.step_downs}, step ups: {stats.step_ups}, final scale: {stats.scale:.0%}")
+
+    ok = scales[119] == 1.0 and min(scales[120:420]) < 1.0 and scales[-1] == 1.0
+    print("passed" if ok else "FAILED")
+
+
+if __name__ == "__main__":
+    main()
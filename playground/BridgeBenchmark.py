@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import numpy as np
+
+from syphon.bridge import FrameSender, FrameReceiver, LatestFrameSink, ZlibCodec, FrameInfo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback throughput and latency of the frame bridge.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--unix", type=str, default=None, help="Unix socket path instead of TCP loopback.")
+    parser.add_argument("--zlib", action="store_true", help="Use the zlib codec.")
+    parser.add_argument("--blocking", action="store_true", help="Send without the latest-frame thread.")
+    args = parser.parse_args()
+
+    latencies = []
+
+    def sink(image: np.ndarray, info: FrameInfo):
+        latencies.append(info.received_at - info.timestamp)
+
+    codec = ZlibCodec() if args.zlib else None
+    address = args.unix if args.unix is not None else ("127.0.0.1", 0)
+
+    receiver = FrameReceiver(address, sink, codec)
+    receiver.start()
+
+    sender = FrameSender(receiver.address, codec, threaded=not args.blocking)
+    image = np.random.randint(0, 255, (args.height, args.width, 4), dtype=np.uint8)
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        sender.send(image)
+
+    # wait until the last sent frame arrived
+    sender.flush()
+    while receiver.frames_received < sender.frames_sent:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+
+    sender.close()
+    receiver.close()
+
+    mb = receiver.bytes_received / 1024 / 1024
+    print(f"received {receiver.frames_received}/{args.frames} frames "
+          f"(dropped {sender.frames_dropped}) in {elapsed:.3f}s")
+    print(f"throughput: {receiver.frames_received / elapsed:.1f} fps, {mb / elapsed:.1f} MB/s")
+    print(f"latency: mean {np.mean(latencies) * 1000:.2f}ms, "
+          f"p99 {np.percentile(latencies, 99) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
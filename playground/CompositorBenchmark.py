@@ -0,0 +1,79 @@
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from syphon.compositor import BlendMode, Compositor
+
+
+def create_compositor(width: int, height: int, layer_count: int) -> Compositor:
+    rng = np.random.default_rng(0)
+    compositor = Compositor(width, height)
+    modes = list(BlendMode)
+
+    for i in range(layer_count):
+        compositor.add_layer(i, x=(i % 4) * width // 8, y=(i // 4) * height // 8, opacity=0.8,
+                             blend=modes[i % len(modes)])
+        compositor.update(i, rng.integers(0, 256, (height, width, 4), dtype=np.uint8))
+
+    return compositor
+
+
+def naive_compose(width: int, height: int, images: List[np.ndarray]) -> np.ndarray:
+    """
+    Float blending with temporary arrays, as a baseline (normal blend mode only).
+    """
+    output = np.zeros((height, width, 4), dtype=np.float32)
+    output[..., 3] = 255
+
+    for image in images:
+        src = image.astype(np.float32)
+        alpha = src[..., 3:4] / 255.0 * 0.8
+        output = src * alpha + output * (1.0 - alpha)
+
+    return output.astype(np.uint8)
+
+
+def measure(compose, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compose()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the NumPy compositor.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    for layer_count in (4, 8):
+        compositor = create_compositor(args.width, args.height, layer_count)
+        images = [compositor._images[i] for i in range(layer_count)]
+
+        def all_changed():
+            for i in range(layer_count):
+                compositor.update(i, images[i])
+            compositor.compose()
+
+        def one_changed():
+            compositor.update(0, images[0])
+            compositor.compose()
+
+        compositor.compose()
+        timings = {
+            "naive float": measure(lambda: naive_compose(args.width, args.height, images), args.iterations),
+            "all inputs changed": measure(all_changed, args.iterations),
+            "one input changed": measure(one_changed, args.iterations),
+            "nothing changed": measure(compositor.compose, args.iterations),
+        }
+
+        print(f"{layer_count} layers at {args.width}x{args.height}:")
+        for label, duration in timings.items():
+            print(f"{label:>22}: {duration * 1000:8.2f}ms ({1.0 / duration:8.1f} fps)")
+
+
+if __name__ == "__main__":
+    main()
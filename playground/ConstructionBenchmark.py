@@ -0,0 +1,71 @@
+import argparse
+import time
+
+import numpy as np
+import objc
+
+import syphon
+from syphon.resources import get_resource_registry
+
+
+def measure(construct, iterations: int) -> np.ndarray:
+    timings = np.empty(iterations, dtype=np.float64)
+
+    for i in range(iterations):
+        start = time.perf_counter()
+        instance = construct()
+        timings[i] = time.perf_counter() - start
+        instance.stop()
+
+    return timings
+
+
+def report(label: str, timings: np.ndarray):
+    print(f"{label:>26}: mean {timings.mean() * 1e6:8.1f}us, "
+          f"median {np.median(timings) * 1e6:8.1f}us, p99 {np.percentile(timings, 99) * 1e6:8.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construction time of servers and clients with and without "
+                                                 "shared resources.")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    # warm up the framework and the caches
+    syphon.SyphonMetalServer("Warmup").stop()
+
+    isolated = measure(lambda: syphon.SyphonMetalServer("Isolated", share_resources=False), args.iterations)
+    shared = measure(lambda: syphon.SyphonMetalServer("Shared"), args.iterations)
+
+    report("server (isolated)", isolated)
+    report("server (shared)", shared)
+    print(f"server speedup: {isolated.mean() / shared.mean():.2f}x")
+
+    source = syphon.SyphonMetalServer("Construction Benchmark")
+    description = syphon.SyphonServerDirectory().servers_matching_name(name="Construction Benchmark")
+    if description:
+        isolated = measure(lambda: syphon.SyphonMetalClient(description[0], share_resources=False), args.iterations)
+        shared = measure(lambda: syphon.SyphonMetalClient(description[0]), args.iterations)
+
+        report("client (isolated)", isolated)
+        report("client (shared)", shared)
+        print(f"client speedup: {isolated.mean() / shared.mean():.2f}x")
+    else:
+        print("benchmark server not found in the directory, skipping clients")
+    source.stop()
+
+    class_lookup = np.array([_time(lambda: objc.lookUpClass("SyphonMetalServer")) for _ in range(args.iterations)])
+    cached_lookup = np.array([_time(lambda: get_resource_registry().lookup_class("SyphonMetalServer"))
+                              for _ in range(args.iterations)])
+    report("objc.lookUpClass", class_lookup)
+    report("cached lookup_class", cached_lookup)
+
+
+def _time(call) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import time
+
+import numpy as np
+
+import syphon
+from syphon.utils.raw import create_mtl_texture
+
+
+def measure(publish, iterations: int) -> np.ndarray:
+    timings = np.empty(iterations, dtype=np.float64)
+
+    for i in range(iterations):
+        start = time.perf_counter()
+        publish()
+        timings[i] = time.perf_counter() - start
+
+    return timings
+
+
+def report(label: str, timings: np.ndarray):
+    print(f"{label:>22}: mean {timings.mean() * 1e6:7.1f}us, "
+          f"median {np.median(timings) * 1e6:7.1f}us, p99 {np.percentile(timings, 99) * 1e6:7.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call overhead of publish_frame_texture and prepared handles.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--no-commit", action="store_true",
+                        help="Encode into one command buffer without committing to isolate the bridge overhead.")
+    args = parser.parse_args()
+
+    server = syphon.SyphonMetalServer("Publish Benchmark")
+    texture = create_mtl_texture(server.device, args.width, args.height)
+    handle = server.prepare(texture)
+
+    if args.no_commit:
+        command_buffer = server.command_queue.commandBuffer()
+        baseline = measure(lambda: server.publish_frame_texture(texture, command_buffer=command_buffer,
+                                                                auto_commit=False), args.iterations)
+        prepared = measure(lambda: handle.publish(command_buffer, auto_commit=False), args.iterations)
+    else:
+        baseline = measure(lambda: server.publish_frame_texture(texture), args.iterations)
+        prepared = measure(handle.publish, args.iterations)
+
+    report("publish_frame_texture", baseline)
+    report("prepared publish", prepared)
+    print(f"speedup: {baseline.mean() / prepared.mean():.2f}x")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import numpy as np
+
+from syphon.utils.yuv import YUVConverter, YUVStandard, split_i420
+
+# (y, cb, cr) -> rgb reference values of 100% colour bars
+REFERENCE_VALUES = [
+    (YUVStandard.BT709, False, (235, 128, 128), (255, 255, 255)),
+    (YUVStandard.BT709, False, (16, 128, 128), (0, 0, 0)),
+    (YUVStandard.BT709, False, (63, 102, 240), (255, 0, 0)),
+    (YUVStandard.BT709, False, (173, 42, 26), (0, 255, 0)),
+    (YUVStandard.BT709, False, (32, 240, 118), (0, 0, 255)),
+    (YUVStandard.BT601, False, (81, 90, 240), (255, 0, 0)),
+    (YUVStandard.BT601, False, (145, 54, 34), (0, 255, 0)),
+    (YUVStandard.BT601, True, (76, 85, 255), (255, 0, 0)),
+    (YUVStandard.BT601, True, (255, 128, 128), (255, 255, 255)),
+]
+
+
+def check_reference_values():
+    for standard, full_range, (y, cb, cr), expected in REFERENCE_VALUES:
+        converter = YUVConverter(standard, full_range)
+        rgba = converter.i420_to_rgba(np.full((2, 2), y, np.uint8), np.full((1, 1), cb, np.uint8),
+                                      np.full((1, 1), cr, np.uint8))
+        error = np.abs(rgba[0, 0, :3].astype(np.int32) - expected).max()
+
+        status = "ok" if error <= 2 else "FAILED"
+        print(f"{standard.name} {'full' if full_range else 'limited'} {(y, cb, cr)} -> "
+              f"{tuple(rgba[0, 0, :3].tolist())} (expected {expected}): {status}")
+
+
+def measure(label: str, convert, iterations: int):
+    convert()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        convert()
+    elapsed = (time.perf_counter() - start) / iterations
+
+    print(f"{label:>5}: {elapsed * 1000:.2f}ms ({1 / elapsed:.1f} fps)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Correctness and speed of the NumPy YUV to RGBA converters.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    check_reference_values()
+
+    width, height = args.width, args.height
+    frame = np.random.randint(0, 255, width * height * 3 // 2, dtype=np.uint8)
+    uyvy = np.random.randint(0, 255, (height, width * 2), dtype=np.uint8)
+    y, u, v = split_i420(frame, width, height)
+    uv = np.stack([u, v], axis=-1)
+
+    converter = YUVConverter(YUVStandard.BT709)
+    out = np.empty((height, width, 4), dtype=np.uint8)
+
+    print(f"converting {width}x{height}:")
+    measure("nv12", lambda: converter.nv12_to_rgba(y, uv, out), args.iterations)
+    measure("i420", lambda: converter.i420_to_rgba(y, u, v, out), args.iterations)
+    measure("uyvy", lambda: converter.uyvy_to_rgba(uyvy, out), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,11 @@
 
 from pathlib import Path
 
-import objc
+try:
+    import objc
+except ImportError:
+    # pyobjc is only available on macOS, the pure python helpers can still be used without it
+    objc = None
 
 _SYPHON_LIBS_PATH = Path(__file__).parent.joinpath("libs")
 
@@ -22,9 +26,14 @@ def _load_lib_bundle(bundle_name: str, scan_classes: bool = False):
     objc.loadBundle(f"{bundle_name}", globals(), bundle_path=str(framework_path), scan_classes=scan_classes)
 
 
-# initialize syphon bundle
-_load_lib_bundle("Syphon")
+if objc is not None:
+    # initialize syphon bundle
+    _load_lib_bundle("Syphon")
 
-from syphon.server import BaseSyphonServer, SyphonMetalServer, SyphonOpenGLServer
-from syphon.server_directory import SyphonServerDirectory, SyphonServerNotification, SyphonServerDescription
-from syphon.client import BaseSyphonClient, SyphonMetalClient, SyphonOpenGLClient
\ No newline at end of file
+    from syphon.server import SyphonMetalServer, SyphonOpenGLServer
+    from syphon.server_directory import SyphonServerDirectory, SyphonServerNotification
+    from syphon.client import SyphonMetalClient, SyphonOpenGLClient
+
+from syphon.base import BaseSyphonServer, BaseSyphonClient
+from syphon.server_description import SyphonServerDescription
+from syphon.loopback import SyphonLoopbackServer, SyphonLoopbackClient
@@ -0,0 +1,323 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from syphon.types import Size
+
+DEFAULT_SCALES = (1.0, 0.75, 0.5)
+"""
+The default resolution steps of the adaptive publishing.
+"""
+
+
+@dataclass
+class ResolutionStats:
+    """
+    Statistics of a resolution controller.
+
+    Attributes:
+    - scale (float): The current resolution scale.
+    - level (int): The index of the current scale.
+    - frames (int): The number of measured frames.
+    - frame_time (float): The smoothed frame time in seconds.
+    - budget (float): The frame time budget in seconds.
+    - step_downs (int): The number of times the resolution has been reduced.
+    - step_ups (int): The number of times the resolution has been increased.
+    """
+    scale: float = 1.0
+    level: int = 0
+    frames: int = 0
+    frame_time: float = 0.0
+    budget: float = 0.0
+    step_downs: int = 0
+    step_ups: int = 0
+
+
+class ResolutionController:
+    """
+    Chooses the published resolution from measured frame times.
+
+    The frame times are smoothed with an exponential moving average. If the average exceeds the budget for
+    `down_frames` consecutive frames, the next lower scale is chosen. Stepping up is predicted with the pixel
+    count, since the cost of a frame grows with it: the resolution is only increased if the predicted frame time
+    at the next higher scale stays below `headroom * budget` for `up_frames` consecutive frames. This hysteresis
+    prevents the resolution from oscillating between two steps.
+
+    The controller has no dependencies, so it can be driven with synthetic timings.
+
+    Attributes:
+    - budget (float): The frame time budget in seconds.
+    - scales (Tuple[float, ...]): The resolution scales from highest to lowest.
+    - smoothing (float): The weight of a new frame time in the moving average.
+    - down_frames (int): The number of frames over budget before stepping down.
+    - up_frames (int): The number of frames with headroom before stepping up.
+    - headroom (float): The fraction of the budget the predicted frame time has to stay below to step up.
+    """
+
+    def __init__(self,
+                 budget: float,
+                 scales: Sequence[float] = DEFAULT_SCALES,
+                 smoothing: float = 0.2,
+                 down_frames: int = 3,
+                 up_frames: int = 60,
+                 headroom: float = 0.75):
+        """
+        Initialize a ResolutionController.
+
+        Parameters:
+        - budget (float): The frame time budget in seconds, e.g. 1 / 60.
+        - scales (Sequence[float], optional): The resolution scales from highest to lowest. Defaults to 100%, 75%
+          and 50%.
+        - smoothing (float, optional): The weight of a new frame time in the moving average. Defaults to 0.2.
+        - down_frames (int, optional): The number of frames over budget before stepping down. Defaults to 3.
+        - up_frames (int, optional): The number of frames with headroom before stepping up. Defaults to 60.
+        - headroom (float, optional): The fraction of the budget the predicted frame time has to stay below
+          to step up. Defaults to 0.75.
+
+        Raises:
+        - ValueError: If the budget is not positive or the scales are not descending.
+        """
+        if budget <= 0:
+            raise ValueError("The frame time budget has to be positive.")
+
+        if not scales or any(a <= b for a, b in zip(scales, scales[1:])) or scales[-1] <= 0:
+            raise ValueError("The scales have to be positive and in descending order.")
+
+        self.budget = budget
+        self.scales = tuple(scales)
+        self.smoothing = smoothing
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.headroom = headroom
+
+        self._stats = ResolutionStats(budget=budget)
+        self._average: Optional[float] = None
+        self._over = 0
+        self._under = 0
+
+    @property
+    def level(self) -> int:
+        """
+        Get the index of the current scale.
+
+        Returns:
+        - int: The index into `scales`.
+        """
+        return self._stats.level
+
+    @property
+    def scale(self) -> float:
+        """
+        Get the current resolution scale.
+
+        Returns:
+        - float: The scale.
+        """
+        return self.scales[self._stats.level]
+
+    @property
+    def stats(self) -> ResolutionStats:
+        """
+        Get the statistics of the controller.
+
+        Returns:
+        - ResolutionStats: A snapshot of the statistics.
+        """
+        s = self._stats
+        return ResolutionStats(self.scale, s.level, s.frames, self._average or 0.0, self.budget,
+                               s.step_downs, s.step_ups)
+
+    def update(self, frame_time: float) -> float:
+        """
+        Record the time of a frame and choose the scale of the next one.
+
+        Parameters:
+        - frame_time (float): The measured frame time in seconds (e.g. upload and publish).
+
+        Returns:
+        - float: The scale for the next frame.
+        """
+        stats = self._stats
+        stats.frames += 1
+
+        if self._average is None:
+            self._average = frame_time
+        else:
+            self._average += self.smoothing * (frame_time - self._average)
+
+        level = stats.level
+
+        # step down if the budget is exceeded repeatedly
+        if self._average > self.budget and level < len(self.scales) - 1:
+            self._over += 1
+            self._under = 0
+
+            if self._over >= self.down_frames:
+                self._step(level + 1)
+                stats.step_downs += 1
+            return self.scale
+
+        self._over = 0
+
+        # step up if the predicted frame time at the higher scale leaves enough headroom
+        if level > 0 and self._predict(level - 1) < self.headroom * self.budget:
+            self._under += 1
+
+            if self._under >= self.up_frames:
+                self._step(level - 1)
+                stats.step_ups += 1
+        else:
+            self._under = 0
+
+        return self.scale
+
+    def scaled_size(self, width: int, height: int) -> Size:
+        """
+        Get the size of a frame at the current scale.
+
+        Parameters:
+        - width (int): The full width.
+        - height (int): The full height.
+
+        Returns:
+        - Size: The scaled size (width, height), at least one pixel.
+        """
+        scale = self.scale
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def reset(self):
+        """
+        Return to the highest scale and reset the statistics.
+        """
+        self._stats = ResolutionStats(budget=self.budget)
+        self._average = None
+        self._over = 0
+        self._under = 0
+
+    def _predict(self, level: int) -> float:
+        ratio = self.scales[level] / self.scale
+        return self._average * ratio * ratio
+
+    def _step(self, level: int):
+        # the frame time scales with the pixel count of the new resolution
+        self._average = self._predict(level)
+        self._stats.level = level
+        self._over = 0
+        self._under = 0
+
+
+class AdaptiveMetalPublisher:
+    """
+    Publishes frames with a `SyphonMetalServer` at a resolution chosen by a `ResolutionController`.
+
+    The controller is fed the GPU execution time of the command buffer that publishes a frame (reported by its
+    completed handler) plus the time spent uploading it, so a saturated GPU is detected even though publishing
+    returns as soon as the command buffer is submitted. Below full scale, the frame is downscaled on the GPU into a
+    pooled texture within the command buffer that publishes it.
+
+    Attributes:
+    - server (SyphonMetalServer): The server to publish with.
+    - controller (ResolutionController): The controller choosing the resolution.
+    - scaler (MetalTextureScaler): The GPU scaler.
+    """
+
+    def __init__(self,
+                 server: Any,
+                 budget: Optional[float] = None,
+                 scales: Sequence[float] = DEFAULT_SCALES,
+                 controller: Optional[ResolutionController] = None):
+        """
+        Initialize an AdaptiveMetalPublisher.
+
+        Parameters:
+        - server (SyphonMetalServer): The server to publish with.
+        - budget (float, optional): The frame time budget in seconds. Defaults to the frame interval of the
+          server's target frame rate, or 1 / 60.
+        - scales (Sequence[float], optional): The resolution scales from highest to lowest.
+        - controller (ResolutionController, optional): A preconfigured controller, which overrides the budget
+          and scales.
+        """
+        from syphon.utils.metal import MetalTextureScaler
+
+        if budget is None:
+            budget = 1.0 / server.pacer.fps if server.pacer is not None else 1.0 / 60.0
+
+        self.server = server
+        self.controller = ResolutionController(budget, scales) if controller is None else controller
+        self.scaler = MetalTextureScaler(server.device, owner=f"server:{server.name}")
+
+        self._upload_texture: Any = None
+
+        # the completed handlers update the controller from a Metal thread
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ResolutionStats:
+        """
+        Get the statistics of the controller, including the current scale.
+
+        Returns:
+        - ResolutionStats: The statistics.
+        """
+        with self._lock:
+            return self.controller.stats
+
+    def publish(self, texture: Any, is_flipped: bool = False, upload_time: float = 0.0) -> float:
+        """
+        Publish a texture at the current scale.
+
+        Parameters:
+        - texture (Any): The full resolution Metal texture.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        - upload_time (float, optional): The time in seconds spent filling the texture, which is added to the
+          measured GPU time. Defaults to 0.
+
+        Returns:
+        - float: The scale the frame has been published at.
+        """
+        with self._lock:
+            scale = self.controller.scale
+            size = self.controller.scaled_size(texture.width(), texture.height())
+
+        command_buffer = self.server.command_queue.commandBuffer()
+        command_buffer.addCompletedHandler_(self._create_completed_handler(upload_time))
+
+        if scale != 1.0:
+            texture = self.scaler.scale(command_buffer, texture, *size)
+
+        self.server.publish_frame_texture(texture, is_flipped=is_flipped, command_buffer=command_buffer)
+        return scale
+
+    def publish_image(self, image: Any, is_flipped: bool = False) -> float:
+        """
+        Upload a NumPy image into a pooled full resolution texture and publish it at the current scale.
+
+        Parameters:
+        - image (np.ndarray): The RGBA image of shape (height, width, 4).
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+
+        Returns:
+        - float: The scale the frame has been published at.
+        """
+        from syphon.utils.numpy import copy_image_to_mtl_texture
+        from syphon.utils.raw import create_mtl_texture
+
+        start = time.perf_counter()
+        height, width = image.shape[:2]
+
+        texture = self._upload_texture
+        if texture is None or (texture.width(), texture.height()) != (width, height):
+            texture = create_mtl_texture(self.server.device, width, height, owner=f"server:{self.server.name}")
+            self._upload_texture = texture
+
+        copy_image_to_mtl_texture(image, texture)
+        return self.publish(texture, is_flipped, upload_time=time.perf_counter() - start)
+
+    def _create_completed_handler(self, upload_time: float) -> Callable[[Any], None]:
+        def handler(command_buffer: Any):
+            gpu_time = max(0.0, command_buffer.GPUEndTime() - command_buffer.GPUStartTime())
+            with self._lock:
+                self.controller.update(upload_time + gpu_time)
+
+        return handler
@@ -0,0 +1,249 @@
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from syphon.server_description import SyphonServerDescription
+from syphon.server_directory import SyphonServerDirectory, SyphonServerNotification
+
+ServerEvent = Tuple[SyphonServerNotification, SyphonServerDescription]
+
+
+class AsyncSyphonServerDirectory:
+    """
+    Asyncio integration of the `SyphonServerDirectory`.
+
+    Instead of blocking a thread in the run loop, the run loop is pumped without waiting from a task on the event
+    loop in short slices. The slice starts at `min_interval` whenever a directory event arrives and backs off
+    to `max_interval` while the directory is idle, so discovery latency stays in the range of milliseconds.
+    The event loop has to run on the thread the directory notifications are delivered on (usually the main thread).
+
+    Attributes:
+    - directory (SyphonServerDirectory): The wrapped directory.
+    - min_interval (float): The shortest pump interval in seconds.
+    - max_interval (float): The longest pump interval in seconds.
+    """
+
+    def __init__(self,
+                 directory: Optional[SyphonServerDirectory] = None,
+                 min_interval: float = 0.001,
+                 max_interval: float = 0.05):
+        """
+        Initialize an AsyncSyphonServerDirectory.
+
+        Parameters:
+        - directory (SyphonServerDirectory, optional): The directory to wrap. If None, a new one is created.
+        - min_interval (float, optional): The shortest pump interval in seconds. Defaults to 0.001.
+        - max_interval (float, optional): The longest pump interval in seconds. Defaults to 0.05.
+        """
+        self.directory = SyphonServerDirectory() if directory is None else directory
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._interval = min_interval
+        self._event_count = 0
+        self._queues: List[asyncio.Queue] = []
+        self._observers: List[Any] = []
+        self._observer_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handler_observers: List[Any] = []
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the run loop is being pumped.
+
+        Returns:
+        - bool: True if the pump task is running, False otherwise.
+        """
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """
+        Start pumping the run loop on the running event loop.
+        """
+        if self.is_running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._register_observers()
+        self._task = self._loop.create_task(self._pump())
+
+    async def stop(self):
+        """
+        Stop pumping the run loop and remove all observers, including the ones added with `add_observer()`.
+        """
+        self._remove_observers(self._observers)
+        self._remove_observers(self._handler_observers)
+        self._observer_loop = None
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def __aenter__(self) -> "AsyncSyphonServerDirectory":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def servers(self) -> List[SyphonServerDescription]:
+        """
+        Get a list of Syphon servers in the directory, after processing the pending directory events.
+
+        Returns:
+        - List[SyphonServerDescription]: A list of SyphonServerDescription objects.
+        """
+        self.pump()
+        return self.directory.current_servers()
+
+    async def servers_matching_name(self,
+                                    name: Optional[str] = None,
+                                    app_name: Optional[str] = None) -> List[SyphonServerDescription]:
+        """
+        Get a list of Syphon servers that match the specified name or application name.
+
+        Parameters:
+        - name (Optional[str]): The name to match.
+        - app_name (Optional[str]): The application name to match.
+
+        Returns:
+        - List[SyphonServerDescription]: A list of SyphonServerDescription objects that match the criteria.
+        """
+        return [s for s in await self.servers()
+                if (name is not None and name == s.name) or (app_name is not None and app_name == s.app_name)]
+
+    async def add_observer(self, notification: SyphonServerNotification, handler: Callable[[Any], Any]):
+        """
+        Add an observer for a Syphon server notification, which is called on the event loop.
+        The observer is removed by `stop()`.
+
+        Parameters:
+        - notification (SyphonServerNotification): The notification to observe.
+        - handler (Callable[[Any], Any]): The handler called with the notification. Coroutine functions are
+          scheduled as tasks.
+        """
+        loop = asyncio.get_running_loop()
+
+        def observer(event: Any):
+            self._event_count += 1
+            if inspect.iscoroutinefunction(handler):
+                _call_soon(loop, lambda: loop.create_task(handler(event)))
+            else:
+                _call_soon(loop, handler, event)
+
+        self._handler_observers.append(self.directory.add_observer(notification, observer))
+
+    async def events(self) -> AsyncIterator[ServerEvent]:
+        """
+        Iterate over the directory events as they arrive.
+
+        Returns:
+        - AsyncIterator[ServerEvent]: The notification and the description of the server.
+        """
+        self.start()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.remove(queue)
+
+    async def wait_for(self,
+                       notification: SyphonServerNotification,
+                       predicate: Optional[Callable[[SyphonServerDescription], bool]] = None,
+                       timeout: Optional[float] = None) -> SyphonServerDescription:
+        """
+        Wait for a directory event, e.g. for a server with a certain name to be announced.
+
+        Parameters:
+        - notification (SyphonServerNotification): The notification to wait for.
+        - predicate (Callable[[SyphonServerDescription], bool], optional): A condition the server has to match.
+        - timeout (float, optional): The maximum time to wait in seconds. None waits forever.
+
+        Returns:
+        - SyphonServerDescription: The description of the server.
+
+        Raises:
+        - asyncio.TimeoutError: If no matching event arrives in time.
+        """
+
+        async def wait() -> SyphonServerDescription:
+            events = self.events()
+            try:
+                async for event, description in events:
+                    if event == notification and (predicate is None or predicate(description)):
+                        return description
+            finally:
+                # unregister the queue right away instead of when the generator is collected
+                await events.aclose()
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    def pump(self) -> bool:
+        """
+        Process the pending directory events without waiting.
+
+        Returns:
+        - bool: True if events have been processed, False otherwise.
+        """
+        count = self._event_count
+        self.directory.update_run_loop(0)
+        return self._event_count != count
+
+    async def _pump(self):
+        while True:
+            if self.pump():
+                self._interval = self.min_interval
+            else:
+                self._interval = min(self._interval * 2, self.max_interval)
+
+            await asyncio.sleep(self._interval)
+
+    def _register_observers(self):
+        loop = self._loop
+        if self._observer_loop is loop:
+            return
+
+        # observers of a previous event loop would only deliver to a closed loop
+        self._remove_observers(self._observers)
+        self._observer_loop = loop
+
+        for notification in SyphonServerNotification:
+            def observer(event: Any, notification: SyphonServerNotification = notification):
+                self._event_count += 1
+                description = SyphonServerDescription.from_raw(event.userInfo())
+                if notification == SyphonServerNotification.Retire:
+                    SyphonServerDescription.forget_interned(description.uuid)
+                _call_soon(loop, self._dispatch, (notification, description))
+
+            self._observers.append(self.directory.add_observer(notification, observer))
+
+    def _remove_observers(self, observers: List[Any]):
+        for token in observers:
+            self.directory.remove_observer(token)
+        observers.clear()
+
+    def _dispatch(self, event: ServerEvent):
+        for queue in self._queues:
+            queue.put_nowait(event)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args: Any):
+    # notifications may still arrive after the event loop has been closed, they are ignored
+    if loop.is_closed():
+        return
+
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
@@ -0,0 +1,377 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from syphon.types import Region
+
+
+@dataclass
+class _Shelf:
+    y: int
+    height: int
+    x: int = 0
+
+
+class ShelfPacker:
+    """
+    Packs rectangles into a fixed area row by row ("shelves").
+
+    A rectangle is placed on the shelf with the least wasted height that still has room for it. If there is
+    none, a new shelf is opened below the last one. Shelf packing is well suited for many tiles of similar size,
+    like thumbnails.
+
+    Attributes:
+    - width (int): The width of the area.
+    - height (int): The height of the area.
+    - padding (int): The gap in pixels between packed rectangles.
+    """
+
+    def __init__(self, width: int, height: int, padding: int = 0):
+        """
+        Initialize a ShelfPacker.
+
+        Parameters:
+        - width (int): The width of the area.
+        - height (int): The height of the area.
+        - padding (int, optional): The gap in pixels between packed rectangles. Defaults to 0.
+        """
+        self.width = width
+        self.height = height
+        self.padding = padding
+
+        self._shelves: List[_Shelf] = []
+
+    def pack(self, width: int, height: int) -> Optional[Region]:
+        """
+        Find a place for a rectangle.
+
+        Parameters:
+        - width (int): The width of the rectangle.
+        - height (int): The height of the rectangle.
+
+        Returns:
+        - Optional[Region]: The region (x, y, width, height) of the rectangle, or None if the area is full.
+        """
+        padded_width, padded_height = width + self.padding, height + self.padding
+
+        best: Optional[_Shelf] = None
+        for shelf in self._shelves:
+            if shelf.height >= padded_height and shelf.x + width <= self.width:
+                if best is None or shelf.height < best.height:
+                    best = shelf
+
+        if best is None:
+            y = 0 if not self._shelves else self._shelves[-1].y + self._shelves[-1].height
+            if y + height > self.height or width > self.width:
+                return None
+
+            best = _Shelf(y, padded_height)
+            self._shelves.append(best)
+
+        region = (best.x, best.y, width, height)
+        best.x += padded_width
+        return region
+
+    def reset(self):
+        """
+        Remove all packed rectangles.
+        """
+        self._shelves.clear()
+
+
+@dataclass
+class AtlasTile:
+    """
+    A tile of an atlas.
+
+    Attributes:
+    - key (Hashable): The key of the tile, e.g. the name of the feed.
+    - region (Region): The region (x, y, width, height) of the tile in the atlas.
+    """
+    key: Hashable
+    region: Region
+
+
+@dataclass
+class _DirtyRect:
+    x0: int = 0
+    y0: int = 0
+    x1: int = 0
+    y1: int = 0
+    empty: bool = True
+
+    def add(self, region: Region):
+        x, y, width, height = region
+        if self.empty:
+            self.x0, self.y0, self.x1, self.y1 = x, y, x + width, y + height
+            self.empty = False
+        else:
+            self.x0, self.y0 = min(self.x0, x), min(self.y0, y)
+            self.x1, self.y1 = max(self.x1, x + width), max(self.y1, y + height)
+
+
+class ImageAtlas:
+    """
+    Packs many small RGBA images into one large NumPy image.
+
+    Tiles are placed with a `ShelfPacker` when they are added. Updating a tile copies the image into the atlas
+    and extends the dirty region, which is the bounding box of all tiles changed since the last `clear_dirty()`.
+
+    Attributes:
+    - width (int): The width of the atlas.
+    - height (int): The height of the atlas.
+    - image (np.ndarray): The atlas image of shape (height, width, 4).
+    - tiles (Dict[Hashable, AtlasTile]): The tiles by key.
+    """
+
+    def __init__(self, width: int, height: int, padding: int = 0):
+        """
+        Initialize an ImageAtlas.
+
+        Parameters:
+        - width (int): The width of the atlas.
+        - height (int): The height of the atlas.
+        - padding (int, optional): The gap in pixels between tiles. Defaults to 0.
+        """
+        self.width = width
+        self.height = height
+        self.image = np.zeros((height, width, 4), dtype=np.uint8)
+        self.tiles: Dict[Hashable, AtlasTile] = {}
+
+        self._packer = ShelfPacker(width, height, padding)
+        self._dirty = _DirtyRect()
+
+    def add_tile(self, key: Hashable, width: int, height: int) -> AtlasTile:
+        """
+        Reserve a tile in the atlas.
+
+        Parameters:
+        - key (Hashable): The key of the tile.
+        - width (int): The width of the tile.
+        - height (int): The height of the tile.
+
+        Returns:
+        - AtlasTile: The tile.
+
+        Raises:
+        - KeyError: If a tile with the key already exists.
+        - ValueError: If the atlas has no room for the tile.
+        """
+        if key in self.tiles:
+            raise KeyError(f"Tile {key!r} already exists")
+
+        region = self._packer.pack(width, height)
+        if region is None:
+            raise ValueError(f"Atlas of {self.width}x{self.height} has no room for a tile of {width}x{height}")
+
+        tile = AtlasTile(key, region)
+        self.tiles[key] = tile
+        return tile
+
+    def update(self, key: Hashable, image: np.ndarray):
+        """
+        Copy an image into its tile, adding the tile first if necessary.
+
+        Parameters:
+        - key (Hashable): The key of the tile.
+        - image (np.ndarray): The RGBA image of shape (height, width, 4).
+        """
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.add_tile(key, image.shape[1], image.shape[0])
+
+        x, y, width, height = tile.region
+        assert image.shape == (height, width, 4), f"Image has to be of shape {(height, width, 4)}"
+
+        self.image[y:y + height, x:x + width] = image
+        self._dirty.add(tile.region)
+
+    def mark_dirty(self, key: Optional[Hashable] = None):
+        """
+        Mark a tile as changed, e.g. after writing into `tile_view()` directly.
+
+        Parameters:
+        - key (Hashable, optional): The key of the tile. If None, the whole atlas is marked as changed.
+        """
+        self._dirty.add((0, 0, self.width, self.height) if key is None else self.tiles[key].region)
+
+    def tile_view(self, key: Hashable) -> np.ndarray:
+        """
+        Get a writable view of a tile in the atlas image.
+
+        Parameters:
+        - key (Hashable): The key of the tile.
+
+        Returns:
+        - np.ndarray: The view of shape (height, width, 4).
+        """
+        return slice_tile(self.image, self.tiles[key].region)
+
+    @property
+    def dirty_region(self) -> Optional[Region]:
+        """
+        Get the bounding box of all tiles changed since the last `clear_dirty()`.
+
+        Returns:
+        - Optional[Region]: The dirty region (x, y, width, height), or None if nothing changed.
+        """
+        if self._dirty.empty:
+            return None
+
+        d = self._dirty
+        return d.x0, d.y0, d.x1 - d.x0, d.y1 - d.y0
+
+    def clear_dirty(self):
+        """
+        Reset the dirty region.
+        """
+        self._dirty = _DirtyRect()
+
+    @property
+    def layout(self) -> Dict[str, Region]:
+        """
+        Get the layout table, which maps the tile keys (as strings) to their regions.
+
+        Returns:
+        - Dict[str, Region]: The layout table.
+        """
+        return {str(tile.key): tile.region for tile in self.tiles.values()}
+
+    def layout_json(self) -> str:
+        """
+        Serialize the layout table, so it can be shared with clients.
+
+        Returns:
+        - str: The layout table as JSON.
+        """
+        return encode_atlas_layout(self.layout, self.width, self.height)
+
+
+def encode_atlas_layout(layout: Dict[str, Region], width: int, height: int) -> str:
+    """
+    Serialize an atlas layout table as JSON.
+
+    Parameters:
+    - layout (Dict[str, Region]): The regions by tile key.
+    - width (int): The width of the atlas.
+    - height (int): The height of the atlas.
+
+    Returns:
+    - str: The layout as JSON.
+    """
+    return json.dumps({"width": width, "height": height, "tiles": {k: list(v) for k, v in layout.items()}})
+
+
+def decode_atlas_layout(data: str) -> Dict[str, Region]:
+    """
+    Deserialize an atlas layout table created with `encode_atlas_layout()`.
+
+    Parameters:
+    - data (str): The layout as JSON.
+
+    Returns:
+    - Dict[str, Region]: The regions by tile key.
+    """
+    return {k: tuple(v) for k, v in json.loads(data)["tiles"].items()}
+
+
+def slice_tile(image: np.ndarray, region: Region, is_flipped: bool = False) -> np.ndarray:
+    """
+    Get the view of a tile in an atlas image without copying.
+
+    Parameters:
+    - image (np.ndarray): The atlas image of shape (height, width, 4).
+    - region (Region): The region (x, y, width, height) of the tile.
+    - is_flipped (bool, optional): If True, the atlas has been received vertically flipped. Defaults to False.
+
+    Returns:
+    - np.ndarray: The view of the tile.
+    """
+    x, y, width, height = region
+
+    if is_flipped:
+        y = image.shape[0] - y - height
+        return image[y:y + height, x:x + width][::-1]
+
+    return image[y:y + height, x:x + width]
+
+
+def slice_tiles(image: np.ndarray, layout: Dict[str, Region], is_flipped: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Get the views of all tiles of an atlas image without copying.
+
+    Parameters:
+    - image (np.ndarray): The atlas image of shape (height, width, 4).
+    - layout (Dict[str, Region]): The layout table.
+    - is_flipped (bool, optional): If True, the atlas has been received vertically flipped. Defaults to False.
+
+    Returns:
+    - Dict[str, np.ndarray]: The tile views by key.
+    """
+    return {key: slice_tile(image, region, is_flipped) for key, region in layout.items()}
+
+
+class AtlasPublisher:
+    """
+    Publishes an `ImageAtlas` through a single Metal server.
+
+    Per tick, the dirty region of the atlas is uploaded with one `replaceRegion` call and the atlas texture is
+    published once, so the number of Objective-C calls does not grow with the number of tiles.
+
+    Attributes:
+    - server (SyphonMetalServer): The server publishing the atlas.
+    - atlas (ImageAtlas): The atlas.
+    - texture (Any): The atlas texture.
+    """
+
+    def __init__(self, server: Any, atlas: ImageAtlas):
+        """
+        Initialize an AtlasPublisher.
+
+        Parameters:
+        - server (SyphonMetalServer): The server publishing the atlas.
+        - atlas (ImageAtlas): The atlas.
+        """
+        from syphon.utils.raw import create_mtl_texture
+
+        self.server = server
+        self.atlas = atlas
+        self.texture = create_mtl_texture(server.device, atlas.width, atlas.height, owner=f"server:{server.name}")
+
+        # the first upload has to cover the whole texture
+        self.atlas.mark_dirty()
+
+    def upload(self) -> Optional[Region]:
+        """
+        Upload the dirty region of the atlas to the texture.
+
+        Returns:
+        - Optional[Region]: The uploaded region, or None if nothing changed.
+        """
+        from syphon.utils.raw import copy_bytes_to_mtl_texture
+
+        region = self.atlas.dirty_region
+        if region is None:
+            return None
+
+        x, y, width, height = region
+        row_bytes = self.atlas.width * 4
+
+        # the rows of the dirty region are contiguous in the atlas, starting at the first dirty pixel
+        data = memoryview(self.atlas.image[y:y + height].reshape(-1))[x * 4:]
+        copy_bytes_to_mtl_texture(data, self.texture, region, bytes_per_row=row_bytes)
+
+        self.atlas.clear_dirty()
+        return region
+
+    def publish(self, is_flipped: bool = False):
+        """
+        Upload the changed tiles and publish the atlas.
+
+        Parameters:
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        """
+        self.upload()
+        self.server.publish_frame_texture(self.texture, is_flipped=is_flipped)
@@ -0,0 +1,516 @@
+import itertools
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Optional, Any, Tuple, Callable, Dict, List
+
+from syphon.metadata import FrameMetadata, LatencyHistogram
+from syphon.pacing import FramePacer
+from syphon.server_description import SyphonServerDescription
+from syphon.types import Texture, Region, Size
+
+_MIN_POLL_INTERVAL = 0.0005
+_MAX_POLL_INTERVAL = 0.01
+
+
+class BaseSyphonServer(ABC):
+    """
+    Abstract base class for Syphon servers.
+
+    Attributes:
+    - name (str): The name of the Syphon server.
+    - last_frame_metadata (Optional[FrameMetadata]): The metadata of the last frame published with `publish_frame()`.
+    - pacer (Optional[FramePacer]): The pacer limiting the frame rate of `publish_frame()`.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize a BaseSyphonServer.
+
+        Parameters:
+        - name (str): The name of the Syphon server.
+        """
+        self.name = name
+        self.last_frame_metadata: Optional[FrameMetadata] = None
+        self.pacer: Optional[FramePacer] = None
+
+        self._frame_sequence = itertools.count()
+
+    def set_target_fps(self, fps: Optional[float], blocking: bool = True):
+        """
+        Limit the frame rate of `publish_frame()` with a `syphon.pacing.FramePacer`.
+
+        Parameters:
+        - fps (Optional[float]): The target frame rate, or None to publish without pacing.
+        - blocking (bool, optional): If True, `publish_frame()` waits for the next deadline.
+          If False, frames arriving before their deadline are dropped. Defaults to True.
+        """
+        self.pacer = None if fps is None else FramePacer(fps, blocking=blocking)
+
+    def rename(self, name: str):
+        """
+        Change the name the server is announced with.
+
+        Parameters:
+        - name (str): The new name of the server.
+        """
+        self.name = name
+
+    def new_frame_metadata(self, produced_at: Optional[float] = None) -> FrameMetadata:
+        """
+        Create the metadata of a new frame with the next sequence number.
+
+        This can be used to embed a stamp into the frame (see `syphon.utils.stamp`) before it is published.
+
+        Parameters:
+        - produced_at (float, optional): The monotonic time the frame was produced. Defaults to now.
+
+        Returns:
+        - FrameMetadata: The metadata of the new frame.
+        """
+        return FrameMetadata(next(self._frame_sequence), time.monotonic() if produced_at is None else produced_at)
+
+    def publish_frame(self,
+                      texture: Texture,
+                      region: Optional[Region] = None,
+                      size: Optional[Size] = None,
+                      is_flipped: bool = False,
+                      metadata: Optional[FrameMetadata] = None,
+                      **kwargs) -> Optional[FrameMetadata]:
+        """
+        Publish a frame with the given texture and record its metadata.
+
+        If a target frame rate is set, the call is paced to the next deadline first.
+
+        Parameters:
+        - texture (Texture): The texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        - metadata (FrameMetadata, optional): The metadata of the frame. If None, new metadata is created.
+        - **kwargs: Additional arguments of the backend specific `publish_frame_texture()`.
+
+        Returns:
+        - Optional[FrameMetadata]: The metadata of the frame including the time the publish call completed,
+          or None if the frame has been dropped by a non-blocking pacer.
+        """
+        if self.pacer is not None and not self.pacer.wait():
+            return None
+
+        if metadata is None:
+            metadata = self.new_frame_metadata()
+
+        self.publish_frame_texture(texture, region, size, is_flipped, **kwargs)
+
+        metadata.published_at = time.monotonic()
+        self.last_frame_metadata = metadata
+        return metadata
+
+    @abstractmethod
+    def publish_frame_texture(self,
+                              texture: Texture,
+                              region: Optional[Region] = None,
+                              size: Optional[Size] = None,
+                              is_flipped: bool = False):
+        """
+        Publish a frame with the given texture.
+
+        Parameters:
+        - texture (Texture): The texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        """
+        pass
+
+    def prepare(self,
+                texture: Texture,
+                region: Optional[Region] = None,
+                size: Optional[Size] = None,
+                is_flipped: bool = False,
+                **kwargs) -> "PreparedFrame":
+        """
+        Prepare a handle to repeatedly publish the given texture with minimal overhead.
+
+        Region, size and the Objective-C structures are computed once and the publish selector is bound,
+        so `handle.publish()` only crosses the bridge for the publish call itself. The handle stays valid as long
+        as the texture and the server exist, and can be published again whenever the texture content changed.
+
+        The default implementation returns a handle that calls `publish_frame_texture()` with the given arguments,
+        subclasses override it to precompute their publish call.
+
+        Parameters:
+        - texture (Texture): The texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        - **kwargs: Additional backend specific arguments.
+
+        Returns:
+        - PreparedFrame: The handle to publish the texture.
+        """
+        return _PublishTextureFrame(self, texture, region, size, is_flipped, kwargs)
+
+    @abstractmethod
+    def publish(self):
+        """
+        Publish the frame.
+        """
+        pass
+
+    @abstractmethod
+    def stop(self):
+        """
+        Stop the Syphon server.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def has_clients(self) -> bool:
+        """
+        Check if the Syphon server has clients.
+
+        Returns:
+        - bool: True if there are clients, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def _get_texture_size(self, texture: Texture) -> Size:
+        """
+        Get the size of the texture.
+
+        Parameters:
+        - texture (Texture): The texture.
+
+        Returns:
+        - Size: The size of the texture.
+        """
+        pass
+
+    def _prepare_region_and_size(self,
+                                 texture: Texture,
+                                 region: Optional[Region] = None,
+                                 size: Optional[Size] = None) -> Tuple[Region, Size]:
+        """
+        Prepare the region and size for publishing.
+
+        Parameters:
+        - texture (Texture): The texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+
+        Returns:
+        - Tuple[Region, Size]: The prepared region and size.
+        """
+        size = self._get_texture_size(texture) if size is None else size
+        if region is None:
+            region = (0, 0, *size)
+        return region, size
+
+
+class PreparedFrame(ABC):
+    """
+    Abstract base class for handles returned by `BaseSyphonServer.prepare()`.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def publish(self):
+        """
+        Publish the prepared texture.
+        """
+        pass
+
+
+class _PublishTextureFrame(PreparedFrame):
+    __slots__ = ("_server", "_texture", "_region", "_size", "_is_flipped", "_kwargs")
+
+    def __init__(self,
+                 server: BaseSyphonServer,
+                 texture: Texture,
+                 region: Optional[Region],
+                 size: Optional[Size],
+                 is_flipped: bool,
+                 kwargs: Dict[str, Any]):
+        self._server = server
+        self._texture = texture
+        self._region = region
+        self._size = size
+        self._is_flipped = is_flipped
+        self._kwargs = kwargs
+
+    def publish(self):
+        self._server.publish_frame_texture(self._texture, self._region, self._size, self._is_flipped, **self._kwargs)
+
+
+FrameListener = Callable[["BaseSyphonClient"], None]
+
+
+class BaseSyphonClient(ABC):
+    """
+    Abstract base class for Syphon clients.
+
+    Attributes:
+    - description (SyphonServerDescription): The description of the Syphon server.
+    - latency (LatencyHistogram): The latencies of received frames that carried a frame stamp.
+    - last_frame_metadata (Optional[FrameMetadata]): The metadata of the last frame received with `receive_frame()`.
+    """
+
+    def __init__(self, description: SyphonServerDescription):
+        """
+        Initialize a BaseSyphonClient.
+
+        Parameters:
+        - description (SyphonServerDescription): The description of the Syphon server.
+        """
+        self._description = description
+
+        self.latency = LatencyHistogram()
+        self.last_frame_metadata: Optional[FrameMetadata] = None
+        self._frame_count = 0
+
+        self._frame_condition = threading.Condition()
+        self._frame_pending = False
+        self._frame_handler_active = False
+        self._stopped = False
+        self._frame_listeners: List[FrameListener] = []
+
+    @property
+    def has_frame_handler(self) -> bool:
+        """
+        Check if the client is notified about new frames by Syphon, or has to poll for them.
+
+        Returns:
+        - bool: True if the new frame handler is active, False otherwise.
+        """
+        return self._frame_handler_active
+
+    @property
+    @abstractmethod
+    def is_valid(self) -> bool:
+        """
+        Check if the Syphon client is valid.
+
+        Returns:
+        - bool: True if the client is valid, False otherwise.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def has_new_frame(self) -> bool:
+        """
+        Check if the Syphon client has a new frame.
+
+        Returns:
+        - bool: True if there is a new frame, False otherwise.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def new_frame_image(self) -> Any:
+        """
+        Get the new frame image.
+
+        Returns:
+        - Any: The new frame image.
+        """
+        pass
+
+    @abstractmethod
+    def stop(self):
+        """
+        Stop the Syphon client.
+        """
+        pass
+
+    def add_frame_listener(self, listener: FrameListener):
+        """
+        Add a callback that is invoked with the client whenever the server publishes a new frame.
+
+        The callback is invoked on a Syphon thread and should return quickly. It is only invoked if the new frame
+        handler is active (see `has_frame_handler`).
+
+        Parameters:
+        - listener (FrameListener): The callback.
+        """
+        self._frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: FrameListener):
+        """
+        Remove a callback added with `add_frame_listener()`.
+
+        Parameters:
+        - listener (FrameListener): The callback.
+        """
+        self._frame_listeners.remove(listener)
+
+    def try_get_frame(self, decode_stamp: bool = False) -> Optional[Tuple[Any, FrameMetadata]]:
+        """
+        Get the new frame image and its metadata without blocking.
+
+        Parameters:
+        - decode_stamp (bool, optional): If True, the frame stamp is decoded (see `receive_frame()`).
+
+        Returns:
+        - Optional[Tuple[Any, FrameMetadata]]: The frame image and its metadata, or None if there is no new frame.
+        """
+        if not self._frame_handler_active:
+            return self.receive_frame(decode_stamp)
+
+        with self._frame_condition:
+            if not self._frame_pending:
+                return None
+            self._frame_pending = False
+
+        return self._receive(self.new_frame_image, decode_stamp)
+
+    def wait_for_frame(self,
+                       timeout: Optional[float] = None,
+                       decode_stamp: bool = False) -> Optional[Tuple[Any, FrameMetadata]]:
+        """
+        Block until the server publishes a new frame and return it with its metadata.
+
+        The call waits on a condition signalled by the Syphon new frame handler, so an idle client does not use
+        any CPU time. If the handler is not available, it polls with an adaptive back-off instead.
+
+        Parameters:
+        - timeout (float, optional): The maximum time to wait in seconds. None waits until a frame arrives
+          or the client is stopped.
+        - decode_stamp (bool, optional): If True, the frame stamp is decoded (see `receive_frame()`).
+
+        Returns:
+        - Optional[Tuple[Any, FrameMetadata]]: The frame image and its metadata, or None on timeout or stop.
+        """
+        if not self._frame_handler_active:
+            return self._poll_for_frame(timeout, decode_stamp)
+
+        with self._frame_condition:
+            if not self._frame_condition.wait_for(lambda: self._frame_pending or self._stopped, timeout):
+                return None
+            if self._stopped:
+                return None
+            self._frame_pending = False
+
+        return self._receive(self.new_frame_image, decode_stamp)
+
+    def receive_frame(self, decode_stamp: bool = False) -> Optional[Tuple[Any, FrameMetadata]]:
+        """
+        Receive the new frame image together with its metadata.
+
+        Parameters:
+        - decode_stamp (bool, optional): If True, the frame stamp (see `syphon.utils.stamp`) is decoded to
+          restore the producer's sequence number and timestamp, and the latency is recorded. Defaults to False.
+
+        Returns:
+        - Optional[Tuple[Any, FrameMetadata]]: The frame image and its metadata, or None if there is no new frame.
+        """
+        if not self.has_new_frame:
+            return None
+
+        return self._receive(self.new_frame_image, decode_stamp)
+
+    def _poll_for_frame(self, timeout: Optional[float], decode_stamp: bool) -> Optional[Tuple[Any, FrameMetadata]]:
+        """
+        Poll for a new frame with an exponentially growing interval.
+
+        Parameters:
+        - timeout (Optional[float]): The maximum time to wait in seconds, None waits forever.
+        - decode_stamp (bool): If True, the frame stamp is decoded.
+
+        Returns:
+        - Optional[Tuple[Any, FrameMetadata]]: The frame image and its metadata, or None on timeout or stop.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = _MIN_POLL_INTERVAL
+
+        while not self._stopped:
+            frame = self.receive_frame(decode_stamp)
+            if frame is not None:
+                return frame
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                interval = min(interval, remaining)
+
+            time.sleep(interval)
+            interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+        return None
+
+    def _create_frame_handler(self) -> Callable[[Any], None]:
+        """
+        Create the block passed to Syphon as new frame handler. It only holds a weak reference to the client.
+
+        Returns:
+        - Callable[[Any], None]: The new frame handler.
+        """
+        client_ref = weakref.ref(self)
+
+        def handler(_context: Any):
+            client = client_ref()
+            if client is not None:
+                client._on_new_frame()
+
+        return handler
+
+    def _on_new_frame(self):
+        """
+        Signal waiting threads and listeners that a new frame is available.
+        """
+        with self._frame_condition:
+            self._frame_pending = True
+            self._frame_condition.notify_all()
+
+        for listener in list(self._frame_listeners):
+            listener(self)
+
+    def _on_stop(self):
+        """
+        Wake up all threads waiting for a frame after the client has been stopped.
+        """
+        with self._frame_condition:
+            self._stopped = True
+            self._frame_condition.notify_all()
+
+    def _receive(self, image: Any, decode_stamp: bool) -> Tuple[Any, FrameMetadata]:
+        """
+        Create the metadata of a received frame image.
+
+        Parameters:
+        - image (Any): The received frame image.
+        - decode_stamp (bool): If True, the frame stamp is decoded.
+
+        Returns:
+        - Tuple[Any, FrameMetadata]: The frame image and its metadata.
+        """
+        metadata = FrameMetadata(self._frame_count, received_at=time.monotonic())
+        self._frame_count += 1
+
+        if decode_stamp:
+            stamp = self._read_frame_stamp(image)
+            if stamp is not None:
+                metadata.sequence, timestamp_ns = stamp
+                metadata.produced_at = timestamp_ns / 1e9
+                self.latency.add(metadata.latency)
+
+        self.last_frame_metadata = metadata
+        return image, metadata
+
+    def _read_frame_stamp(self, image: Any) -> Optional[Tuple[int, int]]:
+        """
+        Read the frame stamp of a received frame image. Clients without support return None.
+
+        Parameters:
+        - image (Any): The received frame image.
+
+        Returns:
+        - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None.
+        """
+        return None
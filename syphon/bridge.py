@@ -0,0 +1,560 @@
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple, Union, List, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from syphon.server import SyphonMetalServer
+
+Address = Union[Tuple[str, int], str]
+"""
+A TCP address as (host, port) tuple or the path of a Unix domain socket.
+"""
+
+_MAGIC = b"SYPH"
+_ACCEPT_TIMEOUT = 0.25
+_HEADER = struct.Struct("<4sQdIIIIQ")
+
+
+class FrameCodec:
+    """
+    Base class for payload codecs of the frame bridge. The base codec sends the raw pixels.
+
+    Attributes:
+    - codec_id (int): The identifier sent in the frame header, has to be unique per codec.
+    """
+    codec_id: int = 0
+
+    def encode(self, data: memoryview) -> Any:
+        """
+        Encode the raw pixel data of a frame.
+
+        Parameters:
+        - data (memoryview): The raw pixel data.
+
+        Returns:
+        - Any: The encoded payload as bytes-like object.
+        """
+        return data
+
+    def decode(self, payload: memoryview, out: memoryview):
+        """
+        Decode a payload into the raw pixel buffer of a frame.
+
+        Parameters:
+        - payload (memoryview): The received payload.
+        - out (memoryview): The writable buffer for the raw pixel data.
+        """
+        out[:] = payload
+
+
+class ZlibCodec(FrameCodec):
+    """
+    Lossless zlib compression, useful for synthetic or flat content on slow links.
+    """
+    codec_id = 1
+
+    def __init__(self, level: int = 1):
+        """
+        Initialize a ZlibCodec.
+
+        Parameters:
+        - level (int, optional): The compression level. Defaults to 1.
+        """
+        self.level = level
+
+    def encode(self, data: memoryview) -> Any:
+        return zlib.compress(data, self.level)
+
+    def decode(self, payload: memoryview, out: memoryview):
+        out[:] = zlib.decompress(payload)
+
+
+@dataclass
+class FrameInfo:
+    """
+    Information about a frame received over the bridge.
+
+    Attributes:
+    - sequence (int): The sequence number assigned by the sender.
+    - timestamp (float): The monotonic timestamp of the frame on the sender.
+    - received_at (float): The monotonic time the frame was completely received.
+    - width (int): The width of the frame.
+    - height (int): The height of the frame.
+    - channels (int): The number of channels per pixel.
+    """
+    sequence: int
+    timestamp: float
+    received_at: float
+    width: int
+    height: int
+    channels: int
+
+
+FrameSink = Callable[[np.ndarray, FrameInfo], None]
+
+
+class FrameSender:
+    """
+    Streams NumPy frames (or Syphon client textures) to a `FrameReceiver` over TCP or a Unix domain socket.
+
+    Headers and pixels are sent with a single `sendmsg` call without joining them into a new buffer.
+    In threaded mode, frames are handed to a background thread with latest-frame semantics:
+    if the connection is congested, older pending frames are replaced instead of queued.
+
+    Attributes:
+    - address (Address): The address of the receiver.
+    - codec (FrameCodec): The payload codec.
+    - frames_sent (int): The number of frames sent.
+    - frames_dropped (int): The number of pending frames replaced by newer ones.
+    - bytes_sent (int): The number of bytes sent.
+    """
+
+    def __init__(self, address: Address, codec: Optional[FrameCodec] = None, threaded: bool = True):
+        """
+        Initialize a FrameSender and connect to the receiver.
+
+        Parameters:
+        - address (Address): The (host, port) tuple or Unix socket path of the receiver.
+        - codec (FrameCodec, optional): The payload codec. Defaults to raw pixels.
+        - threaded (bool, optional): If True, frames are sent from a background thread with
+          latest-frame semantics. If False, `send()` blocks until the frame is sent. Defaults to True.
+        """
+        self.address = address
+        self.codec = FrameCodec() if codec is None else codec
+        self.threaded = threaded
+
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+
+        self._socket = _create_socket(address)
+        self._socket.connect(address)
+
+        self._sequence = 0
+        self._header = bytearray(_HEADER.size)
+        self._error: Optional[BaseException] = None
+
+        # double buffer for the background thread: the pending frame and the frame being sent
+        self._condition = threading.Condition()
+        self._pending: Optional[np.ndarray] = None
+        self._sending: Optional[np.ndarray] = None
+        self._pending_timestamp = 0.0
+        self._has_pending = False
+        self._busy = False
+        self._running = True
+        self._thread: Optional[threading.Thread] = None
+
+        if threaded:
+            self._thread = threading.Thread(target=self._send_loop, name="FrameSender", daemon=True)
+            self._thread.start()
+
+    def send(self, image: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Send a frame. In threaded mode the image is copied into the pending buffer and the call returns immediately.
+
+        Parameters:
+        - image (np.ndarray): The uint8 frame of shape (height, width, channels).
+        - timestamp (float, optional): The timestamp of the frame. Defaults to the current monotonic time.
+
+        Raises:
+        - Exception: The error that stopped the background thread, e.g. an `OSError` of the connection.
+        """
+        # the header carries no data type, the receiver always reads uint8 pixels
+        assert image.dtype == np.uint8, "Image has to be of type uint8"
+
+        timestamp = time.monotonic() if timestamp is None else timestamp
+
+        if not self.threaded:
+            self._send_frame(np.ascontiguousarray(image), timestamp)
+            return
+
+        with self._condition:
+            pending = self._pending_buffer(image.shape, image.dtype)
+            np.copyto(pending, image)
+            self._commit_pending(timestamp)
+
+    def send_texture(self, texture: Any, timestamp: Optional[float] = None):
+        """
+        Read a Metal texture back (e.g. a `SyphonMetalClient` frame) and send it.
+
+        In threaded mode the texture is read back directly into the pending buffer.
+
+        Parameters:
+        - texture (Any): The RGBA or BGRA Metal texture.
+        - timestamp (float, optional): The timestamp of the frame. Defaults to the current monotonic time.
+        """
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+
+        timestamp = time.monotonic() if timestamp is None else timestamp
+
+        if not self.threaded:
+            self._send_frame(copy_mtl_texture_to_image(texture), timestamp)
+            return
+
+        with self._condition:
+            pending = self._pending_buffer((texture.height(), texture.width(), 4), np.uint8)
+            copy_mtl_texture_to_image(texture, out=pending)
+            self._commit_pending(timestamp)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the pending frame has been sent.
+
+        Parameters:
+        - timeout (float, optional): The maximum time to wait in seconds. None waits forever.
+
+        Returns:
+        - bool: True if all frames have been sent, False on timeout.
+
+        Raises:
+        - Exception: The error that stopped the background thread.
+        """
+        with self._condition:
+            sent = self._condition.wait_for(lambda: not (self._has_pending or self._busy) or self._error is not None,
+                                            timeout)
+            if self._error is not None:
+                raise self._error
+            return sent
+
+    def close(self):
+        """
+        Stop the background thread and close the connection.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        self._socket.close()
+
+    def _pending_buffer(self, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        if self._error is not None:
+            raise self._error
+
+        if self._pending is None or self._pending.shape != shape or self._pending.dtype != dtype:
+            self._pending = np.empty(shape, dtype=dtype)
+        return self._pending
+
+    def _commit_pending(self, timestamp: float):
+        if self._has_pending:
+            self.frames_dropped += 1
+
+        self._pending_timestamp = timestamp
+        self._has_pending = True
+        self._condition.notify()
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._has_pending or not self._running)
+                if not self._running:
+                    return
+
+                # swap buffers so the producer can fill the next frame while this one is sent
+                self._pending, self._sending = self._sending, self._pending
+                timestamp = self._pending_timestamp
+                self._has_pending = False
+                self._busy = True
+
+            try:
+                self._send_frame(self._sending, timestamp)
+            except Exception as e:
+                # connection and codec errors end the thread and are raised by the next send() or flush()
+                self._error = e
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+            if self._error is not None:
+                return
+
+    def _send_frame(self, image: np.ndarray, timestamp: float):
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim > 2 else 1
+
+        payload = self.codec.encode(memoryview(image).cast("B"))
+        payload_size = memoryview(payload).nbytes
+
+        _HEADER.pack_into(self._header, 0, _MAGIC, self._sequence, timestamp,
+                          width, height, channels, self.codec.codec_id, payload_size)
+        _send_all(self._socket, [self._header, payload])
+
+        self._sequence += 1
+        self.frames_sent += 1
+        self.bytes_sent += _HEADER.size + payload_size
+
+
+class FrameReceiver:
+    """
+    Receives frames from a `FrameSender` and passes them to a sink.
+
+    Header and payload are received with `recv_into` into preallocated buffers, which are reused as long as
+    the frame size does not change. The image passed to the sink is only valid during the call.
+
+    Attributes:
+    - address (Address): The address the receiver listens on.
+    - sink (FrameSink): Called with every received image and its `FrameInfo`.
+    - codec (FrameCodec): The payload codec, has to match the sender.
+    - frames_received (int): The number of frames received.
+    - bytes_received (int): The number of bytes received.
+    - errors (int): The number of frames or connections that failed, e.g. because of an invalid header,
+      a codec error or an exception raised by the sink.
+    - last_error (Optional[BaseException]): The most recent error.
+    """
+
+    def __init__(self, address: Address, sink: FrameSink, codec: Optional[FrameCodec] = None):
+        """
+        Initialize a FrameReceiver and start listening.
+
+        Parameters:
+        - address (Address): The (host, port) tuple or Unix socket path to listen on.
+          Use port 0 to let the system choose a free port.
+        - sink (FrameSink): Called with every received image and its `FrameInfo`.
+        - codec (FrameCodec, optional): The payload codec. Defaults to raw pixels.
+        """
+        self.sink = sink
+        self.codec = FrameCodec() if codec is None else codec
+
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._socket = _create_socket(address)
+        if not isinstance(address, str):
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(address)
+        self._socket.listen(1)
+        self.address = self._socket.getsockname()
+
+        # accept with a timeout so close() is noticed on every platform
+        self._socket.settimeout(_ACCEPT_TIMEOUT)
+
+        self._header = bytearray(_HEADER.size)
+        self._payload = bytearray()
+        self._image: Optional[np.ndarray] = None
+
+        self._running = False
+        self._connection: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Serve connections on a background thread.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="FrameReceiver", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """
+        Accept connections one after another and receive their frames until `close()` is called.
+        """
+        self._running = True
+        while self._running:
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            connection.settimeout(None)
+            self._connection = connection
+            with connection:
+                try:
+                    while self._running and self._receive_frame(connection):
+                        pass
+                except ConnectionError as e:
+                    # the stream cannot be resynchronized after a protocol error, the connection is dropped
+                    self._record_error(e)
+                except OSError:
+                    pass
+            self._connection = None
+
+    def close(self):
+        """
+        Stop serving and close the sockets.
+        """
+        self._running = False
+
+        if self._connection is not None:
+            try:
+                self._connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        self._socket.close()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        if isinstance(self.address, str):
+            os.unlink(self.address)
+
+    def _receive_frame(self, connection: socket.socket) -> bool:
+        if not _recv_exact(connection, memoryview(self._header)):
+            return False
+
+        magic, sequence, timestamp, width, height, channels, codec_id, payload_size = _HEADER.unpack(self._header)
+
+        if magic != _MAGIC:
+            raise ConnectionError("Invalid frame header received.")
+
+        if codec_id != self.codec.codec_id:
+            raise ConnectionError(f"Frame uses codec {codec_id}, but the receiver expects {self.codec.codec_id}.")
+
+        shape = (height, width, channels)
+        if self._image is None or self._image.shape != shape:
+            self._image = np.empty(shape, dtype=np.uint8)
+
+        if codec_id == FrameCodec.codec_id:
+            # raw pixels are received straight into the image
+            if payload_size != self._image.nbytes:
+                raise ConnectionError("Frame payload does not match the frame size.")
+            if not _recv_exact(connection, memoryview(self._image).cast("B")):
+                return False
+        else:
+            if len(self._payload) < payload_size:
+                self._payload = bytearray(payload_size)
+            payload = memoryview(self._payload)[:payload_size]
+            if not _recv_exact(connection, payload):
+                return False
+
+            # the payload has been received completely, so a frame that cannot be decoded is skipped
+            try:
+                self.codec.decode(payload, memoryview(self._image).cast("B"))
+            except Exception as e:
+                self._record_error(e)
+                return True
+
+        self.frames_received += 1
+        self.bytes_received += _HEADER.size + payload_size
+
+        info = FrameInfo(sequence, timestamp, time.monotonic(), width, height, channels)
+        try:
+            self.sink(self._image, info)
+        except Exception as e:
+            self._record_error(e)
+        return True
+
+    def _record_error(self, error: BaseException):
+        self.errors += 1
+        self.last_error = error
+
+
+class LatestFrameSink:
+    """
+    Frame sink that keeps a copy of the latest received frame for NumPy consumers.
+
+    Attributes:
+    - image (Optional[np.ndarray]): The latest frame.
+    - info (Optional[FrameInfo]): The information of the latest frame.
+    """
+
+    def __init__(self):
+        """
+        Initialize a LatestFrameSink.
+        """
+        self.image: Optional[np.ndarray] = None
+        self.info: Optional[FrameInfo] = None
+        self._condition = threading.Condition()
+
+    def __call__(self, image: np.ndarray, info: FrameInfo):
+        with self._condition:
+            if self.image is None or self.image.shape != image.shape:
+                self.image = np.empty_like(image)
+            np.copyto(self.image, image)
+            self.info = info
+            self._condition.notify_all()
+
+    def wait(self, after: int = -1, timeout: Optional[float] = None) -> Optional[Tuple[np.ndarray, FrameInfo]]:
+        """
+        Wait for a frame with a sequence number greater than `after`.
+
+        Parameters:
+        - after (int, optional): The last sequence number seen by the caller. Defaults to -1.
+        - timeout (float, optional): The maximum time to wait in seconds. None waits forever.
+
+        Returns:
+        - Optional[Tuple[np.ndarray, FrameInfo]]: A copy of the frame and its information, or None on timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.info is not None and self.info.sequence > after, timeout):
+                return None
+            return self.image.copy(), self.info
+
+
+class SyphonServerSink:
+    """
+    Frame sink that republishes received RGBA frames through a `SyphonMetalServer`.
+
+    Attributes:
+    - server (SyphonMetalServer): The server the frames are published with.
+    - is_flipped (bool): If True, the frames are published flipped.
+    """
+
+    def __init__(self, server: "SyphonMetalServer", is_flipped: bool = False):
+        """
+        Initialize a SyphonServerSink.
+
+        Parameters:
+        - server (SyphonMetalServer): The server the frames are published with.
+        - is_flipped (bool, optional): If True, the frames are published flipped. Defaults to False.
+        """
+        self.server = server
+        self.is_flipped = is_flipped
+        self._texture: Any = None
+
+    def __call__(self, image: np.ndarray, info: FrameInfo):
+        from syphon.utils.numpy import copy_image_to_mtl_texture
+        from syphon.utils.raw import create_mtl_texture
+
+        if self._texture is None or (self._texture.width(), self._texture.height()) != (info.width, info.height):
+            self._texture = create_mtl_texture(self.server.device, info.width, info.height,
+                                               owner=f"server:{self.server.name}")
+
+        copy_image_to_mtl_texture(image, self._texture)
+        self.server.publish_frame_texture(self._texture, is_flipped=self.is_flipped)
+
+
+def _create_socket(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    sock = socket.socket(socket.AF_INET6 if ":" in address[0] else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _send_all(sock: socket.socket, buffers: List[Any]):
+    views = [memoryview(b).cast("B") for b in buffers]
+    while views:
+        sent = sock.sendmsg(views)
+
+        # drop completely sent buffers and slice the partially sent one
+        while views and sent >= views[0].nbytes:
+            sent -= views[0].nbytes
+            views.pop(0)
+        if views and sent:
+            views[0] = views[0][sent:]
+
+
+def _recv_exact(sock: socket.socket, view: memoryview) -> bool:
+    received = 0
+    size = view.nbytes
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            return False
+        received += count
+    return True
@@ -1,59 +1,25 @@
-from abc import ABC, abstractmethod
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 
-import Metal
 import objc
 
-from syphon.server_directory import SyphonServerDescription
-from syphon.utils import opengl
+from syphon.base import BaseSyphonClient, FrameListener
+from syphon.resources import get_resource_registry
+from syphon.server_description import SyphonServerDescription
+from syphon.utils import opengl, tracing
 
+# block signature of the new frame handlers, which is not part of the loaded framework metadata
+_FRAME_HANDLER_METADATA = {
+    "arguments": {
+        5: {"callable": {"retval": {"type": b"v"}, "arguments": {0: {"type": b"^v"}, 1: {"type": b"@"}}}}
+    }
+}
 
-class BaseSyphonClient(ABC):
-    """
-    Abstract base class for Syphon clients.
-
-    Attributes:
-    - description (SyphonServerDescription): The description of the Syphon server.
-    """
-
-    def __init__(self, description: SyphonServerDescription):
-        """
-        Initialize a BaseSyphonClient.
-
-        Parameters:
-        - description (SyphonServerDescription): The description of the Syphon server.
-        """
-        # todo: implement new frame handler callback support
-        self._description = description
-
-    @property
-    @abstractmethod
-    def is_valid(self) -> bool:
-        """
-        Check if the Syphon client is valid.
-
-        Returns:
-        - bool: True if the client is valid, False otherwise.
-        """
-        pass
-
-    @property
-    @abstractmethod
-    def has_new_frame(self) -> bool:
-        """
-        Check if the Syphon client has a new frame.
-
-        Returns:
-        - bool: True if there is a new frame, False otherwise.
-        """
-        pass
-
-    @abstractmethod
-    def stop(self):
-        """
-        Stop the Syphon client.
-        """
-        pass
+objc.registerMetaDataForSelector(b"SyphonMetalClient",
+                                 b"initWithServerDescription:device:options:newFrameHandler:",
+                                 _FRAME_HANDLER_METADATA)
+objc.registerMetaDataForSelector(b"SyphonOpenGLClient",
+                                 b"initWithServerDescription:context:options:newFrameHandler:",
+                                 _FRAME_HANDLER_METADATA)
 
 
 class SyphonMetalClient(BaseSyphonClient):
@@ -66,34 +32,55 @@ class SyphonMetalClient(BaseSyphonClient):
     - context (Any): The Syphon-Metal context.
     """
 
-    def __init__(self, description: SyphonServerDescription, device: Optional[Any] = None):
+    def __init__(self,
+                 description: SyphonServerDescription,
+                 device: Optional[Any] = None,
+                 share_resources: bool = True):
         """
         Initialize a SyphonMetalClient.
 
         Parameters:
         - description (SyphonServerDescription): The description of the Syphon server.
         - device (Any, optional): The Metal device. If None, the default system device will be used.
+        - share_resources (bool, optional): If False, the device is requested from Metal instead of the resource
+          registry (see `syphon.resources`). Since Metal returns the same system default device, this does not
+          isolate the client. Defaults to True.
         """
         super().__init__(description)
 
         self.device = device
 
+        resources = get_resource_registry()
+
         # setup device
         if self.device is None:
-            self.device = Metal.MTLCreateSystemDefaultDevice()
+            self.device = resources.default_device(share_resources)
 
         # setup syphon-metal context
-        SyphonMetalClientObjC = objc.lookUpClass("SyphonMetalClient")
-
-        self.context = (
-            SyphonMetalClientObjC
-            .alloc()
-            .initWithServerDescription_device_options_newFrameHandler_(
-                description.raw,
-                self.device,
-                None,
-                None)
-        )
+        SyphonMetalClientObjC = resources.lookup_class("SyphonMetalClient")
+
+        try:
+            self.context = (
+                SyphonMetalClientObjC
+                .alloc()
+                .initWithServerDescription_device_options_newFrameHandler_(
+                    description.raw,
+                    self.device,
+                    None,
+                    self._create_frame_handler())
+            )
+            self._frame_handler_active = True
+        except (TypeError, objc.error):
+            # fall back to polling if the handler block cannot be bridged
+            self.context = (
+                SyphonMetalClientObjC
+                .alloc()
+                .initWithServerDescription_device_options_newFrameHandler_(
+                    description.raw,
+                    self.device,
+                    None,
+                    None)
+            )
 
     @property
     def is_valid(self) -> bool:
@@ -123,13 +110,49 @@ class SyphonMetalClient(BaseSyphonClient):
         Returns:
         - Any: The new frame image.
         """
-        return self.context.newFrameImage()
+        with tracing.span("new_frame_image", "client", server=self._description.name):
+            return self.context.newFrameImage()
 
     def stop(self):
         """
         Stop the SyphonMetalClient.
         """
         self.context.stop()
+        self._on_stop()
+
+    def read_frame(self, pool: Optional[Any] = None, decode_stamp: bool = False) -> Optional["Frame"]:
+        """
+        Receive the new frame and read it back into a `syphon.frame.Frame`, which can be shared with NumPy,
+        PyTorch or JAX without copying. The frame has to be released after use.
+
+        Parameters:
+        - pool (ImageBufferPool, optional): The pool of staging buffers. If None, a new buffer is allocated.
+        - decode_stamp (bool, optional): If True, the frame stamp is decoded (see `receive_frame()`).
+
+        Returns:
+        - Optional[Frame]: The frame, or None if there is no new frame.
+        """
+        from syphon.frame import Frame
+
+        frame = self.try_get_frame(decode_stamp)
+        if frame is None:
+            return None
+
+        texture, metadata = frame
+        return Frame.from_mtl_texture(texture, pool, metadata, owner=f"client:{self._description.uuid}")
+
+    def _read_frame_stamp(self, image: Any) -> Optional[Tuple[int, int]]:
+        """
+        Read the frame stamp by reading back only the stamp strips of the texture.
+
+        Parameters:
+        - image (Any): The received Metal texture.
+
+        Returns:
+        - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None.
+        """
+        from syphon.utils.numpy import read_mtl_texture_stamp
+        return read_mtl_texture_stamp(image)
 
 
 class SyphonOpenGLClient(BaseSyphonClient):
@@ -156,16 +179,30 @@ class SyphonOpenGLClient(BaseSyphonClient):
         self.cgl_context_obj = opengl.get_current_cgl_context_obj() if cgl_context_obj is None else cgl_context_obj
 
         # create syphon gl client
-        SyphonOpenGLClientObjC = objc.lookUpClass("SyphonOpenGLClient")
-        self.context = (
-            SyphonOpenGLClientObjC
-            .alloc()
-            .initWithServerDescription_context_options_newFrameHandler_(
-                description.raw,
-                self.cgl_context_obj,
-                None,
-                None)
-        )
+        SyphonOpenGLClientObjC = get_resource_registry().lookup_class("SyphonOpenGLClient")
+
+        try:
+            self.context = (
+                SyphonOpenGLClientObjC
+                .alloc()
+                .initWithServerDescription_context_options_newFrameHandler_(
+                    description.raw,
+                    self.cgl_context_obj,
+                    None,
+                    self._create_frame_handler())
+            )
+            self._frame_handler_active = True
+        except (TypeError, objc.error):
+            # fall back to polling if the handler block cannot be bridged
+            self.context = (
+                SyphonOpenGLClientObjC
+                .alloc()
+                .initWithServerDescription_context_options_newFrameHandler_(
+                    description.raw,
+                    self.cgl_context_obj,
+                    None,
+                    None)
+            )
 
     @property
     def is_valid(self) -> bool:
@@ -195,10 +232,12 @@ class SyphonOpenGLClient(BaseSyphonClient):
         Returns:
         - Any: The new frame image.
         """
-        return self.context.newFrameImage()
+        with tracing.span("new_frame_image", "client", server=self._description.name):
+            return self.context.newFrameImage()
 
     def stop(self):
         """
         Stop the SyphonOpenGLClient.
         """
         self.context.stop()
+        self._on_stop()
@@ -0,0 +1,458 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from syphon.client import BaseSyphonClient, SyphonMetalClient
+from syphon.metadata import FrameMetadata
+from syphon.resources import get_resource_registry
+from syphon.server_directory import SyphonServerDirectory, SyphonServerDescription, SyphonServerNotification
+from syphon.utils.pool import ImageBufferPool
+
+# back-off between reconnects of a failed feed
+_MIN_RETRY_INTERVAL = 0.5
+_MAX_RETRY_INTERVAL = 30.0
+
+# number of retired feeds whose status is kept
+_MAX_RETIRED_FEEDS = 64
+
+
+@dataclass
+class ClientRule:
+    """
+    Rule selecting the servers a `ClientManager` subscribes to. All criteria that are set have to match.
+
+    Attributes:
+    - name (Optional[str]): The server name to match.
+    - app_name (Optional[str]): The application name to match.
+    - predicate (Optional[Callable[[SyphonServerDescription], bool]]): A custom condition.
+    """
+    name: Optional[str] = None
+    app_name: Optional[str] = None
+    predicate: Optional[Callable[[SyphonServerDescription], bool]] = None
+
+    def matches(self, description: SyphonServerDescription) -> bool:
+        """
+        Check if a server matches the rule.
+
+        Parameters:
+        - description (SyphonServerDescription): The description of the server.
+
+        Returns:
+        - bool: True if the server matches, False otherwise.
+        """
+        if self.name is not None and self.name != description.name:
+            return False
+
+        if self.app_name is not None and self.app_name != description.app_name:
+            return False
+
+        if self.predicate is not None and not self.predicate(description):
+            return False
+
+        return True
+
+
+class FeedState(Enum):
+    """
+    Enum representing the state of a feed of the `ClientManager`.
+
+    Enum Values:
+    - Connected: A client is connected to the server.
+    - Failed: The client could not be created, it is retried with back-off.
+    - Retired: The server is no longer available and the client has been released.
+    """
+    Connected = "connected"
+    Failed = "failed"
+    Retired = "retired"
+
+
+@dataclass
+class FeedStatus:
+    """
+    Status and statistics of a single feed.
+
+    Attributes:
+    - description (SyphonServerDescription): The latest description of the server.
+    - state (FeedState): The state of the feed.
+    - frames (int): The number of received frames.
+    - fps (float): The smoothed frame rate of the feed.
+    - last_frame_at (Optional[float]): The monotonic time the last frame was received.
+    - errors (int): The number of errors raised while handling the feed.
+    - last_error (Optional[BaseException]): The most recent error.
+    - retries (int): The number of failed connection attempts in a row.
+    - retry_at (Optional[float]): The monotonic time the next connection attempt of a failed feed is due.
+    """
+    description: SyphonServerDescription
+    state: FeedState = FeedState.Connected
+    frames: int = 0
+    fps: float = 0.0
+    last_frame_at: Optional[float] = None
+    errors: int = 0
+    last_error: Optional[BaseException] = field(default=None, repr=False)
+    retries: int = 0
+    retry_at: Optional[float] = None
+
+
+FrameCallback = Callable[[FeedStatus, Any, FrameMetadata], None]
+
+
+class ClientManager:
+    """
+    Keeps one client per server uuid for all servers matching a set of rules.
+
+    Clients are created when a matching server is announced, kept across updates and stopped when the server
+    retires. Feeds whose client could not be created are retried with an exponential back-off. All clients share
+    one Metal device and one readback buffer pool, and are serviced from a single scheduler thread, which sleeps
+    until one of the clients signals a new frame.
+
+    Attributes:
+    - directory (SyphonServerDirectory): The directory used to discover servers.
+    - rules (List[ClientRule]): The rules selecting servers. If empty, all servers are subscribed.
+    - on_frame (Optional[FrameCallback]): Called on the scheduler thread for every received frame.
+    - readback (bool): If True, frames are read back into pooled NumPy images before `on_frame` is called.
+    - device (Any): The Metal device shared by all clients.
+    - buffer_pool (ImageBufferPool): The pool of readback buffers shared by all feeds.
+    - refresh_interval (float): The interval in seconds at which the directory is reconciled.
+    - poll_interval (float): The interval in seconds at which clients without a frame handler are polled.
+    """
+
+    def __init__(self,
+                 rules: Sequence[ClientRule] = (),
+                 on_frame: Optional[FrameCallback] = None,
+                 readback: bool = False,
+                 directory: Optional[SyphonServerDirectory] = None,
+                 device: Optional[Any] = None,
+                 buffer_pool: Optional[ImageBufferPool] = None,
+                 refresh_interval: float = 1.0,
+                 poll_interval: float = 0.005,
+                 client_factory: Optional[Callable[[SyphonServerDescription, Any], BaseSyphonClient]] = None):
+        """
+        Initialize a ClientManager.
+
+        Parameters:
+        - rules (Sequence[ClientRule], optional): The rules selecting servers. If empty, all servers are subscribed.
+        - on_frame (FrameCallback, optional): Called with the feed status, the frame (texture or NumPy image)
+          and its metadata. A read back image is only valid during the call.
+        - readback (bool, optional): If True, frames are read back into pooled NumPy images. Defaults to False.
+        - directory (SyphonServerDirectory, optional): The directory to use. If None, a new one is created.
+        - device (Any, optional): The shared Metal device. If None, the default system device will be used.
+        - buffer_pool (ImageBufferPool, optional): The shared readback buffer pool. If None, a new one is created.
+        - refresh_interval (float, optional): The directory reconcile interval in seconds. Defaults to 1.0.
+        - poll_interval (float, optional): The poll interval for clients without frame handler. Defaults to 0.005.
+        - client_factory (Callable, optional): Creates a client from a description and the shared device.
+          Defaults to `SyphonMetalClient`.
+        """
+        self.rules = list(rules)
+        self.on_frame = on_frame
+        self.readback = readback
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+
+        if directory is None:
+            directory = SyphonServerDirectory()
+            directory.run_loop_interval = 0.01
+        self.directory = directory
+
+        self.device = get_resource_registry().default_device() if device is None else device
+        self.buffer_pool = ImageBufferPool() if buffer_pool is None else buffer_pool
+
+        self._client_factory = client_factory if client_factory is not None else \
+            lambda description, shared_device: SyphonMetalClient(description, device=shared_device)
+
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, FeedStatus] = {}
+        self._retired: "OrderedDict[str, None]" = OrderedDict()
+        self._clients: Dict[str, BaseSyphonClient] = {}
+        self._events: "queue.Queue[Tuple[SyphonServerNotification, Any]]" = queue.Queue()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._observers: List[Any] = []
+
+    @property
+    def feeds(self) -> Dict[str, FeedStatus]:
+        """
+        Get the status of all feeds, including the most recently retired ones.
+
+        Returns:
+        - Dict[str, FeedStatus]: The feed status by server uuid.
+        """
+        with self._lock:
+            return dict(self._feeds)
+
+    def status(self, uuid: str) -> Optional[FeedStatus]:
+        """
+        Get the status of a single feed.
+
+        Parameters:
+        - uuid (str): The uuid of the server.
+
+        Returns:
+        - Optional[FeedStatus]: The status of the feed, or None if the server is unknown.
+        """
+        with self._lock:
+            return self._feeds.get(uuid)
+
+    def client(self, uuid: str) -> Optional[BaseSyphonClient]:
+        """
+        Get the client of a connected feed.
+
+        Parameters:
+        - uuid (str): The uuid of the server.
+
+        Returns:
+        - Optional[BaseSyphonClient]: The client, or None if the feed is not connected.
+        """
+        with self._lock:
+            return self._clients.get(uuid)
+
+    def matches(self, description: SyphonServerDescription) -> bool:
+        """
+        Check if a server is selected by the rules.
+
+        Parameters:
+        - description (SyphonServerDescription): The description of the server.
+
+        Returns:
+        - bool: True if the manager subscribes to the server, False otherwise.
+        """
+        return not self.rules or any(rule.matches(description) for rule in self.rules)
+
+    def start(self):
+        """
+        Register the directory observers and start the scheduler thread.
+
+        Directory notifications are delivered while the run loop of the main thread is updated (for example with
+        `directory.update_run_loop()`). Without that, servers are still picked up by the periodic reconcile.
+        """
+        if self._running:
+            return
+
+        for notification in SyphonServerNotification:
+            self._observers.append(self.directory.add_observer(notification, self._create_observer(notification)))
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ClientManager", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the scheduler thread, remove the directory observers and release all clients.
+        """
+        for token in self._observers:
+            self.directory.remove_observer(token)
+        self._observers.clear()
+
+        self._running = False
+        self._wake.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            uuids = list(self._clients)
+
+        for uuid in uuids:
+            self._retire(uuid)
+
+    def update(self):
+        """
+        Process pending directory events, reconcile the feeds with the directory and service all clients once.
+
+        This is called periodically by the scheduler thread, but can also be called manually without `start()`.
+        """
+        self._process_events()
+        self._reconcile(self.directory.servers)
+        self._retry_failed()
+        self._service_clients()
+
+    def _run(self):
+        next_refresh = 0.0
+
+        while self._running:
+            now = time.monotonic()
+            if now >= next_refresh:
+                self._reconcile(self.directory.servers)
+                next_refresh = time.monotonic() + self.refresh_interval
+
+            self._process_events()
+            self._retry_failed()
+            self._service_clients()
+
+            # sleep until a client signals a frame, polling clients, retries and the directory refresh need waking up
+            with self._lock:
+                polling = any(not c.has_frame_handler for c in self._clients.values())
+                retries = [f.retry_at for f in self._feeds.values() if f.state == FeedState.Failed]
+            wake_at = min([next_refresh] + retries)
+            timeout = max(0.0, wake_at - time.monotonic())
+            if polling:
+                timeout = min(timeout, self.poll_interval)
+
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _create_observer(self, notification: SyphonServerNotification) -> Callable[[Any], None]:
+        def observer(event: Any):
+            self._events.put((notification, event.userInfo()))
+            self._wake.set()
+
+        return observer
+
+    def _on_client_frame(self, client: BaseSyphonClient):
+        self._wake.set()
+
+    def _process_events(self):
+        while True:
+            try:
+                notification, raw = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+            description = SyphonServerDescription.from_raw(raw)
+            if notification == SyphonServerNotification.Retire:
+                SyphonServerDescription.forget_interned(description.uuid)
+                self._retire(description.uuid)
+            else:
+                self._announce(description)
+
+    def _reconcile(self, servers: List[SyphonServerDescription]):
+        available = {s.uuid for s in servers}
+
+        for description in servers:
+            self._announce(description)
+
+        # failed feeds of servers that are gone must not be retried anymore
+        with self._lock:
+            gone = [uuid for uuid, feed in self._feeds.items()
+                    if uuid not in available and (uuid in self._clients or feed.state == FeedState.Failed)]
+
+        for uuid in gone:
+            self._retire(uuid)
+
+    def _announce(self, description: SyphonServerDescription):
+        with self._lock:
+            feed = self._feeds.get(description.uuid)
+            connected = description.uuid in self._clients
+
+        if not self.matches(description):
+            if connected or (feed is not None and feed.state == FeedState.Failed):
+                self._retire(description.uuid)
+            return
+
+        if connected:
+            # updates keep the existing client
+            feed.description = description
+            return
+
+        if feed is not None and feed.state == FeedState.Failed:
+            # failed feeds keep their statistics and are only retried once the back-off has passed
+            feed.description = description
+            if time.monotonic() < feed.retry_at:
+                return
+        else:
+            feed = FeedStatus(description)
+
+        client = None
+        try:
+            client = self._client_factory(description, self.device)
+            client.add_frame_listener(self._on_client_frame)
+        except Exception as e:
+            if client is not None:
+                client.stop()
+            feed.errors += 1
+            feed.last_error = e
+            feed.retries += 1
+            interval = min(_MIN_RETRY_INTERVAL * 2 ** min(feed.retries - 1, 16), _MAX_RETRY_INTERVAL)
+            feed.retry_at = time.monotonic() + interval
+            client = None
+
+        duplicate = None
+        with self._lock:
+            if client is not None and description.uuid in self._clients:
+                # another thread (e.g. a manual update()) connected the feed in the meantime
+                duplicate = client
+            elif client is not None:
+                feed.state = FeedState.Connected
+                feed.retries = 0
+                feed.retry_at = None
+                self._clients[description.uuid] = client
+                self._feeds[description.uuid] = feed
+                self._retired.pop(description.uuid, None)
+            else:
+                feed.state = FeedState.Failed
+                self._feeds[description.uuid] = feed
+                self._retired.pop(description.uuid, None)
+
+        if duplicate is not None:
+            duplicate.remove_frame_listener(self._on_client_frame)
+            duplicate.stop()
+
+    def _retry_failed(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [f.description for f in self._feeds.values() if f.state == FeedState.Failed and f.retry_at <= now]
+
+        for description in due:
+            self._announce(description)
+
+    def _retire(self, uuid: str):
+        with self._lock:
+            client = self._clients.pop(uuid, None)
+            feed = self._feeds.get(uuid)
+
+            if feed is not None:
+                feed.state = FeedState.Retired
+                self._retired[uuid] = None
+                self._retired.move_to_end(uuid)
+
+            # only the status of the most recently retired feeds is kept
+            while len(self._retired) > _MAX_RETIRED_FEEDS:
+                oldest, _ = self._retired.popitem(last=False)
+                self._feeds.pop(oldest, None)
+
+        if client is not None:
+            client.remove_frame_listener(self._on_client_frame)
+            client.stop()
+
+    def _service_clients(self):
+        # the feed may be retired from another thread (e.g. a manual update()) while the clients are serviced
+        with self._lock:
+            clients = [(client, self._feeds[uuid]) for uuid, client in self._clients.items() if uuid in self._feeds]
+
+        for client, feed in clients:
+            try:
+                frame = client.try_get_frame()
+                if frame is not None:
+                    self._handle_frame(feed, *frame)
+            except Exception as e:
+                feed.errors += 1
+                feed.last_error = e
+
+    def _handle_frame(self, feed: FeedStatus, image: Any, metadata: FrameMetadata):
+        now = metadata.received_at
+        if feed.last_frame_at is not None and now > feed.last_frame_at:
+            # exponential moving average of the instantaneous frame rate
+            feed.fps += (1.0 / (now - feed.last_frame_at) - feed.fps) * 0.1
+        feed.last_frame_at = now
+        feed.frames += 1
+
+        if self.on_frame is None:
+            return
+
+        if not self.readback:
+            self.on_frame(feed, image, metadata)
+            return
+
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+
+        buffer = self.buffer_pool.acquire((image.height(), image.width(), 4))
+        try:
+            copy_mtl_texture_to_image(image, out=buffer)
+            self.on_frame(feed, buffer, metadata)
+        finally:
+            self.buffer_pool.release(buffer)
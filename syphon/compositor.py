@@ -0,0 +1,382 @@
+import itertools
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from syphon.types import Region
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+# multiplying a 16-bit value with this constant copies it into all four 16-bit lanes of a 64-bit value
+_SPREAD_LANES = np.uint64(0x0001000100010001)
+
+# index of the high byte of a 16-bit value in memory
+_HIGH_BYTE = 1 if sys.byteorder == "little" else 0
+
+
+class BlendMode(Enum):
+    """
+    Enum representing how a layer is combined with the layers below.
+
+    Enum Values:
+    - Normal: The layer is drawn over the layers below.
+    - Add: The layer is added to the layers below (clamped).
+    - Multiply: The layer is multiplied with the layers below.
+    - Screen: The inverted layer is multiplied with the inverted layers below.
+    """
+    Normal = "normal"
+    Add = "add"
+    Multiply = "multiply"
+    Screen = "screen"
+
+
+@dataclass
+class Layer:
+    """
+    A layer of a compositor. The properties can be changed at any time, the next composition picks them up.
+
+    Attributes:
+    - key (Hashable): The key of the layer, e.g. the name of the input.
+    - x (int): The horizontal position of the layer in the output.
+    - y (int): The vertical position of the layer in the output.
+    - scale (float): The scale of the layer (nearest neighbour).
+    - opacity (float): The opacity of the layer between 0 and 1, multiplied with the alpha of the image.
+    - blend (BlendMode): The blend mode of the layer.
+    - visible (bool): If False, the layer is not drawn.
+    """
+    key: Hashable
+    x: int = 0
+    y: int = 0
+    scale: float = 1.0
+    opacity: float = 1.0
+    blend: BlendMode = BlendMode.Normal
+    visible: bool = True
+
+
+class _Resampler:
+    def __init__(self, src_shape: Tuple[int, ...], width: int, height: int):
+        src_height, src_width = src_shape[:2]
+        self.rows = ((np.arange(height) * 2 + 1) * src_height) // (2 * height)
+        self.cols = ((np.arange(width) * 2 + 1) * src_width) // (2 * width)
+        self.src_shape = src_shape
+        self.temp = np.empty((height, src_width, 4), dtype=np.uint8)
+        self.image = np.empty((height, width, 4), dtype=np.uint8)
+
+    def resample(self, image: np.ndarray) -> np.ndarray:
+        np.take(image, self.rows, axis=0, out=self.temp)
+        np.take(self.temp, self.cols, axis=1, out=self.image)
+        return self.image
+
+
+class Compositor:
+    """
+    Mixes multiple RGBA images into one output image with integer math in preallocated buffers.
+
+    Layers are drawn in the order they were added. Blending uses 16-bit intermediates and in-place NumPy ufuncs,
+    so composing a frame does not allocate. Only the region covered by layers that changed since the last
+    composition (new image, moved, faded, ...) is redrawn, and if nothing changed the output is returned as is.
+
+    Attributes:
+    - width (int): The width of the output.
+    - height (int): The height of the output.
+    - background (Tuple[int, int, int, int]): The RGBA colour below all layers.
+    - output (np.ndarray): The output image of shape (height, width, 4).
+    - layers (List[Layer]): The layers from bottom to top.
+    - dirty_region (Optional[Region]): The region redrawn by the last composition, or None if nothing changed.
+    """
+
+    def __init__(self, width: int, height: int, background: Tuple[int, int, int, int] = (0, 0, 0, 255)):
+        """
+        Initialize a Compositor.
+
+        Parameters:
+        - width (int): The width of the output.
+        - height (int): The height of the output.
+        - background (Tuple[int, int, int, int], optional): The RGBA colour below all layers. Defaults to black.
+        """
+        self.width = width
+        self.height = height
+        self.background = background
+        self.output = np.empty((height, width, 4), dtype=np.uint8)
+        self.layers: List[Layer] = []
+        self.dirty_region: Optional[Region] = None
+
+        # 16-bit scratch buffers of the output size, regions use views of them
+        registry = get_memory_registry()
+        self._alpha = np.empty((height, width, 1), dtype=np.uint16)
+        self._alpha_temp = np.empty((height, width, 1), dtype=np.uint16)
+        self._alpha4 = np.empty((height, width, 4), dtype=np.uint16)
+        self._blend = np.empty((height, width, 4), dtype=np.uint16)
+        self._temp = np.empty((height, width, 4), dtype=np.uint16)
+        for buffer in (self.output, self._alpha, self._alpha_temp, self._alpha4, self._blend, self._temp):
+            registry.track(buffer, buffer.nbytes, "compositor", MemoryKind.Buffer)
+
+        self._images: Dict[Hashable, np.ndarray] = {}
+        self._versions: Dict[Hashable, int] = {}
+        # versions are unique across all layers, so a re-added layer never matches a state drawn before
+        self._version_counter = itertools.count()
+        self._resamplers: Dict[Hashable, _Resampler] = {}
+        self._texture_buffers: Dict[Hashable, np.ndarray] = {}
+        self._drawn: Dict[Hashable, Tuple[Any, Optional[Region]]] = {}
+        self._redraw_all = True
+        self._texture: Any = None
+
+    def add_layer(self, key: Hashable, **properties: Any) -> Layer:
+        """
+        Add a layer on top of the existing ones.
+
+        Parameters:
+        - key (Hashable): The key of the layer.
+        - **properties: The initial properties of the layer (see `Layer`).
+
+        Returns:
+        - Layer: The layer.
+
+        Raises:
+        - KeyError: If a layer with the key already exists.
+        """
+        if any(layer.key == key for layer in self.layers):
+            raise KeyError(f"Layer {key!r} already exists")
+
+        layer = Layer(key, **properties)
+        self.layers.append(layer)
+        self._versions[key] = next(self._version_counter)
+        return layer
+
+    def remove_layer(self, key: Hashable):
+        """
+        Remove a layer.
+
+        Parameters:
+        - key (Hashable): The key of the layer.
+        """
+        self.layers = [layer for layer in self.layers if layer.key != key]
+        self._images.pop(key, None)
+        self._versions.pop(key, None)
+        self._resamplers.pop(key, None)
+        self._texture_buffers.pop(key, None)
+
+    def layer(self, key: Hashable) -> Layer:
+        """
+        Get a layer by its key.
+
+        Parameters:
+        - key (Hashable): The key of the layer.
+
+        Returns:
+        - Layer: The layer.
+        """
+        for layer in self.layers:
+            if layer.key == key:
+                return layer
+        raise KeyError(f"Layer {key!r} does not exist")
+
+    def update(self, key: Hashable, image: np.ndarray):
+        """
+        Set the image of a layer. The array is referenced, not copied. If it is changed in place later on,
+        `update()` has to be called again.
+
+        Parameters:
+        - key (Hashable): The key of the layer.
+        - image (np.ndarray): The RGBA image of shape (height, width, 4) and type uint8.
+        """
+        assert image.ndim == 3 and image.shape[2] == 4, "Image has to be of shape (m, n, 4)"
+        assert image.dtype == np.uint8, "Image has to be of type uint8"
+
+        self._images[key] = image
+        self._versions[key] = next(self._version_counter)
+
+    def update_from_texture(self, key: Hashable, texture: Any):
+        """
+        Read back a Metal texture into the reused input buffer of a layer.
+
+        Parameters:
+        - key (Hashable): The key of the layer.
+        - texture (Any): The RGBA or BGRA Metal texture, e.g. a frame received by a `SyphonMetalClient`.
+        """
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+
+        shape = (texture.height(), texture.width(), 4)
+        buffer = self._texture_buffers.get(key)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            get_memory_registry().track(buffer, buffer.nbytes, "compositor", MemoryKind.Buffer)
+            self._texture_buffers[key] = buffer
+
+        self.update(key, copy_mtl_texture_to_image(texture, out=buffer))
+
+    def compose(self) -> np.ndarray:
+        """
+        Redraw the regions of the output that changed since the last composition.
+
+        Returns:
+        - np.ndarray: The output image of shape (height, width, 4).
+        """
+        dirty: Optional[Region] = (0, 0, self.width, self.height) if self._redraw_all else None
+        states: Dict[Hashable, Tuple[Any, Optional[Region]]] = {}
+
+        for layer in self.layers:
+            state = (layer.x, layer.y, layer.scale, layer.opacity, layer.blend, layer.visible,
+                     self._versions[layer.key])
+            rect = self._layer_rect(layer)
+            states[layer.key] = (state, rect)
+
+            drawn = self._drawn.get(layer.key)
+            if drawn is None or drawn[0] != state:
+                dirty = _union(dirty, rect)
+                dirty = _union(dirty, None if drawn is None else drawn[1])
+
+        # removed layers leave their area dirty
+        for key, (_, rect) in self._drawn.items():
+            if key not in states:
+                dirty = _union(dirty, rect)
+
+        self._drawn = states
+        self._redraw_all = False
+        self.dirty_region = _intersect(dirty, (0, 0, self.width, self.height))
+
+        if self.dirty_region is not None:
+            self._draw(self.dirty_region)
+
+        return self.output
+
+    def publish(self, server: Any, is_flipped: bool = False):
+        """
+        Compose the output, upload the redrawn region and publish it with a `SyphonMetalServer`.
+
+        Parameters:
+        - server (SyphonMetalServer): The server to publish with.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        """
+        from syphon.utils.raw import copy_bytes_to_mtl_texture, create_mtl_texture
+
+        if self._texture is None:
+            self._texture = create_mtl_texture(server.device, self.width, self.height, owner=f"server:{server.name}")
+            self._redraw_all = True
+
+        self.compose()
+
+        if self.dirty_region is not None:
+            x, y, width, height = self.dirty_region
+
+            # the rows of the dirty region are contiguous in the output, starting at the first dirty pixel
+            data = memoryview(self.output[y:y + height].reshape(-1))[x * 4:]
+            copy_bytes_to_mtl_texture(data, self._texture, self.dirty_region, bytes_per_row=self.width * 4)
+
+        server.publish_frame_texture(self._texture, is_flipped=is_flipped)
+
+    def _layer_rect(self, layer: Layer) -> Optional[Region]:
+        image = self._images.get(layer.key)
+        if image is None or not layer.visible or layer.opacity <= 0:
+            return None
+
+        height, width = image.shape[:2]
+        return layer.x, layer.y, max(1, round(width * layer.scale)), max(1, round(height * layer.scale))
+
+    def _layer_image(self, layer: Layer, rect: Region) -> np.ndarray:
+        image = self._images[layer.key]
+        width, height = rect[2], rect[3]
+
+        if image.shape[:2] == (height, width):
+            return image
+
+        resampler = self._resamplers.get(layer.key)
+        if resampler is None or resampler.src_shape != image.shape or resampler.image.shape[:2] != (height, width):
+            resampler = _Resampler(image.shape, width, height)
+            self._resamplers[layer.key] = resampler
+
+        return resampler.resample(image)
+
+    def _draw(self, region: Region):
+        x, y, width, height = region
+        self.output[y:y + height, x:x + width] = self.background
+
+        for layer in self.layers:
+            rect = self._drawn[layer.key][1]
+            area = _intersect(rect, region)
+            if area is None:
+                continue
+
+            ax, ay, aw, ah = area
+            image = self._layer_image(layer, rect)
+            src = image[ay - rect[1]:ay - rect[1] + ah, ax - rect[0]:ax - rect[0] + aw]
+            dst = self.output[ay:ay + ah, ax:ax + aw]
+
+            self._blend_into(dst, src, layer)
+
+    def _blend_into(self, dst: np.ndarray, src: np.ndarray, layer: Layer):
+        height, width = dst.shape[:2]
+        alpha = self._alpha[:height, :width]
+        alpha4 = self._alpha4[:height, :width]
+        blend = self._blend[:height, :width]
+        temp = self._temp[:height, :width]
+
+        # alpha = src alpha * opacity, spread to all four channels to avoid slow broadcasting
+        opacity = int(round(min(layer.opacity, 1.0) * 255))
+        if opacity == 255:
+            np.copyto(alpha, src[..., 3:4])
+        else:
+            np.multiply(src[..., 3:4], opacity, out=alpha, dtype=np.uint16)
+            _div255(alpha, self._alpha_temp[:height, :width])
+        np.multiply(alpha, _SPREAD_LANES, out=alpha4.view(np.uint64), dtype=np.uint64)
+
+        # blend = the layer combined with the output, weighted by alpha
+        if layer.blend == BlendMode.Normal:
+            np.multiply(src, alpha4, out=blend, dtype=np.uint16)
+        else:
+            if layer.blend == BlendMode.Add:
+                np.add(src, dst, out=blend, dtype=np.uint16)
+                np.minimum(blend, 255, out=blend)
+            elif layer.blend == BlendMode.Multiply:
+                np.multiply(src, dst, out=blend, dtype=np.uint16)
+                _div255(blend, temp)
+            else:
+                np.subtract(255, src, out=blend, dtype=np.uint16)
+                np.subtract(255, dst, out=temp, dtype=np.uint16)
+                np.multiply(blend, temp, out=blend)
+                _div255(blend, temp)
+                np.subtract(255, blend, out=blend)
+            np.multiply(blend, alpha4, out=blend)
+
+        # output = (blend * alpha + output * (255 - alpha)) / 255
+        np.subtract(255, alpha4, out=alpha4)
+        np.multiply(dst, alpha4, out=temp, dtype=np.uint16)
+        np.add(blend, temp, out=blend)
+
+        # rounded division by 255, the result is the high byte of each 16-bit value
+        np.add(blend, 128, out=blend)
+        np.right_shift(blend, 8, out=temp)
+        np.add(blend, temp, out=blend)
+        np.copyto(dst, blend.view(np.uint8)[..., _HIGH_BYTE::2])
+
+
+def _div255(values: np.ndarray, temp: np.ndarray):
+    # exact rounded division by 255 for values up to 255 * 255, in place
+    np.add(values, 128, out=values)
+    np.right_shift(values, 8, out=temp)
+    np.add(values, temp, out=values)
+    np.right_shift(values, 8, out=values)
+
+
+def _union(a: Optional[Region], b: Optional[Region]) -> Optional[Region]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1, y1 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def _intersect(a: Optional[Region], b: Optional[Region]) -> Optional[Region]:
+    if a is None or b is None:
+        return None
+
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
@@ -0,0 +1,227 @@
+import weakref
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from syphon.metadata import FrameMetadata
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+# device type of the DLPack specification for host memory
+_DLPACK_CPU = 1
+
+
+class Frame:
+    """
+    A received frame image in host memory, which can be shared with other frameworks without copying.
+
+    The pixels stay in the buffer the frame was read into (e.g. a pooled staging buffer). They are exposed through
+    `array()`, the buffer protocol (Python 3.12+ or `memoryview()`), `__array__` and `__dlpack__`,
+    so `np.asarray(frame)`, `torch.from_dlpack(frame)` and `jax.dlpack.from_dlpack(frame)` do not copy.
+
+    Since the buffer is reused after `release()`, consumers have to finish (or `copy()`) before the frame is
+    released. Exports through `array()`, `np.asarray()`, the buffer protocol and `__dlpack__` are tracked: releasing
+    a frame that is still exported raises a `BufferError`, unless it is forced.
+
+    Attributes:
+    - width (int): The width of the image.
+    - height (int): The height of the image.
+    - channels (int): The number of channels of the image.
+    - metadata (Optional[FrameMetadata]): The metadata of the frame.
+    """
+
+    def __init__(self,
+                 buffer: Any,
+                 width: int,
+                 height: int,
+                 channels: int = 4,
+                 metadata: Optional[FrameMetadata] = None,
+                 on_release: Optional[Callable[[Any], None]] = None):
+        """
+        Initialize a Frame.
+
+        Parameters:
+        - buffer (Any): A writable object supporting the buffer protocol with `width * height * channels` bytes.
+        - width (int): The width of the image.
+        - height (int): The height of the image.
+        - channels (int, optional): The number of channels of the image. Defaults to 4.
+        - metadata (FrameMetadata, optional): The metadata of the frame.
+        - on_release (Callable[[Any], None], optional): Called with the buffer when the frame is released,
+          e.g. to return it to a pool.
+
+        Raises:
+        - ValueError: If the buffer does not have the expected size.
+        """
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.metadata = metadata
+
+        self._buffer = buffer
+        self._array: Optional[np.ndarray] = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, channels)
+        self._on_release = on_release
+        self._exports: List[weakref.ref] = []
+
+    @classmethod
+    def from_mtl_texture(cls,
+                         texture: Any,
+                         pool: Optional[Any] = None,
+                         metadata: Optional[FrameMetadata] = None,
+                         owner: str = "frames") -> "Frame":
+        """
+        Read back a Metal texture into a frame.
+
+        Parameters:
+        - texture (Any): The RGBA or BGRA Metal texture.
+        - pool (ImageBufferPool, optional): The pool to take the staging buffer from and return it to on release.
+          If None, a new buffer is allocated.
+        - metadata (FrameMetadata, optional): The metadata of the frame.
+        - owner (str, optional): The owner a newly allocated buffer is accounted to in the memory registry,
+          e.g. `client:<uuid>`. Defaults to `frames`.
+
+        Returns:
+        - Frame: The frame.
+        """
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+
+        shape = (texture.height(), texture.width(), 4)
+        if pool is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            get_memory_registry().track(buffer, buffer.nbytes, owner, MemoryKind.Buffer)
+        else:
+            buffer = pool.acquire(shape)
+
+        copy_mtl_texture_to_image(texture, out=buffer)
+
+        return cls(buffer, shape[1], shape[0], 4, metadata, None if pool is None else pool.release)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """
+        Get the shape of the image.
+
+        Returns:
+        - Tuple[int, int, int]: The shape (height, width, channels).
+        """
+        return self.height, self.width, self.channels
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the size of the image in bytes.
+
+        Returns:
+        - int: The number of bytes.
+        """
+        return self.height * self.width * self.channels
+
+    @property
+    def is_released(self) -> bool:
+        """
+        Check if the frame has been released.
+
+        Returns:
+        - bool: True if the frame has been released, False otherwise.
+        """
+        return self._array is None
+
+    @property
+    def export_count(self) -> int:
+        """
+        Get the number of tracked exports (e.g. from `array()`, `np.asarray()` and `__dlpack__`) that are still alive.
+
+        Returns:
+        - int: The number of live exports.
+        """
+        self._exports = [ref for ref in self._exports if ref() is not None]
+        return len(self._exports)
+
+    def array(self) -> np.ndarray:
+        """
+        Get a NumPy view of the image. The view is tracked until it is garbage collected.
+
+        Returns:
+        - np.ndarray: The view of shape (height, width, channels).
+
+        Raises:
+        - BufferError: If the frame has been released.
+        """
+        view = self._checked_array().view()
+        self._exports.append(weakref.ref(view))
+        return view
+
+    def memoryview(self) -> memoryview:
+        """
+        Get a memoryview of the image. Unlike `memoryview(frame)`, memoryviews returned by this method are not
+        tracked, they should be released with the frame.
+
+        Returns:
+        - memoryview: The memoryview of shape (height, width, channels).
+
+        Raises:
+        - BufferError: If the frame has been released.
+        """
+        return memoryview(self._checked_array())
+
+    def copy(self) -> np.ndarray:
+        """
+        Copy the image into a new array, which stays valid after the frame is released.
+
+        Returns:
+        - np.ndarray: The copy of the image.
+
+        Raises:
+        - BufferError: If the frame has been released.
+        """
+        return self._checked_array().copy()
+
+    def release(self, force: bool = False):
+        """
+        Release the frame and hand its buffer back (e.g. to the pool). Releasing twice has no effect.
+
+        Parameters:
+        - force (bool, optional): If True, the frame is released even if it is still exported. Defaults to False.
+
+        Raises:
+        - BufferError: If the frame is still exported (e.g. through `array()` or `np.asarray()`) and not forced.
+        """
+        if self._array is None:
+            return
+
+        if not force and self.export_count > 0:
+            raise BufferError(f"Frame is still exported ({self.export_count} live views)")
+
+        buffer, self._buffer, self._array = self._buffer, None, None
+        self._exports.clear()
+
+        if self._on_release is not None:
+            self._on_release(buffer)
+
+    def __array__(self, dtype: Optional[Any] = None, copy: Optional[bool] = None) -> np.ndarray:
+        # the view is tracked, so the frame cannot be released while np.asarray(frame) is alive
+        array = self.copy() if copy else self.array()
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __dlpack__(self, stream: Optional[Any] = None, **kwargs: Any) -> Any:
+        return self.array().__dlpack__(stream=stream, **kwargs)
+
+    def __dlpack_device__(self) -> Tuple[int, int]:
+        return _DLPACK_CPU, 0
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # the memoryview keeps the tracked view alive
+        return memoryview(self.array())
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release(force=exc_type is not None)
+
+    def __repr__(self) -> str:
+        state = "released" if self.is_released else f"{self.width}x{self.height}x{self.channels}"
+        return f"Frame({state})"
+
+    def _checked_array(self) -> np.ndarray:
+        if self._array is None:
+            raise BufferError("Frame has already been released")
+        return self._array
@@ -0,0 +1,346 @@
+import os
+import threading
+import uuid as uuid_module
+import weakref
+from typing import Any, List, Optional, Tuple
+
+from syphon.base import BaseSyphonServer, BaseSyphonClient, PreparedFrame
+from syphon.server_description import SyphonServerDescription
+from syphon.types import Texture, Region, Size
+
+_servers_lock = threading.Lock()
+_servers: "weakref.WeakValueDictionary[str, SyphonLoopbackServer]" = weakref.WeakValueDictionary()
+
+
+def loopback_servers() -> List[SyphonServerDescription]:
+    """
+    Get the descriptions of all running loopback servers of this process.
+
+    Returns:
+    - List[SyphonServerDescription]: The server descriptions.
+    """
+    with _servers_lock:
+        return [server.description for server in _servers.values()]
+
+
+def loopback_servers_matching_name(name: Optional[str] = None,
+                                   app_name: Optional[str] = None) -> List[SyphonServerDescription]:
+    """
+    Get the descriptions of the running loopback servers matching the given name and application name.
+
+    Parameters:
+    - name (Optional[str]): The name to match.
+    - app_name (Optional[str]): The application name to match.
+
+    Returns:
+    - List[SyphonServerDescription]: The matching server descriptions.
+    """
+    return [s for s in loopback_servers()
+            if (name is None or s.name == name) and (app_name is None or s.app_name == app_name)]
+
+
+class PreparedLoopbackFrame(PreparedFrame):
+    """
+    Prepared publish handle of a `SyphonLoopbackServer`.
+
+    Attributes:
+    - image (Any): The frame image handed to the clients.
+    """
+    __slots__ = ("image", "_server")
+
+    def __init__(self, server: "SyphonLoopbackServer", image: Any):
+        """
+        Initialize a PreparedLoopbackFrame.
+
+        Parameters:
+        - server (SyphonLoopbackServer): The server to publish to.
+        - image (Any): The frame image handed to the clients.
+        """
+        self.image = image
+        self._server = server
+
+    def publish(self):
+        """
+        Publish the prepared frame image.
+        """
+        self._server._set_frame(self.image)
+
+
+class SyphonLoopbackServer(BaseSyphonServer):
+    """
+    Syphon server that hands frames to clients in the same process by reference, without copies or Syphon.
+
+    Any texture object can be published: Metal textures, OpenGL texture ids or NumPy images. For NumPy images,
+    the region and flipping are applied as views. Clients always receive the latest frame, older frames that
+    have not been received are skipped. The server works without Metal and can be used as a test double.
+
+    Attributes:
+    - name (str): The name of the server.
+    - description (SyphonServerDescription): The description clients use to connect.
+    - frame_count (int): The number of published frames.
+    """
+
+    def __init__(self, name: str, app_name: Optional[str] = None):
+        """
+        Initialize a SyphonLoopbackServer.
+
+        Parameters:
+        - name (str): The name of the server.
+        - app_name (str, optional): The application name of the description. Defaults to the process id.
+        """
+        super().__init__(name)
+
+        app_name = f"Python ({os.getpid()})" if app_name is None else app_name
+        self.description = SyphonServerDescription(str(uuid_module.uuid4()), name, app_name, None, None)
+        self.frame_count = 0
+
+        self._lock = threading.Lock()
+        self._frame: Any = None
+        self._clients: "weakref.WeakSet[SyphonLoopbackClient]" = weakref.WeakSet()
+        self._stopped = False
+
+        with _servers_lock:
+            _servers[self.description.uuid] = self
+
+    def publish_frame_texture(self,
+                              texture: Texture,
+                              region: Optional[Region] = None,
+                              size: Optional[Size] = None,
+                              is_flipped: bool = False):
+        """
+        Hand the texture over to all connected clients.
+
+        Parameters:
+        - texture (Texture): The texture or NumPy image to publish.
+        - region (Region, optional): The region of the image to publish (NumPy images only). Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped (NumPy images only). Defaults to False.
+        """
+        self._set_frame(self._frame_view(texture, region, is_flipped))
+
+    def prepare(self,
+                texture: Texture,
+                region: Optional[Region] = None,
+                size: Optional[Size] = None,
+                is_flipped: bool = False) -> PreparedLoopbackFrame:
+        """
+        Prepare a handle to repeatedly publish the given texture.
+
+        Parameters:
+        - texture (Texture): The texture or NumPy image to publish.
+        - region (Region, optional): The region of the image to publish (NumPy images only). Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped (NumPy images only). Defaults to False.
+
+        Returns:
+        - PreparedLoopbackFrame: The handle to publish the texture.
+        """
+        return PreparedLoopbackFrame(self, self._frame_view(texture, region, is_flipped))
+
+    def publish(self):
+        """
+        Publish the last frame again.
+        """
+        with self._lock:
+            frame = self._frame
+
+        if frame is not None:
+            self._set_frame(frame)
+
+    def rename(self, name: str):
+        """
+        Change the name of the server. The description keeps its uuid, so connected clients stay connected.
+
+        Parameters:
+        - name (str): The new name of the server.
+        """
+        description = self.description
+        self.description = SyphonServerDescription(description.uuid, name, description.app_name, None, None)
+        super().rename(name)
+
+    def stop(self):
+        """
+        Stop the server and disconnect all clients.
+        """
+        with _servers_lock:
+            _servers.pop(self.description.uuid, None)
+
+        with self._lock:
+            self._stopped = True
+            clients = list(self._clients)
+            self._clients.clear()
+
+        for client in clients:
+            client._on_stop()
+
+    @property
+    def has_clients(self) -> bool:
+        """
+        Check if the server has connected clients.
+
+        Returns:
+        - bool: True if there are clients, False otherwise.
+        """
+        return len(self._clients) > 0
+
+    def _get_texture_size(self, texture: Texture) -> Size:
+        """
+        Get the size of the texture.
+
+        Parameters:
+        - texture (Texture): A NumPy image or a texture with `width()` and `height()` methods.
+
+        Returns:
+        - Size: The size of the texture.
+        """
+        if hasattr(texture, "shape"):
+            return texture.shape[1], texture.shape[0]
+        return texture.width(), texture.height()
+
+    def _frame_view(self, texture: Texture, region: Optional[Region], is_flipped: bool) -> Any:
+        """
+        Apply region and flipping to NumPy images as views, other textures are passed through.
+
+        Parameters:
+        - texture (Texture): The texture or NumPy image.
+        - region (Optional[Region]): The region of the image.
+        - is_flipped (bool): If True, the image is flipped vertically.
+
+        Returns:
+        - Any: The frame image handed to clients.
+        """
+        if not hasattr(texture, "shape"):
+            return texture
+
+        image = texture
+        if region is not None:
+            x, y, width, height = region
+            image = image[y:y + height, x:x + width]
+
+        if is_flipped:
+            image = image[::-1]
+
+        return image
+
+    def _set_frame(self, frame: Any):
+        with self._lock:
+            if self._stopped:
+                return
+
+            self._frame = frame
+            self.frame_count += 1
+            clients = list(self._clients)
+
+        for client in clients:
+            client._on_new_frame()
+
+    def _connect(self, client: "SyphonLoopbackClient") -> bool:
+        with self._lock:
+            if self._stopped:
+                return False
+            self._clients.add(client)
+            return True
+
+    def _disconnect(self, client: "SyphonLoopbackClient"):
+        with self._lock:
+            self._clients.discard(client)
+
+    def _latest_frame(self) -> Tuple[Any, int]:
+        with self._lock:
+            return self._frame, self.frame_count
+
+
+class SyphonLoopbackClient(BaseSyphonClient):
+    """
+    Syphon client receiving frames of a `SyphonLoopbackServer` in the same process.
+
+    The received frame image is the published object itself (or a view of it), so it must not be modified
+    by the client and is only guaranteed to be unchanged until the producer reuses it for a later frame.
+
+    Attributes:
+    - description (SyphonServerDescription): The description of the loopback server.
+    """
+
+    def __init__(self, description: SyphonServerDescription):
+        """
+        Initialize a SyphonLoopbackClient.
+
+        Parameters:
+        - description (SyphonServerDescription): The description of a running loopback server.
+
+        Raises:
+        - ValueError: If there is no running loopback server with this description.
+        """
+        super().__init__(description)
+
+        with _servers_lock:
+            server = _servers.get(description.uuid)
+
+        if server is None or not server._connect(self):
+            raise ValueError(f"No loopback server is running for '{description.name}' ({description.uuid})")
+
+        self._server_ref = weakref.ref(server)
+        self._received_count = server.frame_count
+        self._frame_handler_active = True
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        Check if the client is still connected to a running server.
+
+        Returns:
+        - bool: True if the client is valid, False otherwise.
+        """
+        return not self._stopped and self._server_ref() is not None
+
+    @property
+    def has_new_frame(self) -> bool:
+        """
+        Check if the server published a frame that has not been received yet.
+
+        Returns:
+        - bool: True if there is a new frame, False otherwise.
+        """
+        server = self._server_ref()
+        return server is not None and server.frame_count > self._received_count
+
+    @property
+    def new_frame_image(self) -> Any:
+        """
+        Get the latest frame image.
+
+        Returns:
+        - Any: The latest frame image, or None if nothing has been published yet.
+        """
+        server = self._server_ref()
+        if server is None:
+            return None
+
+        frame, self._received_count = server._latest_frame()
+        return frame
+
+    def stop(self):
+        """
+        Disconnect the client from the server.
+        """
+        server = self._server_ref()
+        if server is not None:
+            server._disconnect(self)
+
+        self._on_stop()
+
+    def _read_frame_stamp(self, image: Any) -> Optional[Tuple[int, int]]:
+        """
+        Read the frame stamp of a received NumPy image.
+
+        Parameters:
+        - image (Any): The received frame image.
+
+        Returns:
+        - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None.
+        """
+        if not hasattr(image, "shape"):
+            return None
+
+        from syphon.utils.stamp import decode_frame_stamp
+        return decode_frame_stamp(image)
@@ -0,0 +1,141 @@
+import bisect
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class FrameMetadata:
+    """
+    Lightweight record describing a published or received frame.
+
+    All times are monotonic timestamps in seconds (`time.monotonic()`), which are comparable between
+    processes on the same machine.
+
+    Attributes:
+    - sequence (int): The sequence number of the frame.
+    - produced_at (Optional[float]): The time the producer created the frame.
+    - published_at (Optional[float]): The time the publish call completed.
+    - received_at (Optional[float]): The time the client received the frame.
+    """
+    sequence: int
+    produced_at: Optional[float] = None
+    published_at: Optional[float] = None
+    received_at: Optional[float] = None
+
+    @property
+    def timestamp_ns(self) -> int:
+        """
+        Get the production time in nanoseconds, as embedded in frame stamps.
+
+        Returns:
+        - int: The production time in nanoseconds.
+        """
+        return int(round(self.produced_at * 1e9)) if self.produced_at is not None else 0
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Get the time between production and reception of the frame.
+
+        Returns:
+        - Optional[float]: The latency in seconds, or None if one of the timestamps is missing.
+        """
+        if self.produced_at is None or self.received_at is None:
+            return None
+        return self.received_at - self.produced_at
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies with logarithmically spaced bins.
+
+    Attributes:
+    - bounds (List[float]): The upper bounds of the bins in seconds; the last bin collects everything above.
+    - counts (List[int]): The number of values per bin.
+    - count (int): The number of recorded values.
+    - total (float): The sum of all recorded values.
+    - maximum (float): The largest recorded value.
+    """
+
+    def __init__(self, minimum: float = 0.0001, maximum: float = 10.0, bins_per_decade: int = 10):
+        """
+        Initialize a LatencyHistogram.
+
+        Parameters:
+        - minimum (float, optional): The upper bound of the first bin in seconds. Defaults to 0.1ms.
+        - maximum (float, optional): The upper bound of the last regular bin in seconds. Defaults to 10s.
+        - bins_per_decade (int, optional): The number of bins per factor of ten. Defaults to 10.
+        """
+        decades = math.log10(maximum / minimum)
+        bin_count = int(math.ceil(decades * bins_per_decade)) + 1
+
+        self.bounds: List[float] = [minimum * 10 ** (i / bins_per_decade) for i in range(bin_count)]
+        self.counts: List[int] = [0] * (bin_count + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float):
+        """
+        Record a latency.
+
+        Parameters:
+        - value (float): The latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float:
+        """
+        Get the mean latency.
+
+        Returns:
+        - float: The mean latency in seconds, or 0 if nothing has been recorded.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Get an approximated percentile (the upper bound of the bin it falls into).
+
+        Parameters:
+        - p (float): The percentile between 0 and 100.
+
+        Returns:
+        - float: The latency in seconds, or 0 if nothing has been recorded.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = p / 100.0 * self.count
+        accumulated = 0
+        for i, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= rank and count > 0:
+                return self.bounds[i] if i < len(self.bounds) else self.maximum
+
+        return self.maximum
+
+    def items(self) -> List[Tuple[float, int]]:
+        """
+        Get the non-empty bins.
+
+        Returns:
+        - List[Tuple[float, int]]: The upper bound and count of each non-empty bin (`inf` for the overflow bin).
+        """
+        bounds = self.bounds + [math.inf]
+        return [(bounds[i], c) for i, c in enumerate(self.counts) if c > 0]
+
+    def reset(self):
+        """
+        Remove all recorded values.
+        """
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
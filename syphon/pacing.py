@@ -0,0 +1,165 @@
+import collections
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_SPIN_THRESHOLD = 0.002
+"""
+The time in seconds before a deadline at which sleeping switches to spinning.
+"""
+
+
+def sleep_until(deadline: float, spin_threshold: float = DEFAULT_SPIN_THRESHOLD):
+    """
+    Sleep until a deadline, spinning for the last moments to avoid oversleeping.
+
+    Parameters:
+    - deadline (float): The deadline as `time.perf_counter()` value.
+    - spin_threshold (float, optional): The time before the deadline at which sleeping switches to spinning.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > spin_threshold:
+        time.sleep(remaining - spin_threshold)
+
+    while time.perf_counter() < deadline:
+        pass
+
+
+@dataclass
+class PacerStats:
+    """
+    Statistics of a frame pacer.
+
+    Attributes:
+    - frames (int): The number of frames let through.
+    - dropped_frames (int): The number of frames rejected because they arrived before their deadline (non-blocking).
+    - deadline_misses (int): The number of deadlines without a frame on time.
+    - achieved_fps (float): The frame rate over the most recent frames.
+    """
+    frames: int = 0
+    dropped_frames: int = 0
+    deadline_misses: int = 0
+    achieved_fps: float = 0.0
+
+
+class FramePacer:
+    """
+    Paces frames to a target frame rate using absolute deadlines on the monotonic clock.
+
+    Deadlines lie on a fixed grid (`origin + n / fps`), so sleep jitter never accumulates into drift.
+    Waiting sleeps until shortly before the deadline and spins for the rest, which keeps the timing precise
+    without occupying a core. If the producer falls behind, the missed deadlines are skipped instead of
+    publishing a burst of frames to catch up.
+
+    Attributes:
+    - fps (float): The target frame rate.
+    - blocking (bool): If True, `wait()` blocks until the next deadline. If False, early frames are rejected.
+    - spin_threshold (float): The time before a deadline at which sleeping switches to spinning.
+    - tolerance (float): The lateness in seconds up to which a frame still counts as on time.
+    """
+
+    def __init__(self,
+                 fps: float,
+                 blocking: bool = True,
+                 spin_threshold: float = DEFAULT_SPIN_THRESHOLD,
+                 tolerance: float = 0.001,
+                 window: int = 120):
+        """
+        Initialize a FramePacer.
+
+        Parameters:
+        - fps (float): The target frame rate, e.g. 60 or 60000 / 1001 for 59.94 Hz.
+        - blocking (bool, optional): If True, `wait()` blocks until the next deadline. If False, it returns False
+          for frames that arrive before their deadline, so the producer can drop them. Defaults to True.
+        - spin_threshold (float, optional): The time before a deadline at which sleeping switches to spinning.
+        - tolerance (float, optional): The lateness in seconds up to which a frame is on time. Defaults to 1ms.
+        - window (int, optional): The number of frames the achieved frame rate is measured over. Defaults to 120.
+        """
+        if fps <= 0:
+            raise ValueError("The target frame rate has to be positive.")
+
+        self.fps = fps
+        self.blocking = blocking
+        self.spin_threshold = spin_threshold
+        self.tolerance = tolerance
+
+        self._period = 1.0 / fps
+        self._origin: Optional[float] = None
+        self._index = 0
+        self._frame_times = collections.deque(maxlen=window)
+        self._stats = PacerStats()
+
+    @property
+    def stats(self) -> PacerStats:
+        """
+        Get the pacing statistics.
+
+        Returns:
+        - PacerStats: The statistics including the achieved frame rate and the deadline misses.
+        """
+        if len(self._frame_times) > 1:
+            elapsed = self._frame_times[-1] - self._frame_times[0]
+            self._stats.achieved_fps = (len(self._frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+        return self._stats
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """
+        Get the next deadline.
+
+        Returns:
+        - Optional[float]: The next deadline as `time.perf_counter()` value, or None before the first frame.
+        """
+        if self._origin is None:
+            return None
+        return self._origin + (self._index + 1) * self._period
+
+    def wait(self) -> bool:
+        """
+        Wait for the deadline of the next frame.
+
+        Returns:
+        - bool: True if the frame should be published now, False if it arrived early and should be dropped
+          (only in non-blocking mode).
+        """
+        now = time.perf_counter()
+
+        if self._origin is None:
+            self._origin = now
+            self._index = 0
+            return self._accept(now)
+
+        deadline = self._origin + (self._index + 1) * self._period
+
+        if now < deadline:
+            if not self.blocking:
+                self._stats.dropped_frames += 1
+                return False
+
+            sleep_until(deadline, self.spin_threshold)
+            self._index += 1
+            return self._accept(time.perf_counter())
+
+        # the producer is late: align to the most recent deadline on the grid and skip the ones in between
+        slot = int(math.floor((now - self._origin) / self._period))
+        skipped = slot - (self._index + 1)
+        late = now - (self._origin + slot * self._period) > self.tolerance
+
+        self._stats.deadline_misses += skipped + (1 if late else 0)
+        self._index = slot
+        return self._accept(now)
+
+    def reset(self):
+        """
+        Restart the deadline grid with the next frame and clear the statistics.
+        """
+        self._origin = None
+        self._index = 0
+        self._frame_times.clear()
+        self._stats = PacerStats()
+
+    def _accept(self, now: float) -> bool:
+        self._frame_times.append(now)
+        self._stats.frames += 1
+        return True
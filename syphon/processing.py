@@ -0,0 +1,694 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+
+from syphon.utils.frame_ring import SharedFrameRing, SharedFrame
+
+if TYPE_CHECKING:
+    from syphon.client import BaseSyphonClient
+    from syphon.server import BaseSyphonServer
+    from syphon.server_directory import SyphonServerDescription
+
+FrameFunction = Callable[[np.ndarray], Any]
+
+
+class FrameSource(ABC):
+    """
+    Abstract base class for sources of frames for the `FrameProcessor`.
+    """
+
+    @abstractmethod
+    def read(self, timeout: float) -> Optional[Tuple[Any, float]]:
+        """
+        Read the next frame.
+
+        Parameters:
+        - timeout (float): The maximum time to wait for a frame in seconds.
+
+        Returns:
+        - Optional[Tuple[Any, float]]: The frame (NumPy image or Metal texture) and its timestamp, or None.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def is_open(self) -> bool:
+        """
+        Check if the source can still deliver frames.
+
+        Returns:
+        - bool: True if the source is open, False otherwise.
+        """
+        pass
+
+    def close(self):
+        """
+        Close the source.
+        """
+        pass
+
+
+class ClientFrameSource(FrameSource):
+    """
+    Frame source reading the frames of a Syphon client.
+
+    Attributes:
+    - client (BaseSyphonClient): The client to read the frames from.
+    """
+
+    def __init__(self, client: "BaseSyphonClient"):
+        """
+        Initialize a ClientFrameSource.
+
+        Parameters:
+        - client (BaseSyphonClient): The client to read the frames from.
+        """
+        self.client = client
+
+    def read(self, timeout: float) -> Optional[Tuple[Any, float]]:
+        frame = self.client.wait_for_frame(timeout)
+        if frame is None:
+            return None
+
+        image, metadata = frame
+        return image, metadata.received_at
+
+    @property
+    def is_open(self) -> bool:
+        return self.client.is_valid
+
+    def close(self):
+        self.client.stop()
+
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Frame source generating numbered frames at a fixed rate, e.g. to test processing pipelines without Syphon.
+
+    Every frame is filled with its frame number (modulo 256).
+
+    Attributes:
+    - width (int): The width of the frames.
+    - height (int): The height of the frames.
+    - fps (float): The frame rate. If 0, frames are generated as fast as they are read.
+    - frame_count (Optional[int]): The number of frames to generate. None generates frames forever.
+    - frames_generated (int): The number of frames generated so far.
+    """
+
+    def __init__(self, width: int, height: int, fps: float = 60.0, frame_count: Optional[int] = None):
+        """
+        Initialize a SyntheticFrameSource.
+
+        Parameters:
+        - width (int): The width of the frames.
+        - height (int): The height of the frames.
+        - fps (float, optional): The frame rate. If 0, frames are generated on every read. Defaults to 60.0.
+        - frame_count (int, optional): The number of frames to generate. None generates frames forever.
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = frame_count
+        self.frames_generated = 0
+
+        self._image = np.zeros((height, width, 4), dtype=np.uint8)
+        self._start: Optional[float] = None
+
+    def read(self, timeout: float) -> Optional[Tuple[Any, float]]:
+        if not self.is_open:
+            return None
+
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+
+        if self.fps > 0:
+            # frames are due on a fixed grid, frames missed in the meantime are skipped like a live source
+            due_index = int((now - self._start) * self.fps)
+            if due_index < self.frames_generated:
+                wait_time = self._start + self.frames_generated / self.fps - now
+                if wait_time > timeout:
+                    time.sleep(timeout)
+                    return None
+                time.sleep(wait_time)
+                due_index = self.frames_generated
+            self.frames_generated = due_index + 1
+        else:
+            self.frames_generated += 1
+
+        self._image.fill((self.frames_generated - 1) % 256)
+        return self._image, time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.frame_count is None or self.frames_generated < self.frame_count
+
+
+class FramePolicy:
+    """
+    Base class for frame-skipping policies. The base policy accepts every frame.
+
+    Attributes:
+    - drop_when_busy (bool): If True, frames arriving while all workers are busy are dropped.
+      Otherwise the processor waits for a free worker (backpressure).
+    """
+    drop_when_busy: bool = False
+
+    def accept(self, frame_number: int, timestamp: float) -> bool:
+        """
+        Decide if a frame should be processed.
+
+        Parameters:
+        - frame_number (int): The running number of the frame read from the source.
+        - timestamp (float): The timestamp of the frame.
+
+        Returns:
+        - bool: True if the frame should be processed, False if it is skipped.
+        """
+        return True
+
+
+class EveryNthFrame(FramePolicy):
+    """
+    Process only every n-th frame of the source.
+    """
+
+    def __init__(self, n: int):
+        """
+        Initialize an EveryNthFrame policy.
+
+        Parameters:
+        - n (int): The interval of processed frames.
+        """
+        self.n = n
+
+    def accept(self, frame_number: int, timestamp: float) -> bool:
+        return frame_number % self.n == 0
+
+
+class TimeSampling(FramePolicy):
+    """
+    Process at most one frame per time interval.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Initialize a TimeSampling policy.
+
+        Parameters:
+        - interval (float): The minimal time between two processed frames in seconds.
+        """
+        self.interval = interval
+        self._next_timestamp: Optional[float] = None
+
+    def accept(self, frame_number: int, timestamp: float) -> bool:
+        if self._next_timestamp is not None and timestamp < self._next_timestamp:
+            return False
+
+        self._next_timestamp = timestamp + self.interval
+        return True
+
+
+class LatestOnly(FramePolicy):
+    """
+    Process only the newest frame whenever a worker is free and drop everything that arrives in between.
+    """
+    drop_when_busy = True
+
+
+@dataclass
+class WorkerStats:
+    """
+    Statistics of a single worker process.
+
+    Attributes:
+    - frames (int): The number of processed frames.
+    - busy_time (float): The accumulated processing time in seconds.
+    - first_start (float): The monotonic time the worker started its first frame.
+    - last_finish (float): The monotonic time the worker finished its last frame.
+    """
+    frames: int = 0
+    busy_time: float = 0.0
+    first_start: float = 0.0
+    last_finish: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Get the throughput of the worker since its first frame.
+
+        Returns:
+        - float: The processed frames per second.
+        """
+        elapsed = self.last_finish - self.first_start
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class ProcessorStats:
+    """
+    Statistics of a frame processor.
+
+    Attributes:
+    - received (int): The number of frames read from the source.
+    - submitted (int): The number of frames submitted to the workers.
+    - completed (int): The number of results released in frame order.
+    - skipped (int): The number of frames skipped by the policy.
+    - dropped (int): The number of frames dropped because all workers were busy.
+    - failed (int): The number of frames whose frame function raised an exception.
+    - last_error (Optional[BaseException]): The most recent exception raised by the frame function.
+    - queue_latency (float): The mean time between submission and processing start in seconds.
+    - processing_time (float): The mean processing time per frame in seconds.
+    - workers (Dict[int, WorkerStats]): The statistics per worker, keyed by process id.
+    """
+    received: int = 0
+    submitted: int = 0
+    completed: int = 0
+    skipped: int = 0
+    dropped: int = 0
+    failed: int = 0
+    last_error: Optional[BaseException] = field(default=None, repr=False)
+    queue_latency: float = 0.0
+    processing_time: float = 0.0
+    workers: Dict[int, WorkerStats] = field(default_factory=dict)
+
+
+class FrameScheduler:
+    """
+    Scheduling core of the `FrameProcessor`, independent of any transport or executor.
+
+    It admits frames according to a policy and the number of frames in flight, hands out task indices,
+    and releases completed results strictly in the order the frames were admitted.
+
+    Attributes:
+    - max_in_flight (int): The maximum number of frames being processed at the same time.
+    - policy (FramePolicy): The frame-skipping policy.
+    - stats (ProcessorStats): The collected statistics.
+    """
+
+    def __init__(self, max_in_flight: int, policy: Optional[FramePolicy] = None):
+        """
+        Initialize a FrameScheduler.
+
+        Parameters:
+        - max_in_flight (int): The maximum number of frames being processed at the same time.
+        - policy (FramePolicy, optional): The frame-skipping policy. If None, every frame is processed.
+        """
+        self.max_in_flight = max_in_flight
+        self.policy = FramePolicy() if policy is None else policy
+        self.stats = ProcessorStats()
+
+        self._frame_number = 0
+        self._next_index = 0
+        self._next_release = 0
+        self._in_flight = 0
+        self._finished: Dict[int, Any] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Get the number of admitted frames whose results have not been released yet.
+
+        Returns:
+        - int: The number of frames in flight.
+        """
+        return self._in_flight
+
+    @property
+    def has_capacity(self) -> bool:
+        """
+        Check if another frame can be admitted.
+
+        Returns:
+        - bool: True if fewer than `max_in_flight` frames are in flight.
+        """
+        return self._in_flight < self.max_in_flight
+
+    def admit(self, timestamp: float) -> Optional[int]:
+        """
+        Register a frame read from the source and decide if it is processed.
+
+        The caller has to make sure there is capacity, unless the policy drops frames when busy.
+
+        Parameters:
+        - timestamp (float): The timestamp of the frame.
+
+        Returns:
+        - Optional[int]: The task index of the admitted frame, or None if it is skipped or dropped.
+        """
+        frame_number = self._frame_number
+        self._frame_number += 1
+        self.stats.received += 1
+
+        if not self.policy.accept(frame_number, timestamp):
+            self.stats.skipped += 1
+            return None
+
+        if not self.has_capacity:
+            self.stats.dropped += 1
+            return None
+
+        index = self._next_index
+        self._next_index += 1
+        self._in_flight += 1
+        self.stats.submitted += 1
+        return index
+
+    def cancel(self, index: int):
+        """
+        Withdraw an admitted frame that could not be submitted, keeping the result order intact.
+
+        Parameters:
+        - index (int): The task index of the frame.
+        """
+        self.stats.submitted -= 1
+        self.stats.dropped += 1
+        self._finished[index] = _CANCELLED
+
+    def fail(self, index: int, error: BaseException):
+        """
+        Register a frame whose processing failed. It is skipped in the result order.
+
+        Parameters:
+        - index (int): The task index of the frame.
+        - error (BaseException): The exception raised while processing the frame.
+        """
+        self.stats.failed += 1
+        self.stats.last_error = error
+        self._finished[index] = _CANCELLED
+
+    def complete(self, index: int, result: Any, worker_id: int,
+                 submitted_at: float, started_at: float, finished_at: float):
+        """
+        Register the result of a processed frame.
+
+        Parameters:
+        - index (int): The task index of the frame.
+        - result (Any): The result of the frame function.
+        - worker_id (int): The id of the worker that processed the frame.
+        - submitted_at (float): The monotonic time the frame was submitted.
+        - started_at (float): The monotonic time the worker started processing.
+        - finished_at (float): The monotonic time the worker finished processing.
+        """
+        self._finished[index] = result
+
+        worker = self.stats.workers.get(worker_id)
+        if worker is None:
+            worker = self.stats.workers[worker_id] = WorkerStats(first_start=started_at)
+
+        worker.frames += 1
+        worker.busy_time += finished_at - started_at
+        worker.last_finish = max(worker.last_finish, finished_at)
+
+        # running means over all processed frames
+        processed = sum(w.frames for w in self.stats.workers.values())
+        self.stats.queue_latency += ((started_at - submitted_at) - self.stats.queue_latency) / processed
+        self.stats.processing_time += ((finished_at - started_at) - self.stats.processing_time) / processed
+
+    def pop_ready(self) -> List[Tuple[int, Any]]:
+        """
+        Release all results that are next in frame order.
+
+        Returns:
+        - List[Tuple[int, Any]]: The task indices and results, in admission order.
+        """
+        ready = []
+        while self._next_release in self._finished:
+            result = self._finished.pop(self._next_release)
+            if result is not _CANCELLED:
+                ready.append((self._next_release, result))
+                self.stats.completed += 1
+            self._next_release += 1
+            self._in_flight -= 1
+        return ready
+
+
+class FrameProcessor:
+    """
+    Maps a function over the frames of a Syphon client (or any `FrameSource`) across a pool of worker processes.
+
+    Frames are handed to the workers through a `SharedFrameRing`, so they are not pickled. Results are
+    delivered in frame order and can optionally be published to a Syphon server.
+
+    The frame function has to be picklable (a module-level function) and receives a read-only view of the frame,
+    which is only valid during the call.
+
+    Attributes:
+    - source (FrameSource): The source of the frames.
+    - function (FrameFunction): The function applied to each frame.
+    - workers (int): The number of worker processes.
+    - scheduler (FrameScheduler): The scheduling core.
+    - output (Optional[BaseSyphonServer]): The server the results are published to.
+    - on_result (Optional[Callable[[int, Any], None]]): Called with the task index and result of each frame.
+    - on_error (Optional[Callable[[int, BaseException], None]]): Called with the task index and exception of each
+      frame that failed.
+    """
+
+    def __init__(self,
+                 source: Union["SyphonServerDescription", FrameSource],
+                 function: FrameFunction,
+                 workers: int = os.cpu_count() or 1,
+                 policy: Optional[FramePolicy] = None,
+                 max_in_flight: Optional[int] = None,
+                 output: Optional["BaseSyphonServer"] = None,
+                 on_result: Optional[Callable[[int, Any], None]] = None,
+                 on_error: Optional[Callable[[int, BaseException], None]] = None,
+                 executor_factory: Optional[Callable[..., Executor]] = None):
+        """
+        Initialize a FrameProcessor.
+
+        Parameters:
+        - source (Union[SyphonServerDescription, FrameSource]): A server description to connect a
+          `SyphonMetalClient` to, or any frame source.
+        - function (FrameFunction): The function applied to each frame.
+        - workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        - policy (FramePolicy, optional): The frame-skipping policy. If None, every frame is processed.
+        - max_in_flight (int, optional): The maximum number of frames in flight. Defaults to twice the workers.
+          Policies that drop frames when busy (e.g. `LatestOnly`) are limited to one frame per worker.
+        - output (BaseSyphonServer, optional): A server the results are published to. Results have to be
+          RGBA NumPy images. Defaults to None.
+        - on_result (Callable[[int, Any], None], optional): Called with each result in frame order.
+        - on_error (Callable[[int, BaseException], None], optional): Called when the frame function raises.
+          Failed frames are skipped and counted in the statistics.
+        - executor_factory (Callable[..., Executor], optional): Creates the executor from `max_workers`,
+          `initializer` and `initargs`. Defaults to `ProcessPoolExecutor`.
+        """
+        if not isinstance(source, FrameSource):
+            from syphon.client import SyphonMetalClient
+            source = ClientFrameSource(SyphonMetalClient(source))
+
+        self.source = source
+        self.function = function
+        max_in_flight = 2 * workers if max_in_flight is None else max_in_flight
+        if policy is not None and policy.drop_when_busy:
+            # frames are only admitted if a worker can start them right away, nothing queues behind busy workers
+            max_in_flight = min(max_in_flight, workers)
+
+        self.workers = workers
+        self.scheduler = FrameScheduler(max_in_flight, policy)
+        self.output = output
+        self.on_result = on_result
+        self.on_error = on_error
+
+        self._executor_factory = ProcessPoolExecutor if executor_factory is None else executor_factory
+        self._executor: Optional[Executor] = None
+        self._ring: Optional[SharedFrameRing] = None
+        self._pending: Dict[Future, Tuple[int, SharedFrame, float]] = {}
+        self._flushed: List[Tuple[int, Any]] = []
+        self._output_texture: Any = None
+        self._running = False
+
+    @property
+    def stats(self) -> ProcessorStats:
+        """
+        Get the processing statistics.
+
+        Returns:
+        - ProcessorStats: The statistics including per-worker throughput and queueing latency.
+        """
+        return self.scheduler.stats
+
+    def step(self, timeout: float = 0.01) -> List[Tuple[int, Any]]:
+        """
+        Read and submit at most one frame and release all results that are ready.
+
+        Parameters:
+        - timeout (float, optional): The maximum time to wait for a frame or a free worker in seconds.
+
+        Returns:
+        - List[Tuple[int, Any]]: The task indices and results released in this step, in frame order.
+        """
+        if not self.scheduler.has_capacity and not self.scheduler.policy.drop_when_busy:
+            # backpressure: wait for a worker to become free before reading the next frame
+            self._collect(timeout)
+        else:
+            frame = self.source.read(timeout)
+            if frame is not None:
+                self._submit(*frame)
+            self._collect(0)
+
+        # results released while the workers were restarted for a new frame size are returned with this step
+        released, self._flushed = self._flushed, []
+        released.extend(self._release())
+        return released
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Process frames until the source closes, `stop()` is called or the duration has passed.
+
+        Parameters:
+        - duration (float, optional): The maximum run time in seconds. None runs until stopped.
+        """
+        self._running = True
+        end = None if duration is None else time.monotonic() + duration
+
+        while self._running and self.source.is_open and (end is None or time.monotonic() < end):
+            self.step()
+
+        self.flush()
+        self._running = False
+
+    def flush(self) -> List[Tuple[int, Any]]:
+        """
+        Wait for all frames in flight and release their results.
+
+        Returns:
+        - List[Tuple[int, Any]]: The released task indices and results, in frame order.
+        """
+        released = []
+        while self._pending:
+            self._collect(None)
+            released.extend(self._release())
+        return released
+
+    def stop(self):
+        """
+        Stop a running `run()` loop after the current step.
+        """
+        self._running = False
+
+    def close(self):
+        """
+        Wait for pending frames, shut down the workers and release the shared memory and the source.
+        """
+        self.stop()
+        self.flush()
+        self._shutdown_workers()
+        self.source.close()
+
+    def _submit(self, frame: Any, timestamp: float):
+        index = self.scheduler.admit(timestamp)
+        if index is None:
+            return
+
+        if isinstance(frame, np.ndarray):
+            height, width = frame.shape[:2]
+        else:
+            width, height = frame.width(), frame.height()
+
+        if self._ring is None or (self._ring.width, self._ring.height) != (width, height):
+            self._start_workers(width, height)
+
+        if isinstance(frame, np.ndarray):
+            sequence = self._ring.write_image(frame, timestamp)
+        else:
+            sequence = self._ring.write_texture(frame, timestamp)
+
+        shared_frame = None if sequence is None else self._ring.acquire_latest(after=sequence - 1)
+        if shared_frame is None:
+            self.scheduler.cancel(index)
+            return
+
+        submitted_at = time.monotonic()
+        future = self._executor.submit(_process_frame, shared_frame.slot, submitted_at)
+        self._pending[future] = (index, shared_frame, submitted_at)
+
+    def _collect(self, timeout: Optional[float]):
+        if not self._pending:
+            return
+
+        done, _ = wait(list(self._pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, shared_frame, submitted_at = self._pending.pop(future)
+            shared_frame.release()
+
+            try:
+                result, worker_id, started_at, finished_at = future.result()
+            except Exception as e:
+                # the failed frame is skipped, otherwise the result order would wait for it forever
+                self.scheduler.fail(index, e)
+                if self.on_error is not None:
+                    self.on_error(index, e)
+                continue
+
+            self.scheduler.complete(index, result, worker_id, submitted_at, started_at, finished_at)
+
+    def _release(self) -> List[Tuple[int, Any]]:
+        released = self.scheduler.pop_ready()
+        for index, result in released:
+            if self.output is not None:
+                self._publish(result)
+            if self.on_result is not None:
+                self.on_result(index, result)
+        return released
+
+    def _publish(self, image: np.ndarray):
+        from syphon.utils.numpy import copy_image_to_mtl_texture
+        from syphon.utils.raw import create_mtl_texture
+
+        height, width = image.shape[:2]
+        if (self._output_texture is None
+                or (self._output_texture.width(), self._output_texture.height()) != (width, height)):
+            self._output_texture = create_mtl_texture(self.output.device, width, height,
+                                                      owner=f"server:{self.output.name}")
+
+        copy_image_to_mtl_texture(image, self._output_texture)
+        self.output.publish_frame_texture(self._output_texture)
+
+    def _start_workers(self, width: int, height: int):
+        # frames in flight still read from the current ring, their results are delivered before it is torn down
+        self._flushed.extend(self.flush())
+        self._shutdown_workers()
+
+        # every frame in flight pins a slot, plus the latest frame and the one being written
+        self._ring = SharedFrameRing(width, height, slot_count=self.scheduler.max_in_flight + 2)
+        self._executor = self._executor_factory(max_workers=self.workers,
+                                                initializer=_init_worker,
+                                                initargs=(self._ring, self.function))
+
+    def _shutdown_workers(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._ring is not None:
+            self._ring.close()
+            self._ring.unlink()
+            self._ring = None
+
+
+_CANCELLED = object()
+
+_worker_ring: Optional[SharedFrameRing] = None
+_worker_function: Optional[FrameFunction] = None
+
+
+def _init_worker(ring: SharedFrameRing, function: FrameFunction):
+    global _worker_ring, _worker_function
+    _worker_ring = ring
+    _worker_function = function
+
+
+def _process_frame(slot: int, submitted_at: float) -> Tuple[Any, int, float, float]:
+    started_at = time.monotonic()
+
+    image = _worker_ring.slot_image(slot)
+    image.flags.writeable = False
+    result = _worker_function(image)
+
+    return result, os.getpid(), started_at, time.monotonic()
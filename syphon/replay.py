@@ -0,0 +1,326 @@
+import mmap
+import time
+from pathlib import Path
+from typing import Optional, Any, Union
+
+import numpy as np
+
+from syphon.pacing import sleep_until
+from syphon.server import SyphonMetalServer
+from syphon.utils.numpy import copy_image_to_mtl_texture
+from syphon.utils.raw import create_mtl_texture
+
+FRAME_INDEX_DTYPE = np.dtype([("timestamp", "<f8"), ("offset", "<u8")])
+"""
+Record layout of a frame index file: the capture timestamp in seconds and the byte offset of the frame.
+"""
+
+
+class FrameRecorder:
+    """
+    Writes RGBA frames into a raw frame file and its index, in the format read by `SyphonMetalReplayServer`.
+
+    Attributes:
+    - frames_path (Path): The path of the raw frame file.
+    - index_path (Path): The path of the frame index file.
+    - frame_count (int): The number of frames written so far.
+    """
+
+    def __init__(self, frames_path: Union[str, Path], index_path: Union[str, Path]):
+        """
+        Initialize a FrameRecorder.
+
+        Parameters:
+        - frames_path (Union[str, Path]): The path of the raw frame file to create.
+        - index_path (Union[str, Path]): The path of the frame index file to create.
+        """
+        self.frames_path = Path(frames_path)
+        self.index_path = Path(index_path)
+        self.frame_count = 0
+
+        self._frames_file = open(self.frames_path, "wb")
+        self._index_file = open(self.index_path, "wb")
+        self._record = np.zeros(1, dtype=FRAME_INDEX_DTYPE)
+
+    def write(self, image: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Append a frame to the recording.
+
+        Parameters:
+        - image (np.ndarray): The frame as a NumPy array of shape (height, width, 4).
+        - timestamp (float, optional): The capture timestamp in seconds. Defaults to the current monotonic time.
+        """
+        assert len(image.shape) == 3, "Image has to be of shape (m, n, 4)"
+        assert image.shape[2] == 4, "Image has to be of shape (m, n, 4)"
+
+        self._record["timestamp"] = time.monotonic() if timestamp is None else timestamp
+        self._record["offset"] = self._frames_file.tell()
+
+        self._frames_file.write(memoryview(np.ascontiguousarray(image, dtype=np.uint8)))
+        self._index_file.write(memoryview(self._record))
+        self.frame_count += 1
+
+    def close(self):
+        """
+        Flush and close the recording files.
+        """
+        self._frames_file.close()
+        self._index_file.close()
+
+
+class SyphonMetalReplayServer(SyphonMetalServer):
+    """
+    Syphon Metal server that replays a recorded frame file on its original timestamps.
+
+    Frames and index are memory-mapped with `np.memmap` and uploaded straight from the mapped slices.
+    Frames are scheduled against absolute deadlines, so sleep jitter does not accumulate into drift.
+
+    Attributes:
+    - width (int): The width of the recorded frames.
+    - height (int): The height of the recorded frames.
+    - texture (Any): The Metal texture the frames are uploaded to.
+    - frames (np.memmap): The memory-mapped raw frame data.
+    - index (np.memmap): The memory-mapped frame index.
+    - loop (bool): If True, the replay restarts at the first frame after the last one.
+    - drop_late_frames (bool): If True, frames whose deadline has already passed are skipped.
+    - read_ahead (int): The number of upcoming frames that are prefetched from disk.
+    - position (int): The index of the next frame to publish.
+    """
+
+    def __init__(self,
+                 name: str,
+                 frames_path: Union[str, Path],
+                 index_path: Union[str, Path],
+                 width: int,
+                 height: int,
+                 speed: float = 1.0,
+                 loop: bool = True,
+                 drop_late_frames: bool = False,
+                 read_ahead: int = 4,
+                 device: Optional[Any] = None,
+                 command_queue: Optional[Any] = None):
+        """
+        Initialize a SyphonMetalReplayServer.
+
+        Parameters:
+        - name (str): The name of the Syphon server.
+        - frames_path (Union[str, Path]): The path of the raw RGBA frame file.
+        - index_path (Union[str, Path]): The path of the frame index file (records of `FRAME_INDEX_DTYPE`).
+        - width (int): The width of the recorded frames.
+        - height (int): The height of the recorded frames.
+        - speed (float, optional): The playback speed multiplier. Defaults to 1.0.
+        - loop (bool, optional): If True, the replay loops forever. Defaults to True.
+        - drop_late_frames (bool, optional): If True, late frames are skipped instead of published. Defaults to False.
+        - read_ahead (int, optional): The number of frames to prefetch. Defaults to 4.
+        - device (Any, optional): The Metal device. If None, the default system device will be used.
+        - command_queue (Any, optional): The Metal command queue. If None, a command queue of the shared pool
+          will be used (see `syphon.resources`).
+        """
+        super().__init__(name, device, command_queue)
+
+        self.width = width
+        self.height = height
+        self.loop = loop
+        self.drop_late_frames = drop_late_frames
+        self.read_ahead = read_ahead
+
+        self.index = np.memmap(index_path, dtype=FRAME_INDEX_DTYPE, mode="r")
+        self.frames = np.memmap(frames_path, dtype=np.uint8, mode="r")
+
+        if len(self.index) == 0:
+            raise ValueError(f"Frame index '{index_path}' does not contain any frames.")
+
+        self._frame_size = width * height * 4
+        self._timestamps = np.ascontiguousarray(self.index["timestamp"])
+        self._offsets = np.ascontiguousarray(self.index["offset"])
+
+        # a loop lasts one average frame interval longer than the recording
+        span = float(self._timestamps[-1] - self._timestamps[0])
+        frame_interval = span / (len(self._timestamps) - 1) if len(self._timestamps) > 1 else 0.0
+        self._loop_duration = span + frame_interval
+
+        self.texture = create_mtl_texture(self.device, width, height, owner=f"server:{name}")
+
+        self.position = 0
+        self._loop_count = 0
+        self._speed = speed
+        self._clock_origin: Optional[float] = None
+        self._running = False
+
+        self._advise(mmap.MADV_SEQUENTIAL if hasattr(mmap, "MADV_SEQUENTIAL") else None, 0, len(self.frames))
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Get the number of recorded frames.
+
+        Returns:
+        - int: The number of frames in the index.
+        """
+        return len(self._timestamps)
+
+    @property
+    def duration(self) -> float:
+        """
+        Get the duration of one pass through the recording in recording time.
+
+        Returns:
+        - float: The duration in seconds.
+        """
+        return self._loop_duration
+
+    @property
+    def speed(self) -> float:
+        """
+        Get the playback speed multiplier.
+
+        Returns:
+        - float: The speed multiplier.
+        """
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: float):
+        """
+        Set the playback speed multiplier without jumping in the recording.
+
+        Parameters:
+        - value (float): The new speed multiplier (must be positive).
+        """
+        if value <= 0:
+            raise ValueError("Speed has to be positive.")
+
+        # re-anchor the clock so the current recording time stays continuous
+        current = self._recording_time(self.position, self._loop_count)
+        self._speed = value
+        if self._clock_origin is not None:
+            self._clock_origin = time.perf_counter() - current / value
+
+    def frame_at(self, index: int) -> np.ndarray:
+        """
+        Get a recorded frame as a view into the memory-mapped frame file.
+
+        Parameters:
+        - index (int): The index of the frame.
+
+        Returns:
+        - np.ndarray: A read-only view of shape (height, width, 4).
+        """
+        offset = int(self._offsets[index])
+        return self.frames[offset:offset + self._frame_size].reshape((self.height, self.width, 4))
+
+    def seek(self, timestamp: float):
+        """
+        Move the replay to the first frame at or after a recording timestamp.
+
+        Parameters:
+        - timestamp (float): The timestamp relative to the start of the recording in seconds.
+        """
+        loop_count = 0
+        if self.loop and self._loop_duration > 0:
+            loop_count, timestamp = divmod(timestamp, self._loop_duration)
+
+        self._loop_count = int(loop_count)
+        self.position = self._index_at(self._timestamps[0] + timestamp)
+        if self.position >= self.frame_count and self.loop:
+            self._wrap()
+
+        # restart pacing from the new position
+        self._clock_origin = None
+        self._prefetch(self.position)
+
+    def publish_next(self) -> bool:
+        """
+        Wait for the deadline of the next frame, then upload and publish it.
+
+        Returns:
+        - bool: False if the end of the recording has been reached and looping is disabled, True otherwise.
+        """
+        if self.position >= self.frame_count:
+            return False
+
+        now = time.perf_counter()
+        if self._clock_origin is None:
+            self._clock_origin = now - self._recording_time(self.position, self._loop_count) / self._speed
+
+        if self.drop_late_frames:
+            self._skip_late_frames(now)
+            if self.position >= self.frame_count:
+                return False
+
+        sleep_until(self._clock_origin + self._recording_time(self.position, self._loop_count) / self._speed)
+
+        copy_image_to_mtl_texture(self.frame_at(self.position), self.texture)
+        self.publish_frame_texture(self.texture)
+
+        self.position += 1
+        if self.position >= self.frame_count:
+            if not self.loop:
+                return False
+            self._wrap()
+
+        self._prefetch(self.position)
+        return True
+
+    def run(self):
+        """
+        Publish frames until the recording ends or `stop()` is called.
+        """
+        self._running = True
+        while self._running and self.publish_next():
+            pass
+        self._running = False
+
+    def stop(self):
+        """
+        Stop the replay and the SyphonMetalServer.
+        """
+        self._running = False
+        super().stop()
+
+    def _recording_time(self, index: int, loop_count: int) -> float:
+        return float(self._timestamps[index] - self._timestamps[0]) + loop_count * self._loop_duration
+
+    def _index_at(self, timestamp: float) -> int:
+        return int(np.searchsorted(self._timestamps, timestamp, side="left"))
+
+    def _wrap(self):
+        self.position = 0
+        self._loop_count += 1
+
+    def _skip_late_frames(self, now: float):
+        elapsed = (now - self._clock_origin) * self._speed
+        loop_count = self._loop_count
+
+        if self.loop and self._loop_duration > 0:
+            loop_count, elapsed = divmod(elapsed, self._loop_duration)
+            loop_count = int(loop_count)
+
+        # latest frame whose deadline has already passed
+        position = int(np.searchsorted(self._timestamps, self._timestamps[0] + elapsed, side="right")) - 1
+        if (loop_count, position) > (self._loop_count, self.position):
+            self._loop_count, self.position = loop_count, max(position, 0)
+
+    def _prefetch(self, index: int):
+        if self.read_ahead <= 0 or not hasattr(mmap, "MADV_WILLNEED"):
+            return
+
+        end_index = min(index + self.read_ahead, self.frame_count)
+        if end_index <= index:
+            return
+
+        start = int(self._offsets[index:end_index].min())
+        end = int(self._offsets[index:end_index].max()) + self._frame_size
+        self._advise(mmap.MADV_WILLNEED, start, end - start)
+
+    def _advise(self, option: Optional[int], start: int, length: int):
+        memory_map = getattr(self.frames, "_mmap", None)
+        if option is None or memory_map is None or not hasattr(memory_map, "madvise"):
+            return
+
+        # madvise requires a page aligned start address
+        aligned_start = start - start % mmap.PAGESIZE
+        length = min(length + start - aligned_start, len(memory_map) - aligned_start)
+        if length > 0:
+            memory_map.madvise(option, aligned_start, length)
+
@@ -0,0 +1,139 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+import Metal
+import objc
+
+
+class ResourceRegistry:
+    """
+    Process-wide cache of the Metal and Objective-C resources used to construct servers and clients.
+
+    Creating the system default device, a command queue or looking up an Objective-C class is cheap once,
+    but adds up if many servers and clients are created and destroyed as feeds come and go. The registry
+    hands out one shared default device, a bounded pool of command queues per device (assigned round-robin)
+    and cached class handles.
+
+    Servers sharing a command queue are executed in the order their command buffers were enqueued, so a server
+    may briefly wait for another server's frame to be committed. Callers that need their own command queue can opt
+    out per instance (`share_resources=False`) or globally by disabling the registry. The device is not isolated by
+    opting out, since Metal returns the same system default device to every caller.
+
+    Attributes:
+    - enabled (bool): If False, every caller gets a new command queue.
+    - max_command_queues (int): The maximum number of command queues per device.
+    """
+
+    def __init__(self, max_command_queues: int = 4):
+        """
+        Initialize a ResourceRegistry.
+
+        Parameters:
+        - max_command_queues (int, optional): The maximum number of command queues per device. Defaults to 4.
+        """
+        self.enabled = True
+        self.max_command_queues = max_command_queues
+
+        self._lock = threading.Lock()
+        self._device: Optional[Any] = None
+        self._queues: Dict[int, List[Any]] = {}
+        self._next_queue: Dict[int, int] = {}
+        self._classes: Dict[str, Any] = {}
+
+    def default_device(self, shared: bool = True) -> Any:
+        """
+        Get the system default Metal device.
+
+        Parameters:
+        - shared (bool, optional): If False, the device is requested from Metal instead of the cache. Metal returns
+          the same system default device either way. Defaults to True.
+
+        Returns:
+        - Any: The Metal device.
+        """
+        if not (shared and self.enabled):
+            return Metal.MTLCreateSystemDefaultDevice()
+
+        with self._lock:
+            if self._device is None:
+                self._device = Metal.MTLCreateSystemDefaultDevice()
+            return self._device
+
+    def command_queue(self, device: Any, shared: bool = True) -> Any:
+        """
+        Get a command queue of the device. Up to `max_command_queues` queues are created per device,
+        after that the existing ones are handed out round-robin.
+
+        Parameters:
+        - device (Any): The Metal device.
+        - shared (bool, optional): If False, a new command queue is created. Defaults to True.
+
+        Returns:
+        - Any: The Metal command queue.
+        """
+        if not (shared and self.enabled):
+            return device.newCommandQueue()
+
+        key = int(device.registryID())
+
+        with self._lock:
+            queues = self._queues.setdefault(key, [])
+
+            if len(queues) < self.max_command_queues:
+                queue = device.newCommandQueue()
+                queues.append(queue)
+                return queue
+
+            index = self._next_queue.get(key, 0)
+            self._next_queue[key] = (index + 1) % len(queues)
+            return queues[index]
+
+    def lookup_class(self, name: str) -> Any:
+        """
+        Look up an Objective-C class, caching the handle.
+
+        Parameters:
+        - name (str): The name of the class.
+
+        Returns:
+        - Any: The class.
+        """
+        with self._lock:
+            cls = self._classes.get(name)
+            if cls is None:
+                cls = objc.lookUpClass(name)
+                self._classes[name] = cls
+            return cls
+
+    def clear(self):
+        """
+        Drop the cached device and command queues. Instances that already use them keep their references.
+        """
+        with self._lock:
+            self._device = None
+            self._queues.clear()
+            self._next_queue.clear()
+
+
+_registry = ResourceRegistry()
+
+
+def get_resource_registry() -> ResourceRegistry:
+    """
+    Get the process-wide resource registry.
+
+    Returns:
+    - ResourceRegistry: The resource registry.
+    """
+    return _registry
+
+
+def set_resource_sharing(enabled: bool):
+    """
+    Enable or disable sharing devices and command queues between servers and clients.
+
+    Parameters:
+    - enabled (bool): If False, every server creates its own command queue. The device is the system default
+      device either way.
+    """
+    _registry.enabled = enabled
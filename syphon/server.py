@@ -1,112 +1,127 @@
-from abc import ABC, abstractmethod
+import threading
 from typing import Tuple, Optional, Any
 
 import Cocoa
-import Metal
-import objc
 from OpenGL.GL import *
 
+from syphon.base import BaseSyphonServer, PreparedFrame
+from syphon.resources import get_resource_registry
 from syphon.types import Texture, Region, Size
-from syphon.utils import opengl
+from syphon.utils import opengl, tracing
 
 
-class BaseSyphonServer(ABC):
+class PreparedMetalFrame(PreparedFrame):
     """
-    Abstract base class for Syphon servers.
+    Prepared publish handle of a `SyphonMetalServer`.
 
     Attributes:
-    - name (str): The name of the Syphon server.
+    - texture (Texture): The Metal texture to publish.
+    - region (Region): The region of the texture to publish.
+    - is_flipped (bool): If True, the frame is flipped.
     """
+    __slots__ = ("texture", "region", "is_flipped", "_ns_region", "_publish_texture", "_new_command_buffer",
+                 "_publish_lock")
 
-    def __init__(self, name: str):
+    def __init__(self, server: "SyphonMetalServer", texture: Texture, region: Region, is_flipped: bool):
         """
-        Initialize a BaseSyphonServer.
+        Initialize a PreparedMetalFrame.
 
         Parameters:
-        - name (str): The name of the Syphon server.
+        - server (SyphonMetalServer): The server to publish to.
+        - texture (Texture): The Metal texture to publish.
+        - region (Region): The region of the texture to publish.
+        - is_flipped (bool): If True, the frame is flipped.
         """
-        self.name = name
+        self.texture = texture
+        self.region = region
+        self.is_flipped = is_flipped
 
-    @abstractmethod
-    def publish_frame_texture(self,
-                              texture: Texture,
-                              region: Optional[Region] = None,
-                              size: Optional[Size] = None,
-                              is_flipped: bool = False):
+        self._ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
+        self._publish_texture = server.context.publishFrameTexture_onCommandBuffer_imageRegion_flipped_
+        self._new_command_buffer = server.command_queue.commandBuffer
+        self._publish_lock = server._publish_lock
+
+    def publish(self, command_buffer: Optional[Any] = None, auto_commit: bool = True):
         """
-        Publish a frame with the given texture.
+        Publish the prepared texture.
 
         Parameters:
-        - texture (Texture): The texture to publish.
-        - region (Region, optional): The region of the texture to publish. Defaults to None.
-        - size (Size, optional): The size of the texture. Defaults to None.
-        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        - command_buffer (Any, optional): The Metal command buffer. If None, a new command buffer will be created.
+        - auto_commit (bool, optional): If True, the command buffer is committed automatically. Defaults to True.
         """
-        pass
+        if command_buffer is None:
+            command_buffer = self._new_command_buffer()
+            with self._publish_lock:
+                command_buffer.enqueue()
+                self._publish_texture(self.texture, command_buffer, self._ns_region, self.is_flipped)
+        else:
+            with self._publish_lock:
+                self._publish_texture(self.texture, command_buffer, self._ns_region, self.is_flipped)
 
-    @abstractmethod
-    def publish(self):
-        """
-        Publish the frame.
-        """
-        pass
+        if auto_commit:
+            command_buffer.commitAndWaitUntilSubmitted()
 
-    @abstractmethod
-    def stop(self):
-        """
-        Stop the Syphon server.
-        """
-        pass
 
-    @property
-    @abstractmethod
-    def has_clients(self) -> bool:
-        """
-        Check if the Syphon server has clients.
+class PreparedOpenGLFrame(PreparedFrame):
+    """
+    Prepared publish handle of a `SyphonOpenGLServer`.
 
-        Returns:
-        - bool: True if there are clients, False otherwise.
-        """
-        pass
+    Attributes:
+    - texture (GLint): The OpenGL texture to publish.
+    - target (GLenum): The OpenGL texture target.
+    - region (Region): The region of the texture to publish.
+    - size (Size): The size of the texture.
+    - is_flipped (bool): If True, the frame is flipped.
+    """
+    __slots__ = ("texture", "target", "region", "size", "is_flipped", "_ns_region", "_ns_size", "_publish_texture")
 
-    @abstractmethod
-    def _get_texture_size(self, texture: Texture) -> Size:
+    def __init__(self,
+                 server: "SyphonOpenGLServer",
+                 texture: GLint,
+                 target: GLenum,
+                 region: Region,
+                 size: Size,
+                 is_flipped: bool):
         """
-        Get the size of the texture.
+        Initialize a PreparedOpenGLFrame.
 
         Parameters:
-        - texture (Texture): The texture.
+        - server (SyphonOpenGLServer): The server to publish to.
+        - texture (GLint): The OpenGL texture to publish.
+        - target (GLenum): The OpenGL texture target.
+        - region (Region): The region of the texture to publish.
+        - size (Size): The size of the texture.
+        - is_flipped (bool): If True, the frame is flipped.
+        """
+        self.texture = texture
+        self.target = target
+        self.region = region
+        self.size = size
+        self.is_flipped = is_flipped
+
+        self._ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
+        self._ns_size = Cocoa.NSSize(size[0], size[1])
+        self._publish_texture = \
+            server.context.publishFrameTexture_textureTarget_imageRegion_textureDimensions_flipped_
 
-        Returns:
-        - Size: The size of the texture.
+    def publish(self):
         """
-        pass
-
-    def _prepare_region_and_size(self,
-                                 texture: Texture,
-                                 region: Optional[Region] = None,
-                                 size: Optional[Size] = None) -> Tuple[Region, Size]:
+        Publish the prepared texture.
         """
-        Prepare the region and size for publishing.
-
-        Parameters:
-        - texture (Texture): The texture to publish.
-        - region (Region, optional): The region of the texture to publish. Defaults to None.
-        - size (Size, optional): The size of the texture. Defaults to None.
-
-        Returns:
-        - Tuple[Region, Size]: The prepared region and size.
-        """
-        size = self._get_texture_size(texture) if size is None else size
-        if region is None:
-            region = (0, 0, *size)
-        return region, size
+        self._publish_texture(self.texture, self.target, self._ns_region, self._ns_size, self.is_flipped)
 
 
 class SyphonMetalServer(BaseSyphonServer):
     """
     Syphon server for Metal-based rendering.
 
+    A server can be published to from multiple threads. Every call encodes into its own command buffer, which is
+    enqueued on the command queue while the frame is encoded, so the frames of a server are executed in
+    the order they were encoded and none is lost. Only the encoding is serialized per server, committing and
+    waiting for the submission happen outside the lock. Different servers only wait for each other while their
+    frames are submitted, if they share a command queue (see `syphon.resources`).
+    A pacer set with `set_target_fps()` is not thread-safe and should only be used from one thread.
+
     Attributes:
     - name (str): The name of the Syphon server.
     - device (Any): The Metal device.
@@ -117,30 +132,39 @@ class SyphonMetalServer(BaseSyphonServer):
     def __init__(self,
                  name: str,
                  device: Optional[Any] = None,
-                 command_queue: Optional[Any] = None):
+                 command_queue: Optional[Any] = None,
+                 share_resources: bool = True):
         """
         Initialize a SyphonMetalServer.
 
         Parameters:
         - name (str): The name of the Syphon server.
         - device (Any, optional): The Metal device. If None, the default system device will be used.
-        - command_queue (Any, optional): The Metal command queue. If None, a new command queue will be created.
+        - command_queue (Any, optional): The Metal command queue. If None, a command queue of the shared pool
+          will be used (see `syphon.resources`).
+        - share_resources (bool, optional): If False, a new command queue is created instead of using one of the
+          shared pool. The device is the system default device either way. Defaults to True.
         """
         super().__init__(name)
 
         self.device = device
         self.command_queue = command_queue
 
+        resources = get_resource_registry()
+
         # setup device
         if self.device is None:
-            self.device = Metal.MTLCreateSystemDefaultDevice()
+            self.device = resources.default_device(share_resources)
 
         # setup command queue
         if self.command_queue is None:
-            self.command_queue = self.device.newCommandQueue()
+            self.command_queue = resources.command_queue(self.device, share_resources)
+
+        # serializes the encoding of frames published from multiple threads
+        self._publish_lock = threading.Lock()
 
         # setup syphon-metal context
-        SyphonMetalServerObjC = objc.lookUpClass("SyphonMetalServer")
+        SyphonMetalServerObjC = resources.lookup_class("SyphonMetalServer")
         self.context = SyphonMetalServerObjC.alloc().initWithName_device_options_(name, self.device, None)
 
     def publish_frame_texture(self,
@@ -161,22 +185,48 @@ class SyphonMetalServer(BaseSyphonServer):
         - command_buffer (Any, optional): The Metal command buffer. If None, a new command buffer will be created.
         - auto_commit (bool, optional): If True, the command buffer is committed automatically. Defaults to True.
         """
-        # create ns-region
-        region, _ = self._prepare_region_and_size(texture, region, size)
-        ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
+        with tracing.span("publish_frame_texture", "server", server=self.name):
+            # create ns-region
+            region, _ = self._prepare_region_and_size(texture, region, size)
+            ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
+
+            # prepare command buffer if necessary (per call, so every thread encodes into its own buffer)
+            enqueue = command_buffer is None
+            if enqueue:
+                command_buffer = self.command_queue.commandBuffer()
+
+            # publish actual texture, enqueueing reserves the execution order of the frames of this server
+            with tracing.span("encode", "server", server=self.name), self._publish_lock:
+                if enqueue:
+                    command_buffer.enqueue()
+                self.context.publishFrameTexture_onCommandBuffer_imageRegion_flipped_(texture,
+                                                                                      command_buffer,
+                                                                                      ns_region,
+                                                                                      is_flipped)
+            # commit command buffer
+            if auto_commit:
+                with tracing.span("commit", "server", server=self.name):
+                    command_buffer.commitAndWaitUntilSubmitted()
+
+    def prepare(self,
+                texture: Texture,
+                region: Optional[Region] = None,
+                size: Optional[Size] = None,
+                is_flipped: bool = False) -> PreparedMetalFrame:
+        """
+        Prepare a handle to repeatedly publish the given Metal texture with minimal overhead.
 
-        # prepare command buffer if necessary
-        if command_buffer is None:
-            command_buffer = self.command_queue.commandBuffer()
-
-        # publish actual texture
-        self.context.publishFrameTexture_onCommandBuffer_imageRegion_flipped_(texture,
-                                                                              command_buffer,
-                                                                              ns_region,
-                                                                              is_flipped)
-        # commit command buffer
-        if auto_commit:
-            command_buffer.commitAndWaitUntilSubmitted()
+        Parameters:
+        - texture (Texture): The Metal texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+
+        Returns:
+        - PreparedMetalFrame: The handle to publish the texture.
+        """
+        region, _ = self._prepare_region_and_size(texture, region, size)
+        return PreparedMetalFrame(self, texture, region, is_flipped)
 
     def publish(self):
         """
@@ -184,6 +234,16 @@ class SyphonMetalServer(BaseSyphonServer):
         """
         self.context.publish()
 
+    def rename(self, name: str):
+        """
+        Change the name the server is announced with. Clients are notified with an update in the directory.
+
+        Parameters:
+        - name (str): The new name of the server.
+        """
+        self.context.setName_(name)
+        super().rename(name)
+
     def stop(self):
         """
         Stop the SyphonMetalServer.
@@ -217,6 +277,9 @@ class SyphonOpenGLServer(BaseSyphonServer):
     """
     Syphon server for OpenGL-based rendering.
 
+    OpenGL contexts are bound to threads, so the server has to be published to from the thread
+    its CGL context is current on.
+
     Attributes:
     - name (str): The name of the Syphon server.
     - cgl_context_obj (Any): The CGL context object.
@@ -237,7 +300,7 @@ class SyphonOpenGLServer(BaseSyphonServer):
         self.cgl_context_obj = opengl.get_current_cgl_context_obj() if cgl_context_obj is None else cgl_context_obj
 
         # create syphon gl server
-        SyphonOpenGLServerObjC = objc.lookUpClass("SyphonOpenGLServer")
+        SyphonOpenGLServerObjC = get_resource_registry().lookup_class("SyphonOpenGLServer")
         self.context = SyphonOpenGLServerObjC.alloc().initWithName_context_options_(name, self.cgl_context_obj, None)
 
     def publish_frame_texture(self,
@@ -256,14 +319,38 @@ class SyphonOpenGLServer(BaseSyphonServer):
         - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
         - target (GLenum, optional): The OpenGL texture target. Defaults to GL_TEXTURE_2D.
         """
-        # create ns-region
-        region, size = self._prepare_region_and_size(texture, region, size)
-        ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
-        ns_size = Cocoa.NSSize(size[0], size[1])
+        with tracing.span("publish_frame_texture", "server", server=self.name):
+            # create ns-region
+            region, size = self._prepare_region_and_size(texture, region, size)
+            ns_region = Cocoa.NSRect((region[0], region[1]), (region[2], region[3]))
+            ns_size = Cocoa.NSSize(size[0], size[1])
 
-        self.context.publishFrameTexture_textureTarget_imageRegion_textureDimensions_flipped_(texture, target,
-                                                                                              ns_region,
-                                                                                              ns_size, is_flipped)
+            self.context.publishFrameTexture_textureTarget_imageRegion_textureDimensions_flipped_(texture, target,
+                                                                                                  ns_region,
+                                                                                                  ns_size,
+                                                                                                  is_flipped)
+
+    def prepare(self,
+                texture: GLint,
+                region: Optional[Region] = None,
+                size: Optional[Size] = None,
+                is_flipped: bool = False,
+                target: GLenum = GL_TEXTURE_2D) -> PreparedOpenGLFrame:
+        """
+        Prepare a handle to repeatedly publish the given OpenGL texture with minimal overhead.
+
+        Parameters:
+        - texture (GLint): The OpenGL texture to publish.
+        - region (Region, optional): The region of the texture to publish. Defaults to None.
+        - size (Size, optional): The size of the texture. Defaults to None.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        - target (GLenum, optional): The OpenGL texture target. Defaults to GL_TEXTURE_2D.
+
+        Returns:
+        - PreparedOpenGLFrame: The handle to publish the texture.
+        """
+        region, size = self._prepare_region_and_size(texture, region, size)
+        return PreparedOpenGLFrame(self, texture, target, region, size, is_flipped)
 
     def publish(self):
         """
@@ -271,6 +358,16 @@ class SyphonOpenGLServer(BaseSyphonServer):
         """
         self.context.publish()
 
+    def rename(self, name: str):
+        """
+        Change the name the server is announced with. Clients are notified with an update in the directory.
+
+        Parameters:
+        - name (str): The new name of the server.
+        """
+        self.context.setName_(name)
+        super().rename(name)
+
     def stop(self):
         """
         Stop the SyphonOpenGLServer.
@@ -0,0 +1,138 @@
+import threading
+from dataclasses import FrozenInstanceError
+from typing import Any, Dict, Iterable
+
+_UUID_KEY = "SyphonServerDescriptionUUIDKey"
+_NAME_KEY = "SyphonServerDescriptionNameKey"
+_APP_NAME_KEY = "SyphonServerDescriptionAppNameKey"
+_ICON_KEY = "SyphonServerDescriptionIconKey"
+
+_UNSET: Any = object()
+
+
+class SyphonServerDescription:
+    """
+    Immutable description of a Syphon server.
+
+    Descriptions are hashable and compare equal by uuid. The application name and the icon are read from the raw
+    server information on first access. Descriptions created with `from_raw()` are interned per uuid, so repeated
+    directory reads return the same instances as long as the server information did not change. Interned
+    descriptions are kept until the server disappears from a directory snapshot or retires (see `prune_interned()`
+    and `forget_interned()`).
+
+    Attributes:
+    - uuid (str): The UUID of the Syphon server.
+    - name (str): The name of the Syphon server.
+    - app_name (str): The name of the application associated with the Syphon server.
+    - icon (NSImage): The icon image of the Syphon server.
+    - raw (Any): The raw server information.
+    """
+    __slots__ = ("uuid", "name", "raw", "_app_name", "_icon", "__weakref__")
+
+    _interned: Dict[str, "SyphonServerDescription"] = {}
+    _interned_lock = threading.Lock()
+
+    def __init__(self, uuid: str, name: str, app_name: str = _UNSET, icon: Any = _UNSET, raw: Any = None):
+        """
+        Initialize a SyphonServerDescription.
+
+        Parameters:
+        - uuid (str): The UUID of the Syphon server.
+        - name (str): The name of the Syphon server.
+        - app_name (str, optional): The application name. If not set, it is read from `raw` on first access.
+        - icon (NSImage, optional): The icon image. If not set, it is read from `raw` on first access.
+        - raw (Any, optional): The raw server information. Defaults to None.
+        """
+        object.__setattr__(self, "uuid", uuid)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "raw", raw)
+        object.__setattr__(self, "_app_name", app_name)
+        object.__setattr__(self, "_icon", icon)
+
+    @classmethod
+    def from_raw(cls, raw: Any) -> "SyphonServerDescription":
+        """
+        Get the SyphonServerDescription of a raw Syphon server description dictionary.
+
+        Parameters:
+        - raw (Any): The raw server information, e.g. from the directory or a notification's `userInfo()`.
+
+        Returns:
+        - SyphonServerDescription: The interned server description.
+        """
+        uuid = str(raw[_UUID_KEY])
+
+        with cls._interned_lock:
+            description = cls._interned.get(uuid)
+            if description is not None and (description.raw is raw or description.raw == raw):
+                return description
+
+            description = cls(uuid, str(raw[_NAME_KEY]), raw=raw)
+            cls._interned[uuid] = description
+            return description
+
+    @classmethod
+    def forget_interned(cls, uuid: str):
+        """
+        Drop the interned description of a server, e.g. when it retires.
+
+        Parameters:
+        - uuid (str): The uuid of the server.
+        """
+        with cls._interned_lock:
+            cls._interned.pop(uuid, None)
+
+    @classmethod
+    def prune_interned(cls, uuids: Iterable[str]):
+        """
+        Drop the interned descriptions of all servers that are not in the given snapshot.
+
+        Parameters:
+        - uuids (Iterable[str]): The uuids of the available servers.
+        """
+        available = set(uuids)
+
+        with cls._interned_lock:
+            for uuid in [uuid for uuid in cls._interned if uuid not in available]:
+                del cls._interned[uuid]
+
+    @property
+    def app_name(self) -> str:
+        """
+        Get the name of the application associated with the Syphon server.
+
+        Returns:
+        - str: The application name.
+        """
+        if self._app_name is _UNSET:
+            object.__setattr__(self, "_app_name", str(self.raw[_APP_NAME_KEY]))
+        return self._app_name
+
+    @property
+    def icon(self) -> Any:
+        """
+        Get the icon image of the Syphon server.
+
+        Returns:
+        - NSImage: The icon image.
+        """
+        if self._icon is _UNSET:
+            object.__setattr__(self, "_icon", self.raw[_ICON_KEY])
+        return self._icon
+
+    def __setattr__(self, key: str, value: Any):
+        raise FrozenInstanceError(f"cannot assign to field '{key}'")
+
+    def __delattr__(self, key: str):
+        raise FrozenInstanceError(f"cannot delete field '{key}'")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, SyphonServerDescription):
+            return NotImplemented
+        return self.uuid == other.uuid
+
+    def __hash__(self) -> int:
+        return hash(self.uuid)
+
+    def __repr__(self) -> str:
+        return f"SyphonServerDescription(uuid={self.uuid!r}, name={self.name!r})"
@@ -1,9 +1,11 @@
-from dataclasses import dataclass
 from enum import Enum
 from typing import Callable, Any, List, Optional
 
-import objc
-from Cocoa import NSRunLoop, NSDefaultRunLoopMode, NSDate, NSImage
+from Cocoa import NSRunLoop, NSDefaultRunLoopMode, NSDate
+
+from syphon.resources import get_resource_registry
+from syphon.server_description import SyphonServerDescription
+from syphon.utils import tracing
 
 
 class SyphonServerNotification(Enum):
@@ -20,25 +22,6 @@ class SyphonServerNotification(Enum):
     Retire = "SyphonServerRetireNotification"
 
 
-@dataclass
-class SyphonServerDescription:
-    """
-    Data class representing the description of a Syphon server.
-
-    Attributes:
-    - uuid (str): The UUID of the Syphon server.
-    - name (str): The name of the Syphon server.
-    - app_name (str): The name of the application associated with the Syphon server.
-    - icon (NSImage): The icon image of the Syphon server.
-    - raw (Any): The raw server information.
-    """
-    uuid: str
-    name: str
-    app_name: str
-    icon: NSImage
-    raw: Any
-
-
 class SyphonServerDirectory:
     """
     Class for interacting with the Syphon server directory.
@@ -51,26 +34,39 @@ class SyphonServerDirectory:
         """
         Initialize a SyphonServerDirectory.
         """
-        self._syphonServerDirectoryObjC = objc.lookUpClass("SyphonServerDirectory")
-        self._notification_center = objc.lookUpClass("NSNotificationCenter").defaultCenter()
+        resources = get_resource_registry()
+        self._syphonServerDirectoryObjC = resources.lookup_class("SyphonServerDirectory")
+        self._notification_center = resources.lookup_class("NSNotificationCenter").defaultCenter()
 
         self.run_loop_interval: float = 1.0
 
-    def add_observer(self, notification: SyphonServerNotification, handler: Callable[[Any], None]):
+    def add_observer(self, notification: SyphonServerNotification, handler: Callable[[Any], None]) -> Any:
         """
         Add an observer for a Syphon server notification.
 
         Parameters:
         - notification (SyphonServerNotification): The notification to observe.
         - handler (Callable[[Any], None]): The handler function to be called when the notification is received.
+
+        Returns:
+        - Any: The observer token, which can be passed to `remove_observer()`.
         """
-        self._notification_center.addObserverForName_object_queue_usingBlock_(
+        return self._notification_center.addObserverForName_object_queue_usingBlock_(
             notification.value,
             None,
             None,
             handler
         )
 
+    def remove_observer(self, token: Any):
+        """
+        Remove an observer added with `add_observer()`.
+
+        Parameters:
+        - token (Any): The observer token returned by `add_observer()`.
+        """
+        self._notification_center.removeObserver_(token)
+
     @property
     def servers(self) -> List[SyphonServerDescription]:
         """
@@ -80,28 +76,36 @@ class SyphonServerDirectory:
         - List[SyphonServerDescription]: A list of SyphonServerDescription objects.
         """
         self.update_run_loop()
+        return self.current_servers()
+
+    def current_servers(self) -> List[SyphonServerDescription]:
+        """
+        Get a list of Syphon servers in the directory without updating the run loop first.
+
+        Returns:
+        - List[SyphonServerDescription]: A list of SyphonServerDescription objects.
+        """
         directory = self._syphonServerDirectoryObjC.sharedDirectory()
         servers = directory.servers()
 
-        return [
-            SyphonServerDescription(
-                str(s["SyphonServerDescriptionUUIDKey"]),
-                str(s["SyphonServerDescriptionNameKey"]),
-                str(s["SyphonServerDescriptionAppNameKey"]),
-                s["SyphonServerDescriptionIconKey"],
-                s
-            )
-            for s in servers
-        ]
+        descriptions = [SyphonServerDescription.from_raw(s) for s in servers]
+
+        # the snapshot contains every server, so interned descriptions of missing servers can be dropped
+        SyphonServerDescription.prune_interned(d.uuid for d in descriptions)
+        return descriptions
 
-    def update_run_loop(self):
+    def update_run_loop(self, interval: Optional[float] = None):
         """
         Update the run loop to process events.
+
+        Parameters:
+        - interval (float, optional): The maximum time to run the loop in seconds. Defaults to `run_loop_interval`.
         """
-        NSRunLoop.currentRunLoop().runMode_beforeDate_(
-            NSDefaultRunLoopMode,
-            NSDate.dateWithTimeIntervalSinceNow_(self.run_loop_interval)
-        )
+        with tracing.span("update_run_loop", "directory"):
+            NSRunLoop.currentRunLoop().runMode_beforeDate_(
+                NSDefaultRunLoopMode,
+                NSDate.dateWithTimeIntervalSinceNow_(self.run_loop_interval if interval is None else interval)
+            )
 
     def servers_matching_name(self,
                               name: Optional[str] = None,
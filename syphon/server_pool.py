@@ -0,0 +1,253 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Deque, Optional, Tuple
+
+from syphon.base import BaseSyphonServer
+
+ServerFactory = Callable[[str], BaseSyphonServer]
+
+# back-off of the refill thread after the factory failed
+_MIN_RETRY_INTERVAL = 0.1
+_MAX_RETRY_INTERVAL = 5.0
+
+
+@dataclass
+class ServerPoolStats:
+    """
+    Statistics of a server pool.
+
+    Attributes:
+    - hits (int): The number of servers handed out from the pool.
+    - misses (int): The number of servers created on demand because the pool was empty.
+    - created (int): The number of servers created in the background.
+    - recycled (int): The number of released servers that have been stopped and replaced.
+    - reused (int): The number of released servers that have been returned to the pool.
+    - absorbed_time (float): The creation time in seconds of the servers handed out from the pool, which has been
+      taken off the critical path.
+    - miss_time (float): The creation time in seconds spent on demand.
+    - errors (int): The number of servers the background thread failed to create.
+    - last_error (Optional[BaseException]): The most recent error of the background thread.
+    """
+    hits: int = 0
+    misses: int = 0
+    created: int = 0
+    recycled: int = 0
+    reused: int = 0
+    absorbed_time: float = 0.0
+    miss_time: float = 0.0
+    errors: int = 0
+    last_error: Optional[BaseException] = field(default=None, repr=False)
+
+
+class ServerPool:
+    """
+    Keeps pre-initialized servers ready, so outputs can be created without delay.
+
+    The servers are created by a background thread under a standby name and renamed when they are acquired.
+    Released servers are either stopped and replaced in the background (the default, so connected clients are
+    disconnected) or renamed back to the standby name and reused. Acquiring a server never waits for the
+    creation of a new one, unless the pool is empty.
+
+    If the background thread fails to create a server, the error is counted in the statistics and the creation is
+    retried with an increasing back-off.
+
+    Note that the standby servers are announced in the directory like any other server.
+
+    Attributes:
+    - size (int): The number of servers kept ready.
+    - standby_name (str): The name of the servers waiting in the pool.
+    - recycle (bool): If True, released servers are stopped and replaced, otherwise they are reused.
+    """
+
+    def __init__(self,
+                 size: int = 4,
+                 factory: Optional[ServerFactory] = None,
+                 standby_name: str = "Standby",
+                 recycle: bool = True,
+                 start: bool = True):
+        """
+        Initialize a ServerPool.
+
+        Parameters:
+        - size (int, optional): The number of servers kept ready. Defaults to 4.
+        - factory (Callable[[str], BaseSyphonServer], optional): Creates a server with the given name.
+          Defaults to `SyphonMetalServer`. OpenGL servers are bound to the context of the creating thread and
+          should not be pooled.
+        - standby_name (str, optional): The name of the servers waiting in the pool. Defaults to `Standby`.
+        - recycle (bool, optional): If True, released servers are stopped and replaced, otherwise they are
+          reused. Defaults to True.
+        - start (bool, optional): If True, the pool is filled in the background right away. Defaults to True.
+        """
+        if factory is None:
+            from syphon.server import SyphonMetalServer
+            factory = SyphonMetalServer
+
+        self.size = size
+        self.standby_name = standby_name
+        self.recycle = recycle
+
+        self._factory = factory
+        self._ready: Deque[Tuple[BaseSyphonServer, float]] = deque()
+        self._stats = ServerPoolStats()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        if start:
+            self.start()
+
+    @property
+    def available(self) -> int:
+        """
+        Get the number of servers ready to be acquired.
+
+        Returns:
+        - int: The number of ready servers.
+        """
+        with self._condition:
+            return len(self._ready)
+
+    @property
+    def stats(self) -> ServerPoolStats:
+        """
+        Get the statistics of the pool.
+
+        Returns:
+        - ServerPoolStats: A snapshot of the statistics.
+        """
+        with self._condition:
+            return replace(self._stats)
+
+    def start(self):
+        """
+        Start filling the pool in the background.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._refill_loop, name="ServerPool", daemon=True)
+        self._thread.start()
+
+    def acquire(self, name: str) -> BaseSyphonServer:
+        """
+        Get a server with the given name, taking a ready one from the pool if possible.
+
+        Parameters:
+        - name (str): The name of the server.
+
+        Returns:
+        - BaseSyphonServer: The server.
+        """
+        with self._condition:
+            entry = self._ready.popleft() if self._ready else None
+
+            if entry is not None:
+                self._stats.hits += 1
+                self._stats.absorbed_time += entry[1]
+            else:
+                self._stats.misses += 1
+
+            self._condition.notify_all()
+
+        if entry is not None:
+            server = entry[0]
+            server.rename(name)
+            return server
+
+        start = time.perf_counter()
+        server = self._factory(name)
+
+        with self._condition:
+            self._stats.miss_time += time.perf_counter() - start
+
+        return server
+
+    def release(self, server: BaseSyphonServer):
+        """
+        Hand a server back to the pool. It must not be used afterwards.
+
+        Parameters:
+        - server (BaseSyphonServer): The server acquired from this pool.
+        """
+        with self._condition:
+            reuse = not self.recycle and self._running and len(self._ready) < self.size
+
+        # servers with connected clients are never reused, they would keep showing the last frame
+        if reuse and not server.has_clients:
+            server.rename(self.standby_name)
+            server.set_target_fps(None)
+
+            with self._condition:
+                self._ready.append((server, 0.0))
+                self._stats.reused += 1
+            return
+
+        server.stop()
+
+        with self._condition:
+            self._stats.recycled += 1
+            self._condition.notify_all()
+
+    def close(self):
+        """
+        Stop the background thread and all servers waiting in the pool.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._condition:
+            servers = [server for server, _ in self._ready]
+            self._ready.clear()
+
+        for server in servers:
+            server.stop()
+
+    def __enter__(self) -> "ServerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _refill_loop(self):
+        retry_interval = _MIN_RETRY_INTERVAL
+
+        while True:
+            with self._condition:
+                while self._running and len(self._ready) >= self.size:
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+            start = time.perf_counter()
+            try:
+                server = self._factory(self.standby_name)
+            except Exception as e:
+                with self._condition:
+                    self._stats.errors += 1
+                    self._stats.last_error = e
+
+                    # close() wakes the thread up during the back-off
+                    self._condition.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, _MAX_RETRY_INTERVAL)
+                continue
+
+            creation_time = time.perf_counter() - start
+            retry_interval = _MIN_RETRY_INTERVAL
+
+            with self._condition:
+                if not self._running:
+                    server.stop()
+                    return
+
+                self._ready.append((server, creation_time))
+                self._stats.created += 1
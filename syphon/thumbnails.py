@@ -0,0 +1,428 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from syphon.base import BaseSyphonClient
+from syphon.server_description import SyphonServerDescription
+from syphon.types import Size
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+# thumbnail sizes differ per aspect ratio, only the output textures of the most recent ones are kept
+_MAX_SCALED_TEXTURES = 16
+
+
+@dataclass
+class Thumbnail:
+    """
+    The latest thumbnail of a server.
+
+    Attributes:
+    - description (SyphonServerDescription): The description of the server.
+    - image (np.ndarray): The downscaled image of shape (height, width, channels).
+    - source_size (Size): The size (width, height) of the sampled frame.
+    - captured_at (float): The monotonic time the frame was sampled.
+    """
+    description: SyphonServerDescription
+    image: np.ndarray = field(repr=False)
+    source_size: Size
+    captured_at: float
+
+
+@dataclass
+class ThumbnailStats:
+    """
+    Statistics of a thumbnail sampler.
+
+    Attributes:
+    - servers (int): The number of sampled servers.
+    - open_clients (int): The number of currently connected clients.
+    - samples (int): The number of captured thumbnails.
+    - failures (int): The number of servers that could not be sampled (no frame in time or an error).
+    - clients_opened (int): The number of clients created.
+    - clients_released (int): The number of clients stopped because they were idle or their server retired.
+    - sample_time (float): The smoothed time in seconds to downscale and read back a thumbnail.
+    - cycle_time (float): The expected time in seconds until every thumbnail has been refreshed once.
+    """
+    servers: int = 0
+    open_clients: int = 0
+    samples: int = 0
+    failures: int = 0
+    clients_opened: int = 0
+    clients_released: int = 0
+    sample_time: float = 0.0
+    cycle_time: float = 0.0
+
+
+ClientFactory = Callable[[SyphonServerDescription, Any], BaseSyphonClient]
+
+
+class ThumbnailSampler:
+    """
+    Keeps a low-rate thumbnail of every server in the directory at a fixed total cost.
+
+    The servers are visited round-robin by a scheduler thread, which samples at most `samples_per_second` frames
+    in total, no matter how many servers there are. A sample connects a client if necessary, downscales the latest
+    frame (on the GPU for Metal textures) and reads back only the thumbnail. Clients which have not been sampled
+    for `idle_timeout` seconds are released, and at most `max_clients` are connected at the same time, so the
+    number of connections stays bounded as well. With many servers, each thumbnail is refreshed every
+    `servers / samples_per_second` seconds, with few servers at most every `min_interval` seconds.
+
+    Attributes:
+    - directory (Any): The directory used to discover servers (a `SyphonServerDirectory` or any object with a
+      `servers` property).
+    - max_size (Size): The maximum size (width, height) of the thumbnails, the aspect ratio is kept.
+    - samples_per_second (float): The total number of samples per second over all servers.
+    - min_interval (float): The minimum time in seconds between two samples of the same server.
+    - max_clients (int): The maximum number of connected clients.
+    - idle_timeout (float): The time in seconds after which a client that has not been sampled is released.
+    - connect_timeout (float): The time in seconds a new client may take to receive its first frame.
+    - refresh_interval (float): The interval in seconds at which the directory is reconciled.
+    - predicate (Optional[Callable[[SyphonServerDescription], bool]]): Selects the servers to sample.
+    - device (Any): The Metal device used for clients and downscaling, or None for the shared default device.
+    """
+
+    def __init__(self,
+                 directory: Optional[Any] = None,
+                 max_size: Size = (160, 90),
+                 samples_per_second: float = 10.0,
+                 min_interval: float = 1.0,
+                 max_clients: int = 8,
+                 idle_timeout: float = 2.0,
+                 connect_timeout: float = 1.0,
+                 refresh_interval: float = 1.0,
+                 predicate: Optional[Callable[[SyphonServerDescription], bool]] = None,
+                 device: Optional[Any] = None,
+                 client_factory: Optional[ClientFactory] = None):
+        """
+        Initialize a ThumbnailSampler.
+
+        Parameters:
+        - directory (Any, optional): The directory to use. If None, a new `SyphonServerDirectory` is created.
+        - max_size (Size, optional): The maximum size (width, height) of the thumbnails. Defaults to 160x90.
+        - samples_per_second (float, optional): The total number of samples per second. Defaults to 10.
+        - min_interval (float, optional): The minimum time between two samples of a server. Defaults to 1.0.
+        - max_clients (int, optional): The maximum number of connected clients. Defaults to 8.
+        - idle_timeout (float, optional): The time after which an idle client is released. Defaults to 2.0.
+        - connect_timeout (float, optional): The time a new client may take to receive its first frame.
+          Defaults to 1.0.
+        - refresh_interval (float, optional): The directory reconcile interval in seconds. Defaults to 1.0.
+        - predicate (Callable, optional): Selects the servers to sample. If None, all servers are sampled.
+        - device (Any, optional): The Metal device. If None, the shared default device will be used.
+        - client_factory (Callable, optional): Creates a client from a description and the device.
+          Defaults to `SyphonMetalClient`.
+
+        Raises:
+        - ValueError: If the sample rate is not positive or no client is allowed.
+        """
+        if samples_per_second <= 0:
+            raise ValueError("The sample rate has to be positive.")
+
+        if max_clients < 1:
+            raise ValueError("At least one client has to be allowed.")
+
+        if directory is None:
+            from syphon.server_directory import SyphonServerDirectory
+            directory = SyphonServerDirectory()
+            directory.run_loop_interval = 0.01
+        self.directory = directory
+
+        self.max_size = max_size
+        self.samples_per_second = samples_per_second
+        self.min_interval = min_interval
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.refresh_interval = refresh_interval
+        self.predicate = predicate
+        self.device = device
+
+        self._client_factory = client_factory
+        self._scaler: Any = None
+        self._command_queue: Any = None
+
+        # scheduler state, only used by the thread calling update()
+        self._descriptions: Dict[str, SyphonServerDescription] = {}
+        self._order: Deque[str] = deque()
+        self._clients: Dict[str, BaseSyphonClient] = {}
+        self._waiting: "OrderedDict[str, float]" = OrderedDict()
+        self._last_attempt: Dict[str, float] = {}
+        self._next_refresh = 0.0
+
+        self._lock = threading.Lock()
+        self._thumbnails: Dict[str, Thumbnail] = {}
+        self._stats = ThumbnailStats()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def thumbnails(self) -> Dict[str, Thumbnail]:
+        """
+        Get the latest thumbnail of every sampled server.
+
+        Returns:
+        - Dict[str, Thumbnail]: The thumbnails by server uuid.
+        """
+        with self._lock:
+            return dict(self._thumbnails)
+
+    def thumbnail(self, uuid: str) -> Optional[Thumbnail]:
+        """
+        Get the latest thumbnail of a server.
+
+        Parameters:
+        - uuid (str): The uuid of the server.
+
+        Returns:
+        - Optional[Thumbnail]: The thumbnail, or None if the server has not been sampled yet.
+        """
+        with self._lock:
+            return self._thumbnails.get(uuid)
+
+    @property
+    def stats(self) -> ThumbnailStats:
+        """
+        Get the statistics of the sampler.
+
+        Returns:
+        - ThumbnailStats: A snapshot of the statistics.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def start(self):
+        """
+        Start the scheduler thread.
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name="ThumbnailSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the scheduler thread and release all clients.
+        """
+        self._running = False
+        self._wake.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        for uuid in list(self._clients):
+            self._release(uuid)
+
+    def update(self) -> bool:
+        """
+        Reconcile the servers with the directory if due, release idle clients and take at most one sample.
+
+        This is called `samples_per_second` times per second by the scheduler thread, but can also be called
+        manually without `start()`.
+
+        Returns:
+        - bool: True if a thumbnail has been captured, False otherwise.
+        """
+        now = time.monotonic()
+
+        if now >= self._next_refresh:
+            self._reconcile(self.directory.servers)
+            self._next_refresh = now + self.refresh_interval
+
+        self._release_idle(now)
+
+        # clients waiting for their first frame are checked first, checking them does not read anything back
+        for uuid in list(self._waiting):
+            if self._sample(uuid, now):
+                return True
+
+        uuid = self._next_due(now)
+        if uuid is None or (uuid not in self._clients and not self._make_room()):
+            return False
+
+        return self._sample(uuid, now)
+
+    def _run(self):
+        interval = 1.0 / self.samples_per_second
+        next_tick = time.monotonic()
+
+        while self._running:
+            self.update()
+
+            # a slow sample delays the schedule instead of causing a burst of samples to catch up
+            next_tick = max(next_tick + interval, time.monotonic())
+            self._wake.wait(next_tick - time.monotonic())
+
+    def _reconcile(self, servers: List[SyphonServerDescription]):
+        available = {}
+        for description in servers:
+            if self.predicate is None or self.predicate(description):
+                available[description.uuid] = description
+
+        for uuid in list(self._descriptions):
+            if uuid not in available:
+                self._release(uuid)
+                self._descriptions.pop(uuid)
+                self._last_attempt.pop(uuid, None)
+                self._order.remove(uuid)
+
+                with self._lock:
+                    self._thumbnails.pop(uuid, None)
+
+        for uuid, description in available.items():
+            if uuid not in self._descriptions:
+                self._order.append(uuid)
+            self._descriptions[uuid] = description
+
+        with self._lock:
+            self._stats.servers = len(self._descriptions)
+            self._stats.cycle_time = max(len(self._descriptions) / self.samples_per_second, self.min_interval)
+
+    def _next_due(self, now: float) -> Optional[str]:
+        for _ in range(len(self._order)):
+            uuid = self._order[0]
+            self._order.rotate(-1)
+
+            if uuid not in self._waiting and now - self._last_attempt.get(uuid, -np.inf) >= self.min_interval:
+                return uuid
+
+        return None
+
+    def _make_room(self) -> bool:
+        if len(self._clients) < self.max_clients:
+            return True
+
+        # release the client which has been idle the longest, clients waiting for a frame are kept
+        idle = [uuid for uuid in self._clients if uuid not in self._waiting]
+        if not idle:
+            return False
+
+        self._release(min(idle, key=lambda uuid: self._last_attempt.get(uuid, 0.0)))
+        return True
+
+    def _release_idle(self, now: float):
+        for uuid in list(self._clients):
+            if uuid not in self._waiting and now - self._last_attempt.get(uuid, now) > self.idle_timeout:
+                self._release(uuid)
+
+    def _sample(self, uuid: str, now: float) -> bool:
+        description = self._descriptions[uuid]
+
+        try:
+            client = self._clients.get(uuid)
+            if client is None:
+                client = self._create_client(description)
+                self._clients[uuid] = client
+                self._waiting[uuid] = now
+
+                with self._lock:
+                    self._stats.clients_opened += 1
+                    self._stats.open_clients = len(self._clients)
+
+            image = client.new_frame_image
+            if image is None:
+                if now - self._waiting.get(uuid, now) > self.connect_timeout:
+                    self._fail(uuid, now)
+                return False
+
+            start = time.perf_counter()
+            thumbnail, source_size = self._downscale(image)
+            sample_time = time.perf_counter() - start
+        except Exception:
+            self._fail(uuid, now)
+            return False
+
+        self._waiting.pop(uuid, None)
+        self._last_attempt[uuid] = now
+
+        with self._lock:
+            self._thumbnails[uuid] = Thumbnail(description, thumbnail, source_size, now)
+            self._stats.samples += 1
+            self._stats.sample_time += (sample_time - self._stats.sample_time) * 0.1
+
+        return True
+
+    def _fail(self, uuid: str, now: float):
+        # the server is retried after the regular interval with a new client
+        self._last_attempt[uuid] = now
+        self._release(uuid)
+
+        with self._lock:
+            self._stats.failures += 1
+
+    def _release(self, uuid: str):
+        self._waiting.pop(uuid, None)
+        client = self._clients.pop(uuid, None)
+
+        if client is not None:
+            try:
+                client.stop()
+            finally:
+                with self._lock:
+                    self._stats.clients_released += 1
+                    self._stats.open_clients = len(self._clients)
+
+    def _create_client(self, description: SyphonServerDescription) -> BaseSyphonClient:
+        if self._client_factory is not None:
+            return self._client_factory(description, self.device)
+
+        from syphon.client import SyphonMetalClient
+        return SyphonMetalClient(description, device=self.device)
+
+    def _thumbnail_size(self, width: int, height: int) -> Size:
+        max_width, max_height = self.max_size
+        scale = min(max_width / width, max_height / height, 1.0)
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def _downscale(self, image: Any):
+        if isinstance(image, np.ndarray):
+            height, width = image.shape[:2]
+            thumbnail_width, thumbnail_height = self._thumbnail_size(width, height)
+
+            # nearest neighbour sampling at the pixel centres
+            rows = ((np.arange(thumbnail_height) * 2 + 1) * height) // (2 * thumbnail_height)
+            cols = ((np.arange(thumbnail_width) * 2 + 1) * width) // (2 * thumbnail_width)
+            thumbnail = image[rows][:, cols]
+        else:
+            width, height = image.width(), image.height()
+            thumbnail = self._downscale_texture(image, *self._thumbnail_size(width, height))
+
+        get_memory_registry().track(thumbnail, thumbnail.nbytes, "thumbnails", MemoryKind.Buffer)
+        return thumbnail, (width, height)
+
+    def _downscale_texture(self, texture: Any, width: int, height: int) -> np.ndarray:
+        import Metal
+
+        from syphon.resources import get_resource_registry
+        from syphon.utils.metal import MetalTextureScaler
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+
+        if self._scaler is None:
+            resources = get_resource_registry()
+            if self.device is None:
+                self.device = resources.default_device()
+
+            self._scaler = MetalTextureScaler(self.device, owner="thumbnails", max_textures=_MAX_SCALED_TEXTURES)
+            self._command_queue = resources.command_queue(self.device)
+
+        # only the thumbnail is read back, the full frame never leaves the GPU
+        command_buffer = self._command_queue.commandBuffer()
+        target = self._scaler.scale(command_buffer, texture, width, height)
+
+        # managed textures (discrete GPUs) have to be synchronized before the CPU reads them
+        if target.storageMode() == Metal.MTLStorageModeManaged:
+            blit = command_buffer.blitCommandEncoder()
+            blit.synchronizeResource_(target)
+            blit.endEncoding()
+
+        command_buffer.commit()
+        command_buffer.waitUntilCompleted()
+
+        return copy_mtl_texture_to_image(target)
@@ -0,0 +1,318 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+_HEADER_DTYPE = np.dtype([
+    ("slot_count", "<i8"),
+    ("height", "<i8"),
+    ("width", "<i8"),
+    ("channels", "<i8"),
+    ("sequence", "<i8"),
+    ("latest_slot", "<i8"),
+    ("dropped", "<i8"),
+])
+
+_SLOT_DTYPE = np.dtype([
+    ("state", "<i8"),
+    ("sequence", "<i8"),
+    ("timestamp", "<f8"),
+    ("pins", "<i8"),
+])
+
+_SLOT_EMPTY = 0
+_SLOT_WRITING = 1
+_SLOT_READY = 2
+
+_DATA_ALIGNMENT = 4096
+
+
+class SharedFrame:
+    """
+    A frame acquired from a `SharedFrameRing`.
+
+    The image is a zero-copy view into shared memory. The slot is pinned until `release()` is called,
+    so the writer will not overwrite it in the meantime. The image must not be used after the release.
+
+    Attributes:
+    - image (np.ndarray): The frame as a NumPy array of shape (height, width, channels).
+    - slot (int): The index of the ring slot holding the frame.
+    - sequence (int): The sequence number of the frame.
+    - timestamp (float): The timestamp the frame was written with.
+    """
+
+    def __init__(self, ring: "SharedFrameRing", slot: int, image: np.ndarray, sequence: int, timestamp: float):
+        self._ring = ring
+        self.slot = slot
+        self.image = image
+        self.sequence = sequence
+        self.timestamp = timestamp
+
+    def release(self):
+        """
+        Unpin the frame so its slot can be reused by the writer.
+        """
+        if self._ring is not None:
+            self._ring._unpin(self.slot)
+            self._ring = None
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class SharedFrameRing:
+    """
+    A ring of fixed-size frames in `multiprocessing.shared_memory`, written by one producer and read by many processes.
+
+    A small header in shared memory holds the latest-frame cursor and, per slot, its state, sequence number,
+    timestamp and reader pin count. The writer only ever fills slots that are neither pinned nor the latest one,
+    so a reader never sees a torn frame. If every slot is in use, the new frame is dropped instead.
+
+    The ring is shared with worker processes by passing it as an argument when the process is started
+    (e.g. as `Process` argument or `ProcessPoolExecutor` initializer argument), which attaches to the same memory.
+
+    Attributes:
+    - name (str): The name of the shared memory block.
+    - width (int): The width of the frames.
+    - height (int): The height of the frames.
+    - channels (int): The number of channels per pixel.
+    - slot_count (int): The number of frame slots.
+    """
+
+    def __init__(self, width: int, height: int, channels: int = 4, slot_count: int = 10,
+                 name: Optional[str] = None):
+        """
+        Create a new SharedFrameRing.
+
+        Parameters:
+        - width (int): The width of the frames.
+        - height (int): The height of the frames.
+        - channels (int, optional): The number of channels per pixel. Defaults to 4.
+        - slot_count (int, optional): The number of frame slots. Should be at least the number of readers plus two.
+          Defaults to 10.
+        - name (str, optional): The name of the shared memory block. If None, a unique name is generated.
+        """
+        if slot_count < 2:
+            raise ValueError("A frame ring needs at least two slots.")
+
+        frame_size = width * height * channels
+        data_offset = _align(_HEADER_DTYPE.itemsize + _SLOT_DTYPE.itemsize * slot_count, _DATA_ALIGNMENT)
+        size = data_offset + _align(frame_size, _DATA_ALIGNMENT) * slot_count
+
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        condition = multiprocessing.get_context().Condition()
+
+        # only the creator accounts for the shared memory block
+        self._memory_handle = get_memory_registry().track(None, size, f"ring:{memory.name}", MemoryKind.Shared)
+
+        self._setup(memory, condition)
+
+        self._header["slot_count"] = slot_count
+        self._header["height"] = height
+        self._header["width"] = width
+        self._header["channels"] = channels
+        self._header["sequence"] = -1
+        self._header["latest_slot"] = -1
+        self._header["dropped"] = 0
+
+        self._setup_frames()
+        self._slots[:] = (_SLOT_EMPTY, -1, 0.0, 0)
+
+    @property
+    def latest_sequence(self) -> int:
+        """
+        Get the sequence number of the latest written frame.
+
+        Returns:
+        - int: The sequence number, or -1 if no frame has been written yet.
+        """
+        return int(self._header["sequence"])
+
+    @property
+    def dropped_frames(self) -> int:
+        """
+        Get the number of frames the writer dropped because every slot was in use.
+
+        Returns:
+        - int: The number of dropped frames.
+        """
+        return int(self._header["dropped"])
+
+    def write(self, fill: Callable[[np.ndarray], Any], timestamp: Optional[float] = None) -> Optional[int]:
+        """
+        Write a frame by letting a function fill a free slot in place.
+
+        Parameters:
+        - fill (Callable[[np.ndarray], Any]): Called with the writable slot array of shape (height, width, channels).
+        - timestamp (float, optional): The timestamp of the frame. Defaults to the current monotonic time.
+
+        Returns:
+        - Optional[int]: The sequence number of the written frame, or None if it had to be dropped.
+        """
+        slot = self._begin_write()
+        if slot is None:
+            return None
+
+        try:
+            fill(self._frames[slot])
+        except BaseException:
+            with self._condition:
+                self._slots["state"][slot] = _SLOT_EMPTY
+            raise
+
+        return self._commit(slot, time.monotonic() if timestamp is None else timestamp)
+
+    def write_image(self, image: np.ndarray, timestamp: Optional[float] = None) -> Optional[int]:
+        """
+        Copy a NumPy image into the ring.
+
+        Parameters:
+        - image (np.ndarray): The image of shape (height, width, channels).
+        - timestamp (float, optional): The timestamp of the frame. Defaults to the current monotonic time.
+
+        Returns:
+        - Optional[int]: The sequence number of the written frame, or None if it had to be dropped.
+        """
+        return self.write(lambda slot: np.copyto(slot, image), timestamp)
+
+    def write_texture(self, texture: Any, timestamp: Optional[float] = None) -> Optional[int]:
+        """
+        Read a Metal texture (e.g. a `SyphonMetalClient` frame) back directly into the ring.
+
+        Parameters:
+        - texture (Any): The RGBA or BGRA Metal texture, matching the ring size.
+        - timestamp (float, optional): The timestamp of the frame. Defaults to the current monotonic time.
+
+        Returns:
+        - Optional[int]: The sequence number of the written frame, or None if it had to be dropped.
+        """
+        from syphon.utils.numpy import copy_mtl_texture_to_image
+        return self.write(lambda slot: copy_mtl_texture_to_image(texture, out=slot), timestamp)
+
+    def acquire_latest(self, after: int = -1, timeout: Optional[float] = 0.0) -> Optional[SharedFrame]:
+        """
+        Pin and return the latest frame, optionally waiting until one newer than `after` is available.
+
+        Parameters:
+        - after (int, optional): Only return frames with a sequence number greater than this. Defaults to -1.
+        - timeout (float, optional): The maximum time to wait in seconds. None waits forever. Defaults to 0.0.
+
+        Returns:
+        - Optional[SharedFrame]: The pinned frame, or None if no newer frame arrived in time.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._header["sequence"] > after, timeout):
+                return None
+
+            slot = int(self._header["latest_slot"])
+            self._slots["pins"][slot] += 1
+            sequence, timestamp = int(self._slots["sequence"][slot]), float(self._slots["timestamp"][slot])
+
+        return SharedFrame(self, slot, self._frames[slot], sequence, timestamp)
+
+    def slot_image(self, slot: int) -> np.ndarray:
+        """
+        Get the zero-copy view of a slot, e.g. in a worker that was handed the slot of a pinned `SharedFrame`.
+
+        Parameters:
+        - slot (int): The index of the slot.
+
+        Returns:
+        - np.ndarray: The slot as a NumPy array of shape (height, width, channels).
+        """
+        return self._frames[slot]
+
+    def close(self):
+        """
+        Detach from the shared memory. Frames acquired from this ring have to be released and dropped before.
+        """
+        self._header = None
+        self._slots = None
+        self._frames = None
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Destroy the shared memory block. Should be called once by the creator after all processes closed the ring.
+        """
+        self._memory.unlink()
+
+        if self._memory_handle is not None:
+            get_memory_registry().untrack(self._memory_handle)
+            self._memory_handle = None
+
+    def __getstate__(self):
+        return {"name": self.name, "condition": self._condition}
+
+    def __setstate__(self, state):
+        self._memory_handle = None
+        self._setup(shared_memory.SharedMemory(name=state["name"]), state["condition"])
+        self._setup_frames()
+
+    def _setup(self, memory: shared_memory.SharedMemory, condition: Any):
+        self._memory = memory
+        self._condition = condition
+        self.name = memory.name
+
+        self._header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=memory.buf)
+
+    def _setup_frames(self):
+        self.slot_count = int(self._header["slot_count"])
+        self.height = int(self._header["height"])
+        self.width = int(self._header["width"])
+        self.channels = int(self._header["channels"])
+
+        self._slots = np.ndarray((self.slot_count,), dtype=_SLOT_DTYPE,
+                                 buffer=self._memory.buf, offset=_HEADER_DTYPE.itemsize)
+
+        frame_size = self.width * self.height * self.channels
+        data_offset = _align(_HEADER_DTYPE.itemsize + _SLOT_DTYPE.itemsize * self.slot_count, _DATA_ALIGNMENT)
+        stride = _align(frame_size, _DATA_ALIGNMENT)
+
+        self._frames = np.ndarray((self.slot_count, self.height, self.width, self.channels), dtype=np.uint8,
+                                  buffer=self._memory.buf, offset=data_offset,
+                                  strides=(stride, self.width * self.channels, self.channels, 1))
+
+    def _begin_write(self) -> Optional[int]:
+        with self._condition:
+            latest = int(self._header["latest_slot"])
+            candidates = [i for i in range(self.slot_count)
+                          if i != latest and self._slots["pins"][i] == 0 and self._slots["state"][i] != _SLOT_WRITING]
+
+            if not candidates:
+                self._header["dropped"] += 1
+                return None
+
+            # reuse the slot holding the oldest frame
+            slot = min(candidates, key=lambda i: int(self._slots["sequence"][i]))
+            self._slots["state"][slot] = _SLOT_WRITING
+            return slot
+
+    def _commit(self, slot: int, timestamp: float) -> int:
+        with self._condition:
+            sequence = int(self._header["sequence"]) + 1
+
+            self._slots["sequence"][slot] = sequence
+            self._slots["timestamp"][slot] = timestamp
+            self._slots["state"][slot] = _SLOT_READY
+
+            self._header["latest_slot"] = slot
+            self._header["sequence"] = sequence
+            self._condition.notify_all()
+
+        return sequence
+
+    def _unpin(self, slot: int):
+        with self._condition:
+            self._slots["pins"][slot] -= 1
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
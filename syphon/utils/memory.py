@@ -0,0 +1,338 @@
+import itertools
+import threading
+import weakref
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from syphon.utils.exceptions import SyphonException
+
+# an evictor is asked to free the given number of bytes and returns how many it actually freed
+Evictor = Callable[[int], int]
+
+
+class MemoryKind(Enum):
+    """
+    Enum representing the kinds of tracked memory.
+
+    Enum Values:
+    - Texture: A GPU texture.
+    - Buffer: A host (or GPU staging) buffer.
+    - Shared: A shared memory block.
+    """
+    Texture = "texture"
+    Buffer = "buffer"
+    Shared = "shared"
+
+
+class MemoryBudgetExceededException(SyphonException):
+    def __init__(self, requested: int, total: int, budget: int):
+        super(MemoryBudgetExceededException, self).__init__(
+            f"Allocating {requested} bytes exceeds the memory budget of {budget} bytes ({total} bytes in use).")
+        self.requested = requested
+        self.total = total
+        self.budget = budget
+
+
+@dataclass(frozen=True)
+class MemoryAllocation:
+    """
+    A tracked allocation.
+
+    Attributes:
+    - handle (int): The handle of the allocation.
+    - nbytes (int): The size in bytes.
+    - kind (MemoryKind): The kind of memory.
+    - owner (str): The owner, e.g. `server:<name>`, `client:<uuid>` or `pool:<name>`.
+    - label (Optional[str]): An optional description of the allocation.
+    """
+    handle: int
+    nbytes: int
+    kind: MemoryKind
+    owner: str
+    label: Optional[str] = None
+
+
+@dataclass
+class MemoryStats:
+    """
+    Snapshot of the tracked memory.
+
+    Attributes:
+    - total_bytes (int): The number of tracked bytes.
+    - peak_bytes (int): The highest number of tracked bytes so far.
+    - budget (Optional[int]): The global budget in bytes, or None if unlimited.
+    - allocations (int): The number of tracked allocations.
+    - evicted_bytes (int): The number of bytes freed by evictors so far.
+    - by_owner (Dict[str, int]): The tracked bytes per owner.
+    - by_kind (Dict[str, int]): The tracked bytes per kind of memory.
+    """
+    total_bytes: int = 0
+    peak_bytes: int = 0
+    budget: Optional[int] = None
+    allocations: int = 0
+    evicted_bytes: int = 0
+    by_owner: Dict[str, int] = field(default_factory=dict)
+    by_kind: Dict[str, int] = field(default_factory=dict)
+
+
+class _Entry:
+    __slots__ = ("allocation", "ref")
+
+    def __init__(self, allocation: MemoryAllocation, ref: Optional[Callable[[], Any]]):
+        self.allocation = allocation
+        self.ref = ref
+
+
+class MemoryRegistry:
+    """
+    Thread-safe accounting of the textures and buffers allocated by the library.
+
+    Allocations are tracked with the object holding the memory. Python objects (e.g. NumPy arrays) are untracked
+    as soon as they are garbage collected, Objective-C objects (e.g. Metal textures) are checked through weak
+    references whenever the totals are read. Allocations without an object have to be untracked explicitly.
+
+    If a budget is set, tracking an allocation that would exceed it first asks the registered evictors
+    (e.g. of buffer pools) to free idle memory, and raises a `MemoryBudgetExceededException` if that is not enough.
+
+    Attributes:
+    - budget (Optional[int]): The global budget in bytes, or None if unlimited.
+    """
+
+    def __init__(self, budget: Optional[int] = None):
+        """
+        Initialize a MemoryRegistry.
+
+        Parameters:
+        - budget (int, optional): The global budget in bytes. If None, the memory is not limited.
+        """
+        self.budget = budget
+
+        self._lock = threading.RLock()
+        self._entries: Dict[int, _Entry] = {}
+        self._handles = itertools.count(1)
+        self._evictors: Dict[int, Evictor] = {}
+        self._total = 0
+        self._peak = 0
+        self._evicted = 0
+
+    def track(self,
+              obj: Any,
+              nbytes: int,
+              owner: str,
+              kind: MemoryKind = MemoryKind.Buffer,
+              label: Optional[str] = None) -> int:
+        """
+        Track an allocation.
+
+        Parameters:
+        - obj (Any): The object holding the memory, used to untrack it automatically once it is freed.
+          If None, the allocation has to be untracked with `untrack()`.
+        - nbytes (int): The size in bytes.
+        - owner (str): The owner, e.g. `server:<name>`, `client:<uuid>` or `pool:<name>`.
+        - kind (MemoryKind, optional): The kind of memory. Defaults to MemoryKind.Buffer.
+        - label (str, optional): An optional description of the allocation.
+
+        Returns:
+        - int: The handle of the allocation.
+
+        Raises:
+        - MemoryBudgetExceededException: If the allocation exceeds the budget, even after eviction.
+        """
+        with self._lock:
+            handle = next(self._handles)
+            allocation = MemoryAllocation(handle, nbytes, kind, owner, label)
+
+        # the allocation is added in the same critical section that checks the budget
+        self._reserve(nbytes, _Entry(allocation, self._make_ref(obj, handle)))
+        return handle
+
+    def untrack(self, handle: int):
+        """
+        Stop tracking an allocation. Untracking an unknown handle has no effect.
+
+        Parameters:
+        - handle (int): The handle of the allocation.
+        """
+        with self._lock:
+            entry = self._entries.pop(handle, None)
+            if entry is not None:
+                self._total -= entry.allocation.nbytes
+
+    def reserve(self, nbytes: int):
+        """
+        Make sure that an allocation of the given size fits into the budget, evicting idle memory if necessary.
+        This only checks the budget, `track()` checks it and adds the allocation atomically.
+
+        Parameters:
+        - nbytes (int): The size in bytes.
+
+        Raises:
+        - MemoryBudgetExceededException: If the allocation exceeds the budget, even after eviction.
+        """
+        self._reserve(nbytes, None)
+
+    def add_evictor(self, evictor: Evictor) -> int:
+        """
+        Register a callback which frees idle memory (e.g. of a pool) when the budget is exceeded.
+
+        Parameters:
+        - evictor (Callable[[int], int]): Called with the number of bytes to free, returns the number of bytes
+          it actually freed.
+
+        Returns:
+        - int: The id to remove the evictor with.
+        """
+        with self._lock:
+            evictor_id = next(self._handles)
+            self._evictors[evictor_id] = evictor
+            return evictor_id
+
+    def remove_evictor(self, evictor_id: int):
+        """
+        Remove a registered evictor.
+
+        Parameters:
+        - evictor_id (int): The id returned by `add_evictor()`.
+        """
+        with self._lock:
+            self._evictors.pop(evictor_id, None)
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        Get the number of tracked bytes.
+
+        Returns:
+        - int: The number of bytes.
+        """
+        with self._lock:
+            self._prune()
+            return self._total
+
+    def allocations(self, owner: Optional[str] = None) -> List[MemoryAllocation]:
+        """
+        Get the tracked allocations, e.g. to find leaks.
+
+        Parameters:
+        - owner (str, optional): Only return the allocations of this owner.
+
+        Returns:
+        - List[MemoryAllocation]: The allocations.
+        """
+        with self._lock:
+            self._prune()
+            return [e.allocation for e in self._entries.values() if owner is None or e.allocation.owner == owner]
+
+    def stats(self) -> MemoryStats:
+        """
+        Get a snapshot of the tracked memory.
+
+        Returns:
+        - MemoryStats: The totals per owner and kind of memory.
+        """
+        with self._lock:
+            self._prune()
+            stats = MemoryStats(self._total, self._peak, self.budget, len(self._entries), self._evicted)
+
+            for entry in self._entries.values():
+                allocation = entry.allocation
+                stats.by_owner[allocation.owner] = stats.by_owner.get(allocation.owner, 0) + allocation.nbytes
+                stats.by_kind[allocation.kind.value] = stats.by_kind.get(allocation.kind.value, 0) + allocation.nbytes
+
+        return stats
+
+    def _reserve(self, nbytes: int, entry: Optional[_Entry]):
+        evictors: List[Evictor] = []
+        attempt = 0
+
+        while True:
+            with self._lock:
+                budget = self.budget
+                if budget is not None:
+                    self._prune()
+                    excess = self._total + nbytes - budget
+                else:
+                    excess = 0
+
+                if excess <= 0:
+                    if entry is not None:
+                        self._entries[entry.allocation.handle] = entry
+                        self._total += nbytes
+                        self._peak = max(self._peak, self._total)
+                    return
+
+                if attempt == 0:
+                    evictors = list(self._evictors.values())
+
+                if attempt >= len(evictors):
+                    raise MemoryBudgetExceededException(nbytes, self._total, budget)
+
+                evictor = evictors[attempt]
+
+            # evictors release memory which is untracked through the registry, so they are called without the lock
+            freed = evictor(excess)
+            attempt += 1
+
+            with self._lock:
+                self._evicted += freed
+
+    def _make_ref(self, obj: Any, handle: int) -> Optional[Callable[[], Any]]:
+        if obj is None:
+            return None
+
+        try:
+            return weakref.ref(obj, lambda _: self.untrack(handle))
+        except TypeError:
+            pass
+
+        # objective-c proxies do not support python weak references
+        try:
+            import objc
+            return objc.WeakRef(obj)
+        except (ImportError, TypeError, ValueError):
+            return None
+
+    def _prune(self):
+        dead = [h for h, e in self._entries.items() if e.ref is not None and e.ref() is None]
+        for handle in dead:
+            self._total -= self._entries.pop(handle).allocation.nbytes
+
+
+_registry = MemoryRegistry()
+
+
+def get_memory_registry() -> MemoryRegistry:
+    """
+    Get the registry all allocations of the library are tracked in.
+
+    Returns:
+    - MemoryRegistry: The global memory registry.
+    """
+    return _registry
+
+
+def set_memory_budget(budget: Optional[int]):
+    """
+    Set the global memory budget.
+
+    Parameters:
+    - budget (Optional[int]): The budget in bytes, or None to remove the limit.
+    """
+    _registry.budget = budget
+
+
+def track_mtl_texture(texture: Any, owner: str, label: Optional[str] = None) -> Any:
+    """
+    Track a Metal texture in the global registry.
+
+    Parameters:
+    - texture (Any): The Metal texture.
+    - owner (str): The owner of the texture.
+    - label (str, optional): An optional description of the texture.
+
+    Returns:
+    - Any: The texture.
+    """
+    _registry.track(texture, int(texture.allocatedSize()), owner, MemoryKind.Texture, label)
+    return texture
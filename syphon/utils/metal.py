@@ -0,0 +1,383 @@
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import Metal
+import numpy as np
+
+from syphon.utils.memory import track_mtl_texture
+from syphon.utils.yuv import YUVStandard, yuv_to_rgb_coefficients
+
+_YUV_SHADER_SOURCE = """
+#include <metal_stdlib>
+using namespace metal;
+
+struct YUVParams {
+    float y_offset;
+    float y_scale;
+    float2 r;
+    float2 g;
+    float2 b;
+};
+
+static inline float4 yuv_to_rgba(float y, float2 cbcr, constant YUVParams &p) {
+    float luma = (y * 255.0 - p.y_offset) * p.y_scale;
+    float2 c = cbcr * 255.0 - 128.0;
+    float3 rgb = float3(luma + dot(p.r, c), luma + dot(p.g, c), luma + dot(p.b, c)) / 255.0;
+    return float4(saturate(rgb), 1.0);
+}
+
+kernel void nv12_to_rgba(texture2d<float, access::read> y_plane [[texture(0)]],
+                         texture2d<float, access::read> uv_plane [[texture(1)]],
+                         texture2d<float, access::write> output [[texture(2)]],
+                         constant YUVParams &params [[buffer(0)]],
+                         uint2 gid [[thread_position_in_grid]]) {
+    if (gid.x >= output.get_width() || gid.y >= output.get_height()) return;
+    float2 cbcr = uv_plane.read(gid / 2).rg;
+    output.write(yuv_to_rgba(y_plane.read(gid).r, cbcr, params), gid);
+}
+
+kernel void i420_to_rgba(texture2d<float, access::read> y_plane [[texture(0)]],
+                         texture2d<float, access::read> u_plane [[texture(1)]],
+                         texture2d<float, access::read> v_plane [[texture(2)]],
+                         texture2d<float, access::write> output [[texture(3)]],
+                         constant YUVParams &params [[buffer(0)]],
+                         uint2 gid [[thread_position_in_grid]]) {
+    if (gid.x >= output.get_width() || gid.y >= output.get_height()) return;
+    float2 cbcr = float2(u_plane.read(gid / 2).r, v_plane.read(gid / 2).r);
+    output.write(yuv_to_rgba(y_plane.read(gid).r, cbcr, params), gid);
+}
+
+kernel void uyvy_to_rgba(texture2d<float, access::read> packed [[texture(0)]],
+                         texture2d<float, access::write> output [[texture(1)]],
+                         constant YUVParams &params [[buffer(0)]],
+                         uint2 gid [[thread_position_in_grid]]) {
+    if (gid.x >= output.get_width() || gid.y >= output.get_height()) return;
+    float4 uyvy = packed.read(uint2(gid.x / 2, gid.y));
+    float y = (gid.x & 1) ? uyvy.a : uyvy.g;
+    output.write(yuv_to_rgba(y, float2(uyvy.r, uyvy.b), params), gid);
+}
+"""
+
+YUV_FORMATS = ("nv12", "i420", "uyvy")
+
+
+class MetalYUVConverter:
+    """
+    Converts YUV images to RGBA on the GPU with a Metal compute kernel.
+
+    The planes are uploaded into R8 / RG8 textures (UYVY into a half-width RGBA8 texture) and converted into
+    an RGBA texture within a command buffer, so the conversion can be encoded into the command buffer that
+    publishes the frame.
+
+    Attributes:
+    - device (Any): The Metal device.
+    - width (int): The width of the image.
+    - height (int): The height of the image.
+    - format (str): The YUV format, one of `nv12`, `i420` or `uyvy`.
+    - standard (YUVStandard): The colour matrix.
+    - full_range (bool): If True, the YUV values use the full 8-bit range, otherwise the limited video range.
+    - planes (List[Any]): The plane textures.
+    """
+
+    def __init__(self,
+                 device: Any,
+                 width: int,
+                 height: int,
+                 format: str = "nv12",
+                 standard: YUVStandard = YUVStandard.BT709,
+                 full_range: bool = False):
+        """
+        Initialize a MetalYUVConverter.
+
+        Parameters:
+        - device (Any): The Metal device.
+        - width (int): The width of the image.
+        - height (int): The height of the image.
+        - format (str, optional): The YUV format, one of `nv12`, `i420` or `uyvy`. Defaults to `nv12`.
+        - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+        - full_range (bool, optional): If True, the full 8-bit range is used. Defaults to False (video range).
+
+        Raises:
+        - ValueError: If the format is not supported.
+        - Exception: If the compute pipeline could not be created.
+        """
+        if format not in YUV_FORMATS:
+            raise ValueError(f"Unsupported YUV format '{format}' (expected one of {', '.join(YUV_FORMATS)})")
+
+        self.device = device
+        self.width = width
+        self.height = height
+        self.format = format
+        self.standard = standard
+        self.full_range = full_range
+
+        # setup compute pipeline
+        library, error = device.newLibraryWithSource_options_error_(_YUV_SHADER_SOURCE, None, None)
+        if library is None:
+            raise Exception(f"Could not compile YUV shader: {error}")
+
+        function = library.newFunctionWithName_(f"{format}_to_rgba")
+        self.pipeline, error = device.newComputePipelineStateWithFunction_error_(function, None)
+        if self.pipeline is None:
+            raise Exception(f"Could not create YUV pipeline: {error}")
+
+        y_offset, y_scale, matrix = yuv_to_rgb_coefficients(standard, full_range)
+        self._params = struct.pack("<2f6f", y_offset, y_scale, *matrix.reshape(-1).tolist())
+
+        # setup plane textures
+        if format == "nv12":
+            self.planes = [self._create_plane(Metal.MTLPixelFormatR8Unorm, width, height),
+                           self._create_plane(Metal.MTLPixelFormatRG8Unorm, width // 2, height // 2)]
+        elif format == "i420":
+            self.planes = [self._create_plane(Metal.MTLPixelFormatR8Unorm, width, height),
+                           self._create_plane(Metal.MTLPixelFormatR8Unorm, width // 2, height // 2),
+                           self._create_plane(Metal.MTLPixelFormatR8Unorm, width // 2, height // 2)]
+        else:
+            self.planes = [self._create_plane(Metal.MTLPixelFormatRGBA8Unorm, width // 2, height)]
+
+    def create_output_texture(self) -> Any:
+        """
+        Create an RGBA texture the converter can write to.
+
+        Returns:
+        - Any: The RGBA Metal texture.
+        """
+        descriptor = Metal.MTLTextureDescriptor.texture2DDescriptorWithPixelFormat_width_height_mipmapped_(
+            Metal.MTLPixelFormatRGBA8Unorm, self.width, self.height, False
+        )
+        descriptor.setUsage_(Metal.MTLTextureUsageShaderRead | Metal.MTLTextureUsageShaderWrite)
+        return track_mtl_texture(self.device.newTextureWithDescriptor_(descriptor), "yuv", "output")
+
+    def upload(self, *planes: np.ndarray):
+        """
+        Upload the planes of a YUV image.
+
+        Parameters:
+        - *planes (np.ndarray): The uint8 planes, `(y, uv)` for NV12, `(y, u, v)` for I420 and `(data,)` for UYVY,
+          of the same shapes as for the NumPy converters in `syphon.utils.yuv`.
+
+        Raises:
+        - AssertionError: If the number of planes does not match the format.
+        """
+        assert len(planes) == len(self.planes), f"Format {self.format} requires {len(self.planes)} planes"
+
+        for texture, plane in zip(self.planes, planes):
+            data = np.ascontiguousarray(plane)
+            region = Metal.MTLRegion((0, 0, 0), (texture.width(), texture.height(), 1))
+            bytes_per_row = data.nbytes // texture.height()
+            texture.replaceRegion_mipmapLevel_withBytes_bytesPerRow_(region, 0, memoryview(data), bytes_per_row)
+
+    def encode(self, command_buffer: Any, output: Any):
+        """
+        Encode the conversion of the uploaded planes into the output texture.
+
+        Parameters:
+        - command_buffer (Any): The Metal command buffer, e.g. the one used to publish the frame.
+        - output (Any): The RGBA output texture, which has to support shader writes (see `create_output_texture`).
+        """
+        encoder = command_buffer.computeCommandEncoder()
+        encoder.setComputePipelineState_(self.pipeline)
+
+        for i, texture in enumerate(self.planes):
+            encoder.setTexture_atIndex_(texture, i)
+        encoder.setTexture_atIndex_(output, len(self.planes))
+        encoder.setBytes_length_atIndex_(self._params, len(self._params), 0)
+
+        group_width = self.pipeline.threadExecutionWidth()
+        group_height = max(1, self.pipeline.maxTotalThreadsPerThreadgroup() // group_width)
+        groups = Metal.MTLSize((self.width + group_width - 1) // group_width,
+                               (self.height + group_height - 1) // group_height, 1)
+
+        encoder.dispatchThreadgroups_threadsPerThreadgroup_(groups, Metal.MTLSize(group_width, group_height, 1))
+        encoder.endEncoding()
+
+    def convert(self, command_queue: Any, output: Any, *planes: np.ndarray, wait: bool = True):
+        """
+        Upload the planes and convert them into the output texture in a new command buffer.
+
+        Parameters:
+        - command_queue (Any): The Metal command queue.
+        - output (Any): The RGBA output texture.
+        - *planes (np.ndarray): The uint8 planes of the YUV image.
+        - wait (bool, optional): If True, block until the conversion is completed. Defaults to True.
+        """
+        self.upload(*planes)
+
+        command_buffer = command_queue.commandBuffer()
+        self.encode(command_buffer, output)
+        command_buffer.commit()
+
+        if wait:
+            command_buffer.waitUntilCompleted()
+
+    def _create_plane(self, pixel_format: int, width: int, height: int) -> Any:
+        descriptor = Metal.MTLTextureDescriptor.texture2DDescriptorWithPixelFormat_width_height_mipmapped_(
+            pixel_format, width, height, False
+        )
+        descriptor.setUsage_(Metal.MTLTextureUsageShaderRead)
+        return track_mtl_texture(self.device.newTextureWithDescriptor_(descriptor), "yuv", "plane")
+
+
+def publish_yuv_frame(server: Any, converter: MetalYUVConverter, output: Any, *planes: np.ndarray,
+                      is_flipped: bool = False, command_buffer: Optional[Any] = None):
+    """
+    Convert a YUV image on the GPU and publish the result with a `SyphonMetalServer` in one command buffer.
+
+    Parameters:
+    - server (SyphonMetalServer): The server to publish to.
+    - converter (MetalYUVConverter): The converter for the image format.
+    - output (Any): The RGBA output texture (see `MetalYUVConverter.create_output_texture`).
+    - *planes (np.ndarray): The uint8 planes of the YUV image.
+    - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+    - command_buffer (Any, optional): The Metal command buffer. If None, a new command buffer will be created.
+    """
+    converter.upload(*planes)
+
+    if command_buffer is None:
+        command_buffer = server.command_queue.commandBuffer()
+
+    converter.encode(command_buffer, output)
+    server.publish_frame_texture(output, is_flipped=is_flipped, command_buffer=command_buffer)
+
+
+_SCALE_SHADER_SOURCE = """
+#include <metal_stdlib>
+using namespace metal;
+
+kernel void scale_texture(texture2d<float, access::sample> source [[texture(0)]],
+                          texture2d<float, access::write> target [[texture(1)]],
+                          uint2 gid [[thread_position_in_grid]]) {
+    if (gid.x >= target.get_width() || gid.y >= target.get_height()) {
+        return;
+    }
+
+    constexpr sampler linear(coord::normalized, filter::linear, address::clamp_to_edge);
+    float2 uv = (float2(gid) + 0.5) / float2(target.get_width(), target.get_height());
+    target.write(source.sample(linear, uv), gid);
+}
+"""
+
+
+class MetalTextureScaler:
+    """
+    Scales RGBA textures on the GPU with a bilinear Metal compute kernel.
+
+    The output textures are pooled per size, so switching between a few resolutions does not allocate a new
+    texture per frame. Since the frames are encoded into the same command queue, an output texture can be
+    reused as soon as the frame using it has been encoded.
+
+    Attributes:
+    - device (Any): The Metal device.
+    - pixel_format (int): The pixel format of the output textures.
+    - max_textures (Optional[int]): The maximum number of pooled output textures, the least recently used one
+      is released first. None keeps a texture for every size.
+    """
+
+    def __init__(self,
+                 device: Any,
+                 pixel_format: int = Metal.MTLPixelFormatRGBA8Unorm,
+                 owner: str = "scaler",
+                 max_textures: Optional[int] = None):
+        """
+        Initialize a MetalTextureScaler.
+
+        Parameters:
+        - device (Any): The Metal device.
+        - pixel_format (int, optional): The pixel format of the output textures. Defaults to RGBA8Unorm.
+        - owner (str, optional): The owner the output textures are accounted to. Defaults to `scaler`.
+        - max_textures (int, optional): The maximum number of pooled output textures. Defaults to None (unbounded).
+
+        Raises:
+        - Exception: If the compute pipeline could not be created.
+        """
+        self.device = device
+        self.pixel_format = pixel_format
+        self.max_textures = max_textures
+
+        library, error = device.newLibraryWithSource_options_error_(_SCALE_SHADER_SOURCE, None, None)
+        if library is None:
+            raise Exception(f"Could not compile scale shader: {error}")
+
+        function = library.newFunctionWithName_("scale_texture")
+        self.pipeline, error = device.newComputePipelineStateWithFunction_error_(function, None)
+        if self.pipeline is None:
+            raise Exception(f"Could not create scale pipeline: {error}")
+
+        self._owner = owner
+        self._textures: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
+
+    def output_texture(self, width: int, height: int) -> Any:
+        """
+        Get the pooled output texture of the given size, creating it if necessary.
+
+        Parameters:
+        - width (int): The width of the texture.
+        - height (int): The height of the texture.
+
+        Returns:
+        - Any: The output texture.
+        """
+        key = (width, height)
+        texture = self._textures.get(key)
+
+        if texture is None:
+            descriptor = Metal.MTLTextureDescriptor.texture2DDescriptorWithPixelFormat_width_height_mipmapped_(
+                self.pixel_format, width, height, False
+            )
+            descriptor.setUsage_(Metal.MTLTextureUsageShaderRead | Metal.MTLTextureUsageShaderWrite)
+            texture = track_mtl_texture(self.device.newTextureWithDescriptor_(descriptor), self._owner, "scaled")
+            self._textures[key] = texture
+
+            # command buffers retain the textures they use, so evicted textures stay valid until they completed
+            while self.max_textures is not None and len(self._textures) > self.max_textures:
+                self._textures.popitem(last=False)
+        else:
+            self._textures.move_to_end(key)
+
+        return texture
+
+    def encode(self, command_buffer: Any, source: Any, target: Any):
+        """
+        Encode scaling the source texture into the target texture.
+
+        Parameters:
+        - command_buffer (Any): The Metal command buffer, e.g. the one used to publish the frame.
+        - source (Any): The source texture.
+        - target (Any): The target texture, which has to support shader writes (see `output_texture()`).
+        """
+        encoder = command_buffer.computeCommandEncoder()
+        encoder.setComputePipelineState_(self.pipeline)
+        encoder.setTexture_atIndex_(source, 0)
+        encoder.setTexture_atIndex_(target, 1)
+
+        group_width = self.pipeline.threadExecutionWidth()
+        group_height = max(1, self.pipeline.maxTotalThreadsPerThreadgroup() // group_width)
+        groups = Metal.MTLSize((target.width() + group_width - 1) // group_width,
+                               (target.height() + group_height - 1) // group_height, 1)
+
+        encoder.dispatchThreadgroups_threadsPerThreadgroup_(groups, Metal.MTLSize(group_width, group_height, 1))
+        encoder.endEncoding()
+
+    def scale(self, command_buffer: Any, source: Any, width: int, height: int) -> Any:
+        """
+        Encode scaling the source texture into the pooled output texture of the given size.
+
+        Parameters:
+        - command_buffer (Any): The Metal command buffer.
+        - source (Any): The source texture.
+        - width (int): The width of the output.
+        - height (int): The height of the output.
+
+        Returns:
+        - Any: The output texture.
+        """
+        target = self.output_texture(width, height)
+        self.encode(command_buffer, source, target)
+        return target
+
+    def clear(self):
+        """
+        Release the pooled output textures.
+        """
+        self._textures.clear()
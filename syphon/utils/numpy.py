@@ -1,8 +1,12 @@
-from typing import Any
+from typing import Any, Optional, Tuple
 
 import numpy as np
 
-from syphon.utils.raw import copy_mtl_texture_to_bytes, copy_bytes_to_mtl_texture
+from syphon.types import Region
+from syphon.utils import tracing
+from syphon.utils.raw import copy_bytes_to_mtl_texture, copy_mtl_texture_to_buffer
+from syphon.utils.stamp import STAMP_WIDTH, decode_stamp_strip
+from syphon.utils.yuv import YUVConverter, YUVStandard, nv12_to_rgba, i420_to_rgba, uyvy_to_rgba
 
 
 def copy_image_to_mtl_texture(image: np.ndarray, texture: Any):
@@ -19,24 +23,64 @@ def copy_image_to_mtl_texture(image: np.ndarray, texture: Any):
     assert len(image.shape) == 3, "Image has to be of shape (m, n, 4)"
     assert image.shape[2] == 4, "Image has to be of shape (m, n, 4)"
 
-    data = image.tobytes()
-    copy_bytes_to_mtl_texture(data, texture)
+    with tracing.span("copy_image_to_mtl_texture", "server", width=image.shape[1], height=image.shape[0]):
+        # hand the pixel buffer over directly (no intermediate bytes copy for contiguous images)
+        data = memoryview(np.ascontiguousarray(image))
+        copy_bytes_to_mtl_texture(data, texture)
 
 
-def copy_mtl_texture_to_image(texture: Any) -> np.ndarray:
+def copy_mtl_texture_to_image(texture: Any,
+                              out: Optional[np.ndarray] = None,
+                              region: Optional[Region] = None) -> np.ndarray:
     """
     Copy pixel data from a Metal texture to a NumPy array representing an image.
 
     Parameters:
     - texture (Any): The source Metal texture to copy pixel data from.
+    - out (np.ndarray, optional): A C-contiguous uint8 array of shape (height, width, 4) to copy the pixels into.
+      If None, a new array is allocated.
+    - region (Region, optional): The region (x, y, width, height) of the texture to copy. Defaults to the whole texture.
 
     Returns:
     - np.ndarray: The resulting image as a NumPy array of shape (height, width, 4).
-    
-    Note:
-    - todo: Add support for buffer re-use.
+
+    Raises:
+    - AssertionError: If the output array has an incorrect shape, type or memory layout.
+    """
+    _, _, width, height = (0, 0, texture.width(), texture.height()) if region is None else region
+    shape = (height, width, 4)
+
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+
+    assert out.shape == shape, f"Output array has to be of shape {shape}"
+    assert out.dtype == np.uint8, "Output array has to be of type uint8"
+    assert out.flags.c_contiguous, "Output array has to be C-contiguous"
+
+    copy_mtl_texture_to_buffer(texture, out, region)
+    return out
+
+
+def read_mtl_texture_stamp(texture: Any) -> Optional[Tuple[int, int]]:
     """
-    # todo: support buffer re-use
-    data = copy_mtl_texture_to_bytes(texture)
-    image = np.frombuffer(data, dtype=np.uint8)
-    return image.reshape((texture.height(), texture.width(), 4))
+    Read a frame stamp (see `syphon.utils.stamp`) from a Metal texture by reading back only the stamp strips.
+
+    Parameters:
+    - texture (Any): The RGBA or BGRA Metal texture.
+
+    Returns:
+    - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None if there is no stamp.
+    """
+    if texture.width() < STAMP_WIDTH:
+        return None
+
+    strip = np.empty((1, STAMP_WIDTH, 4), dtype=np.uint8)
+
+    # the stamp is in the last row if the frame has been published flipped
+    for y in (0, texture.height() - 1):
+        copy_mtl_texture_to_image(texture, out=strip, region=(0, y, STAMP_WIDTH, 1))
+        stamp = decode_stamp_strip(strip[0])
+        if stamp is not None:
+            return stamp
+
+    return None
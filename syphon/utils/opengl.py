@@ -1,8 +1,21 @@
-from typing import Any
+import ctypes
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
 
 import AppKit
+from OpenGL import GL
 
+from syphon.utils import tracing
 from syphon.utils.exceptions import NSOpenGLContextNotFoundException, CGLContextNotFoundException
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+# pixel formats by number of channels of the transferred images
+_PIXEL_FORMATS = {1: GL.GL_RED, 3: GL.GL_RGB, 4: GL.GL_RGBA}
+
+# time slice of a single fence wait in nanoseconds
+_FENCE_WAIT_SLICE = 1_000_000
 
 
 def get_current_cgl_context_obj() -> Any:
@@ -27,3 +40,538 @@ def get_current_cgl_context_obj() -> Any:
         raise CGLContextNotFoundException()
 
     return cgl_context
+
+
+@dataclass
+class TransferStatistics:
+    """
+    Timing statistics of pixel buffer transfers.
+
+    Attributes:
+    - frames (int): The number of transferred frames.
+    - stall_time (float): The total time in seconds the CPU waited for the GPU.
+    - last_stall_time (float): The stall time of the last frame in seconds.
+    - max_stall_time (float): The longest stall time of a single frame in seconds.
+    """
+    frames: int = 0
+    stall_time: float = 0.0
+    last_stall_time: float = 0.0
+    max_stall_time: float = 0.0
+
+    @property
+    def mean_stall_time(self) -> float:
+        """
+        Get the mean stall time per frame.
+
+        Returns:
+        - float: The mean stall time in seconds.
+        """
+        return self.stall_time / self.frames if self.frames > 0 else 0.0
+
+    def record(self, stall_time: float):
+        """
+        Record the stall time of a transferred frame.
+
+        Parameters:
+        - stall_time (float): The stall time in seconds.
+        """
+        self.frames += 1
+        self.stall_time += stall_time
+        self.last_stall_time = stall_time
+        self.max_stall_time = max(self.max_stall_time, stall_time)
+
+    def reset(self):
+        """
+        Reset the statistics.
+        """
+        self.frames = 0
+        self.stall_time = 0.0
+        self.last_stall_time = 0.0
+        self.max_stall_time = 0.0
+
+
+def supports_buffer_storage() -> bool:
+    """
+    Check if the current OpenGL context supports immutable buffer storage (OpenGL 4.4 / ARB_buffer_storage),
+    which is required for persistently mapped buffers. The legacy OpenGL of macOS (4.1) does not.
+
+    Returns:
+    - bool: True if persistent mapping is available, False otherwise.
+    """
+    return bool(GL.glBufferStorage)
+
+
+def get_row_alignment(row_bytes: int) -> int:
+    """
+    Get the largest OpenGL pixel store alignment (8, 4, 2 or 1) that divides the row size.
+
+    Parameters:
+    - row_bytes (int): The number of bytes per row.
+
+    Returns:
+    - int: The alignment.
+    """
+    for alignment in (8, 4, 2):
+        if row_bytes % alignment == 0:
+            return alignment
+    return 1
+
+
+def _gen_buffers(count: int) -> List[int]:
+    buffers = GL.glGenBuffers(count)
+    return [int(b) for b in buffers] if count > 1 else [int(buffers)]
+
+
+def _address(pointer: Any) -> int:
+    return pointer.value if isinstance(pointer, ctypes.c_void_p) else int(pointer)
+
+
+def _wait_fence(fence: Any) -> float:
+    start = time.perf_counter()
+    while GL.glClientWaitSync(fence, GL.GL_SYNC_FLUSH_COMMANDS_BIT, _FENCE_WAIT_SLICE) == GL.GL_TIMEOUT_EXPIRED:
+        pass
+    GL.glDeleteSync(fence)
+    return time.perf_counter() - start
+
+
+class PixelBufferUploader:
+    """
+    Streams NumPy images into an OpenGL texture through a ring of pixel unpack buffers (PBOs).
+
+    The image is copied into the next buffer of the ring and `glTexSubImage2D` reads from that buffer
+    asynchronously, so the CPU copy of the next frame overlaps with the GPU consuming the previous ones.
+    If persistent mapping is available (see `supports_buffer_storage()`), the buffers stay mapped and a fence
+    per buffer guards against overwriting data that is still in flight. Otherwise the buffer storage is orphaned
+    before every map, so the driver hands out fresh memory instead of blocking.
+
+    The time spent waiting for fences, or for the driver to map a buffer, is reported in `statistics`.
+    All methods have to be called from the thread the OpenGL context is current on.
+
+    Attributes:
+    - width (int): The width of the texture.
+    - height (int): The height of the texture.
+    - channels (int): The number of channels of the uploaded images (1, 3 or 4).
+    - target (GLenum): The texture target, `GL_TEXTURE_2D` or `GL_TEXTURE_RECTANGLE`.
+    - texture (int): The texture name.
+    - pixel_format (GLenum): The pixel format of the uploaded images.
+    - persistent (bool): True if the buffers are mapped persistently, False if they are orphaned.
+    - statistics (TransferStatistics): The stall time statistics of the uploads.
+    """
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 channels: int = 4,
+                 target: int = GL.GL_TEXTURE_2D,
+                 texture: Optional[int] = None,
+                 pixel_format: Optional[int] = None,
+                 buffer_count: int = 3,
+                 persistent: bool = True):
+        """
+        Initialize a PixelBufferUploader.
+
+        Parameters:
+        - width (int): The width of the texture.
+        - height (int): The height of the texture.
+        - channels (int, optional): The number of channels of the uploaded images (1, 3 or 4). Defaults to 4.
+        - target (GLenum, optional): The texture target, `GL_TEXTURE_2D` or `GL_TEXTURE_RECTANGLE`.
+          Defaults to GL_TEXTURE_2D.
+        - texture (int, optional): An existing texture of the given size. If None, an RGBA8 texture is created.
+        - pixel_format (GLenum, optional): The pixel format of the images, e.g. `GL_BGRA`.
+          Defaults to the format matching the number of channels.
+        - buffer_count (int, optional): The number of buffers in the ring. Defaults to 3.
+        - persistent (bool, optional): If True, the buffers are mapped persistently where available.
+          Defaults to True.
+
+        Raises:
+        - ValueError: If the number of channels or the target is not supported.
+        """
+        if channels not in _PIXEL_FORMATS:
+            raise ValueError(f"Images with {channels} channels are not supported")
+
+        if target not in (GL.GL_TEXTURE_2D, GL.GL_TEXTURE_RECTANGLE):
+            raise ValueError("Only GL_TEXTURE_2D and GL_TEXTURE_RECTANGLE are supported")
+
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.target = target
+        self.pixel_format = _PIXEL_FORMATS[channels] if pixel_format is None else pixel_format
+        self.persistent = persistent and supports_buffer_storage()
+        self.statistics = TransferStatistics()
+
+        self._row_alignment = get_row_alignment(width * channels)
+        self._nbytes = width * height * channels
+        self._owns_texture = texture is None
+        self.texture = self._create_texture() if texture is None else texture
+
+        self._buffers = _gen_buffers(buffer_count)
+        self._fences: List[Any] = [None] * buffer_count
+        self._views: List[Any] = [None] * buffer_count
+        self._index = 0
+
+        if self.persistent:
+            self._map_persistent()
+
+        registry = get_memory_registry()
+        self._memory_handles = [registry.track(None, self._nbytes * buffer_count, "opengl", MemoryKind.Buffer,
+                                               "upload buffers")]
+        if self._owns_texture:
+            self._memory_handles.append(registry.track(None, width * height * 4, "opengl", MemoryKind.Texture,
+                                                       "upload texture"))
+
+    def upload(self, image: Any):
+        """
+        Upload an image to the texture.
+
+        Parameters:
+        - image (np.ndarray): The image of shape (height, width, channels) and type uint8. The image does not
+          have to be contiguous.
+
+        Raises:
+        - AssertionError: If the image has an incorrect shape or type.
+        """
+        shape = (self.height, self.width, self.channels)
+        assert image.shape == shape, f"Image has to be of shape {shape}"
+        assert image.dtype.itemsize == 1, "Image has to be of type uint8"
+
+        index = self._index
+        self._index = (index + 1) % len(self._buffers)
+        buffer = self._buffers[index]
+
+        with tracing.span("pbo_upload", "server", width=self.width, height=self.height):
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, buffer)
+
+            if self.persistent:
+                fence = self._fences[index]
+                stall_time = 0.0 if fence is None else _wait_fence(fence)
+                self._fences[index] = None
+                self._views[index][...] = image
+            else:
+                start = time.perf_counter()
+                GL.glBufferData(GL.GL_PIXEL_UNPACK_BUFFER, self._nbytes, None, GL.GL_STREAM_DRAW)
+                pointer = GL.glMapBufferRange(GL.GL_PIXEL_UNPACK_BUFFER, 0, self._nbytes,
+                                              GL.GL_MAP_WRITE_BIT | GL.GL_MAP_INVALIDATE_BUFFER_BIT)
+                stall_time = time.perf_counter() - start
+
+                self._map_view(pointer)[...] = image
+                GL.glUnmapBuffer(GL.GL_PIXEL_UNPACK_BUFFER)
+
+            # the buffer rows are tightly packed
+            GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, self._row_alignment)
+            GL.glPixelStorei(GL.GL_UNPACK_ROW_LENGTH, 0)
+
+            GL.glBindTexture(self.target, self.texture)
+            GL.glTexSubImage2D(self.target, 0, 0, 0, self.width, self.height,
+                               self.pixel_format, GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            GL.glBindTexture(self.target, 0)
+
+            GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 4)
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+
+            if self.persistent:
+                self._fences[index] = GL.glFenceSync(GL.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+        self.statistics.record(stall_time)
+
+    def publish(self, server: Any, image: Any, is_flipped: bool = False):
+        """
+        Upload an image and publish the texture.
+
+        Parameters:
+        - server (SyphonOpenGLServer): The server to publish the texture with.
+        - image (np.ndarray): The image of shape (height, width, channels) and type uint8.
+        - is_flipped (bool, optional): If True, the frame is flipped. Defaults to False.
+        """
+        self.upload(image)
+        server.publish_frame_texture(self.texture,
+                                     region=(0, 0, self.width, self.height),
+                                     size=(self.width, self.height),
+                                     is_flipped=is_flipped,
+                                     target=self.target)
+
+    def release(self):
+        """
+        Delete the buffers, the fences and the texture (if it has been created by the uploader).
+        """
+        for index, fence in enumerate(self._fences):
+            if fence is not None:
+                GL.glDeleteSync(fence)
+            self._fences[index] = None
+
+        if self.persistent:
+            for buffer in self._buffers:
+                GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, buffer)
+                GL.glUnmapBuffer(GL.GL_PIXEL_UNPACK_BUFFER)
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+            self._views = [None] * len(self._buffers)
+
+        for handle in self._memory_handles:
+            get_memory_registry().untrack(handle)
+        self._memory_handles = []
+
+        if self._buffers:
+            GL.glDeleteBuffers(len(self._buffers), self._buffers)
+            self._buffers = []
+
+        if self._owns_texture and self.texture is not None:
+            GL.glDeleteTextures([self.texture])
+            self.texture = None
+
+    def _create_texture(self) -> int:
+        texture = int(GL.glGenTextures(1))
+
+        GL.glBindTexture(self.target, texture)
+        GL.glTexParameteri(self.target, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(self.target, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(self.target, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexParameteri(self.target, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexImage2D(self.target, 0, GL.GL_RGBA8, self.width, self.height, 0,
+                        self.pixel_format, GL.GL_UNSIGNED_BYTE, None)
+        GL.glBindTexture(self.target, 0)
+
+        return texture
+
+    def _map_persistent(self):
+        flags = GL.GL_MAP_WRITE_BIT | GL.GL_MAP_PERSISTENT_BIT | GL.GL_MAP_COHERENT_BIT
+
+        for index, buffer in enumerate(self._buffers):
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, buffer)
+            GL.glBufferStorage(GL.GL_PIXEL_UNPACK_BUFFER, self._nbytes, None, flags)
+            pointer = GL.glMapBufferRange(GL.GL_PIXEL_UNPACK_BUFFER, 0, self._nbytes, flags)
+            self._views[index] = self._map_view(pointer)
+
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+
+    def _map_view(self, pointer: Any) -> Any:
+        import numpy as np
+
+        data = (ctypes.c_uint8 * self._nbytes).from_address(_address(pointer))
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, self.channels)
+
+
+class PixelBufferReader:
+    """
+    Reads OpenGL textures back into NumPy arrays through a ring of pixel pack buffers (PBOs) without stalling.
+
+    `submit()` starts an asynchronous copy of the texture into the next free buffer and places a fence behind it.
+    `poll()` maps the oldest buffer whose fence has been signaled and copies it into a (reusable) NumPy array,
+    or returns None if no copy has completed yet. Results therefore arrive one or two frames late, but reading
+    never blocks. If all buffers are still in flight, the oldest pending copy is dropped.
+
+    All methods have to be called from the thread the OpenGL context is current on.
+
+    Attributes:
+    - channels (int): The number of channels of the read images (1, 3 or 4).
+    - target (GLenum): The texture target, `GL_TEXTURE_2D` or `GL_TEXTURE_RECTANGLE`.
+    - pixel_format (GLenum): The pixel format of the read images.
+    - statistics (TransferStatistics): The stall time statistics of the mapped buffers.
+    - dropped_frames (int): The number of copies dropped because all buffers were in flight.
+    """
+
+    def __init__(self,
+                 channels: int = 4,
+                 target: int = GL.GL_TEXTURE_RECTANGLE,
+                 pixel_format: Optional[int] = None,
+                 buffer_count: int = 3):
+        """
+        Initialize a PixelBufferReader.
+
+        Parameters:
+        - channels (int, optional): The number of channels of the read images (1, 3 or 4). Defaults to 4.
+        - target (GLenum, optional): The texture target. Defaults to GL_TEXTURE_RECTANGLE, which is used by the
+          images of `SyphonOpenGLClient`.
+        - pixel_format (GLenum, optional): The pixel format of the read images, e.g. `GL_BGRA`.
+          Defaults to the format matching the number of channels.
+        - buffer_count (int, optional): The number of buffers in the ring. Defaults to 3.
+
+        Raises:
+        - ValueError: If the number of channels or the target is not supported.
+        """
+        if channels not in _PIXEL_FORMATS:
+            raise ValueError(f"Images with {channels} channels are not supported")
+
+        if target not in (GL.GL_TEXTURE_2D, GL.GL_TEXTURE_RECTANGLE):
+            raise ValueError("Only GL_TEXTURE_2D and GL_TEXTURE_RECTANGLE are supported")
+
+        self.channels = channels
+        self.target = target
+        self.pixel_format = _PIXEL_FORMATS[channels] if pixel_format is None else pixel_format
+        self.statistics = TransferStatistics()
+        self.dropped_frames = 0
+
+        self._buffers = _gen_buffers(buffer_count)
+        self._capacities = [0] * buffer_count
+        self._memory_handles: List[Optional[int]] = [None] * buffer_count
+        self._free = list(range(buffer_count))
+
+        # pending copies in submission order: (buffer index, fence, width, height)
+        self._pending: Deque[Tuple[int, Any, int, int]] = deque()
+
+    @property
+    def pending(self) -> int:
+        """
+        Get the number of copies that have been submitted but not read yet.
+
+        Returns:
+        - int: The number of pending copies.
+        """
+        return len(self._pending)
+
+    def submit(self, texture: int, width: int, height: int):
+        """
+        Start copying a texture into the next free buffer.
+
+        Parameters:
+        - texture (int): The texture name.
+        - width (int): The width of the texture.
+        - height (int): The height of the texture.
+        """
+        if not self._free:
+            index, fence, _, _ = self._pending.popleft()
+            GL.glDeleteSync(fence)
+            self._free.append(index)
+            self.dropped_frames += 1
+
+        index = self._free.pop(0)
+        nbytes = width * height * self.channels
+
+        with tracing.span("pbo_readback_submit", "client", width=width, height=height):
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._buffers[index])
+
+            if self._capacities[index] != nbytes:
+                self._track_buffer(index, nbytes)
+                GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, nbytes, None, GL.GL_STREAM_READ)
+                self._capacities[index] = nbytes
+
+            # the buffer rows are tightly packed
+            GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, get_row_alignment(width * self.channels))
+            GL.glPixelStorei(GL.GL_PACK_ROW_LENGTH, 0)
+
+            GL.glBindTexture(self.target, texture)
+            GL.glGetTexImage(self.target, 0, self.pixel_format, GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            GL.glBindTexture(self.target, 0)
+
+            GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 4)
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+            fence = GL.glFenceSync(GL.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+            # without a flush, the fence may never reach the GPU (e.g. offscreen contexts without buffer swaps)
+            GL.glFlush()
+
+        self._pending.append((index, fence, width, height))
+
+    def poll(self, out: Optional[Any] = None) -> Optional[Any]:
+        """
+        Read the oldest completed copy, if there is one.
+
+        Parameters:
+        - out (np.ndarray, optional): A C-contiguous uint8 array of shape (height, width, channels) to copy the
+          pixels into. If None, a new array is allocated.
+
+        Returns:
+        - Optional[np.ndarray]: The image of shape (height, width, channels), or None if no copy has completed.
+
+        Raises:
+        - AssertionError: If the output array has an incorrect shape, type or memory layout.
+        """
+        if not self._pending:
+            return None
+
+        index, fence, width, height = self._pending[0]
+
+        # check the fence without waiting
+        status = GL.glClientWaitSync(fence, 0, 0)
+        if status not in (GL.GL_ALREADY_SIGNALED, GL.GL_CONDITION_SATISFIED):
+            return None
+
+        self._pending.popleft()
+        GL.glDeleteSync(fence)
+
+        shape = (height, width, self.channels)
+        out = _prepare_output(shape, out)
+
+        with tracing.span("pbo_readback_map", "client", width=width, height=height):
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._buffers[index])
+
+            start = time.perf_counter()
+            pointer = GL.glMapBufferRange(GL.GL_PIXEL_PACK_BUFFER, 0, out.nbytes, GL.GL_MAP_READ_BIT)
+            self.statistics.record(time.perf_counter() - start)
+
+            ctypes.memmove(out.ctypes.data, _address(pointer), out.nbytes)
+
+            GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+        self._free.append(index)
+        return out
+
+    def read(self, texture: int, width: int, height: int, out: Optional[Any] = None) -> Optional[Any]:
+        """
+        Submit a texture and read the oldest completed copy.
+
+        Parameters:
+        - texture (int): The texture name.
+        - width (int): The width of the texture.
+        - height (int): The height of the texture.
+        - out (np.ndarray, optional): The array to copy the pixels into (see `poll()`).
+
+        Returns:
+        - Optional[np.ndarray]: The image of a previously submitted texture, or None if no copy has completed.
+        """
+        self.submit(texture, width, height)
+        return self.poll(out)
+
+    def read_image(self, image: Any, out: Optional[Any] = None) -> Optional[Any]:
+        """
+        Submit a received `SyphonOpenGLImage` (see `SyphonOpenGLClient.new_frame_image`) and read the oldest
+        completed copy.
+
+        Parameters:
+        - image (Any): The received image.
+        - out (np.ndarray, optional): The array to copy the pixels into (see `poll()`).
+
+        Returns:
+        - Optional[np.ndarray]: The image of a previously submitted frame, or None if no copy has completed.
+        """
+        size = image.textureSize()
+        return self.read(image.textureName(), int(size.width), int(size.height), out)
+
+    def release(self):
+        """
+        Delete the buffers and the pending fences.
+        """
+        for _, fence, _, _ in self._pending:
+            GL.glDeleteSync(fence)
+        self._pending.clear()
+
+        for index in range(len(self._buffers)):
+            self._track_buffer(index, None)
+
+        if self._buffers:
+            GL.glDeleteBuffers(len(self._buffers), self._buffers)
+            self._buffers = []
+            self._free = []
+
+    def _track_buffer(self, index: int, nbytes: Optional[int]):
+        registry = get_memory_registry()
+
+        if self._memory_handles[index] is not None:
+            registry.untrack(self._memory_handles[index])
+            self._memory_handles[index] = None
+
+        if nbytes is not None:
+            self._memory_handles[index] = registry.track(None, nbytes, "opengl", MemoryKind.Buffer, "readback buffer")
+
+
+def _prepare_output(shape: Tuple[int, int, int], out: Optional[Any]) -> Any:
+    import numpy as np
+
+    if out is None:
+        return np.empty(shape, dtype=np.uint8)
+
+    assert out.shape == shape, f"Output array has to be of shape {shape}"
+    assert out.dtype == np.uint8, "Output array has to be of type uint8"
+    assert out.flags.c_contiguous, "Output array has to be C-contiguous"
+    return out
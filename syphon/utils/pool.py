@@ -0,0 +1,146 @@
+import threading
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+BufferKey = Tuple[Tuple[int, ...], str]
+
+
+class ImageBufferPool:
+    """
+    Thread-safe pool of reusable NumPy buffers, keyed by shape and type.
+
+    Buffers are handed out with `acquire()` and returned with `release()`. Returned buffers are kept for reuse
+    up to a maximum number per shape, so readbacks of many feeds do not allocate a new array per frame.
+
+    The buffers are tracked in the memory registry (see `syphon.utils.memory`) as owner `pool:<name>`.
+    If the memory budget is exceeded, idle buffers are evicted.
+
+    Attributes:
+    - max_free_per_shape (int): The maximum number of idle buffers kept per shape and type.
+    - name (str): The name of the pool in the memory registry.
+    """
+
+    def __init__(self, max_free_per_shape: int = 4, name: str = "default"):
+        """
+        Initialize an ImageBufferPool.
+
+        Parameters:
+        - max_free_per_shape (int, optional): The maximum number of idle buffers kept per shape. Defaults to 4.
+        - name (str, optional): The name of the pool in the memory registry. Defaults to `default`.
+        """
+        self.max_free_per_shape = max_free_per_shape
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._free: Dict[BufferKey, List[np.ndarray]] = defaultdict(list)
+        self._in_use = 0
+        self._in_use_bytes = 0
+
+        # the registry must not keep the pool alive
+        registry = get_memory_registry()
+        evictor_id = registry.add_evictor(_weak_evictor(weakref.WeakMethod(self.evict)))
+        weakref.finalize(self, registry.remove_evictor, evictor_id)
+
+    def acquire(self, shape: Tuple[int, ...], dtype: Any = np.uint8) -> np.ndarray:
+        """
+        Get a buffer of the given shape and type. The content of the buffer is undefined.
+
+        Parameters:
+        - shape (Tuple[int, ...]): The shape of the buffer.
+        - dtype (Any, optional): The type of the buffer. Defaults to np.uint8.
+
+        Returns:
+        - np.ndarray: A C-contiguous buffer.
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+
+        with self._lock:
+            free = self._free.get(key)
+            buffer = free.pop() if free else None
+
+        if buffer is None:
+            buffer = np.empty(shape, dtype=dtype)
+            get_memory_registry().track(buffer, buffer.nbytes, f"pool:{self.name}", MemoryKind.Buffer)
+
+        with self._lock:
+            self._in_use += 1
+            self._in_use_bytes += buffer.nbytes
+
+        return buffer
+
+    def release(self, buffer: np.ndarray):
+        """
+        Return a buffer acquired from this pool.
+
+        Parameters:
+        - buffer (np.ndarray): The buffer to return. It must not be used afterwards.
+        """
+        key = (buffer.shape, buffer.dtype.str)
+
+        with self._lock:
+            self._in_use -= 1
+            self._in_use_bytes -= buffer.nbytes
+
+            free = self._free[key]
+            if len(free) < self.max_free_per_shape:
+                free.append(buffer)
+
+    def clear(self):
+        """
+        Drop all idle buffers.
+        """
+        with self._lock:
+            self._free.clear()
+
+    def evict(self, nbytes: int) -> int:
+        """
+        Drop idle buffers until at least the given number of bytes has been freed.
+
+        Parameters:
+        - nbytes (int): The number of bytes to free.
+
+        Returns:
+        - int: The number of bytes freed.
+        """
+        freed = 0
+
+        with self._lock:
+            for free in self._free.values():
+                while free and freed < nbytes:
+                    freed += free.pop().nbytes
+
+        return freed
+
+    @property
+    def buffers_in_use(self) -> int:
+        """
+        Get the number of acquired buffers that have not been released yet.
+
+        Returns:
+        - int: The number of buffers in use.
+        """
+        return self._in_use
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the memory held by the pool, including buffers in use.
+
+        Returns:
+        - int: The number of bytes.
+        """
+        with self._lock:
+            return self._in_use_bytes + sum(b.nbytes for free in self._free.values() for b in free)
+
+
+def _weak_evictor(evict: weakref.WeakMethod):
+    def evictor(nbytes: int) -> int:
+        method = evict()
+        return 0 if method is None else method(nbytes)
+
+    return evictor
@@ -1,21 +1,28 @@
 import ctypes
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import Metal
 
+from syphon.types import Region
+from syphon.utils import tracing
+from syphon.utils.memory import track_mtl_texture
+
 
 def create_mtl_texture(device: Any,
                        width: int,
                        height: int,
-                       pixel_format: int = Metal.MTLPixelFormatRGBA8Unorm) -> Any:
+                       pixel_format: int = Metal.MTLPixelFormatRGBA8Unorm,
+                       owner: str = "textures") -> Any:
     """
-    Create a Metal texture with the specified parameters.
+    Create a Metal texture with the specified parameters. The texture is tracked in the memory registry
+    (see `syphon.utils.memory`).
 
     Parameters:
     - device (Any): The Metal device.
     - width (int): The width of the texture.
     - height (int): The height of the texture.
     - pixel_format (int): The pixel format of the texture (default: MTLPixelFormatRGBA8Unorm).
+    - owner (str, optional): The owner the texture is accounted to, e.g. `server:<name>`. Defaults to `textures`.
 
     Returns:
     - Any: The created Metal texture.
@@ -24,65 +31,92 @@ def create_mtl_texture(device: Any,
         pixel_format, width, height, False
     )
 
-    return device.newTextureWithDescriptor_(texture_descriptor)
+    return track_mtl_texture(device.newTextureWithDescriptor_(texture_descriptor), owner)
 
 
-def copy_bytes_to_mtl_texture(data: bytes, texture: Any):
+def copy_bytes_to_mtl_texture(data: Union[bytes, memoryview],
+                              texture: Any,
+                              region: Optional[Region] = None,
+                              bytes_per_row: Optional[int] = None):
     """
     Copy pixel data from a bytes object to a Metal texture.
 
     Parameters:
-    - data (bytes): The pixel data as bytes.
+    - data (Union[bytes, memoryview]): The pixel data as bytes or any other object supporting the buffer protocol.
     - texture (Any): The target Metal texture to copy the pixel data into.
+    - region (Region, optional): The region (x, y, width, height) of the texture to copy into.
+      Defaults to the whole texture.
+    - bytes_per_row (int, optional): The stride of the pixel data in bytes. Defaults to `width * 4` of the region.
     """
-    region = Metal.MTLRegion((0, 0, 0), (texture.width(), texture.height(), 1))
-    bytes_per_row = texture.width() * 4
+    x, y, width, height = (0, 0, texture.width(), texture.height()) if region is None else region
+    mtl_region = Metal.MTLRegion((x, y, 0), (width, height, 1))
+    bytes_per_row = width * 4 if bytes_per_row is None else bytes_per_row
 
     texture.replaceRegion_mipmapLevel_withBytes_bytesPerRow_(
-        region,
+        mtl_region,
         0,  # mipmapLevel
         data,
         bytes_per_row
     )
 
 
-def copy_mtl_texture_to_bytes(texture: Any, buffer: Optional[Any] = None) -> bytes:
+def copy_mtl_texture_to_buffer(texture: Any, buffer: Any, region: Optional[Region] = None):
     """
-    Copy pixel data from a Metal texture to a bytes object.
+    Copy pixel data from a Metal texture into a writable buffer in place.
 
     Parameters:
     - texture (Any): The source Metal texture to copy pixel data from.
-    - buffer (Optional[Any]): The buffer to store the result. If None, a new buffer will be created.
-
-    Returns:
-    - bytes: The resulting pixel data as bytes.
+    - buffer (Any): A writable object supporting the buffer protocol with exactly `width * height * 4` bytes.
+    - region (Region, optional): The region (x, y, width, height) of the texture to copy. Defaults to the whole texture.
 
     Raises:
     - Exception: If the pixel format of the texture is not MTLPixelFormatBGRA8Unorm or MTLPixelFormatRGBA8Unorm.
-    - Exception: If the provided buffer is not big enough.
+    - Exception: If the provided buffer does not have the expected size.
     """
     if (texture.pixelFormat() != Metal.MTLPixelFormatBGRA8Unorm
             and texture.pixelFormat() != Metal.MTLPixelFormatRGBA8Unorm):
         raise Exception("Not correct pixel format (expected MTLPixelFormatBGRA8Unorm or MTLPixelFormatRGBA8Unorm)")
 
-    bytes_per_row = texture.width() * 4
-    bytes_per_image = bytes_per_row * texture.height()
+    x, y, width, height = (0, 0, texture.width(), texture.height()) if region is None else region
+
+    bytes_per_row = width * 4
+    bytes_per_image = bytes_per_row * height
     mipmap_level = 0
     slice_number = 0
-    region = Metal.MTLRegionMake2D(0, 0, texture.width(), texture.height())
+    mtl_region = Metal.MTLRegionMake2D(x, y, width, height)
 
-    if buffer is None:
-        buffer = ctypes.create_string_buffer(bytes_per_image)
+    buffer_size = memoryview(buffer).nbytes
+    if buffer_size != bytes_per_image:
+        raise Exception(f"Buffer is not big enough (expected: {bytes_per_image}, actual: {buffer_size})")
+
+    with tracing.span("readback", "client", width=width, height=height):
+        texture.getBytes_bytesPerRow_bytesPerImage_fromRegion_mipmapLevel_slice_(buffer,
+                                                                                 bytes_per_row,
+                                                                                 bytes_per_image,
+                                                                                 mtl_region,
+                                                                                 mipmap_level,
+                                                                                 slice_number)
+
+
+def copy_mtl_texture_to_bytes(texture: Any, buffer: Optional[Any] = None) -> bytes:
+    """
+    Copy pixel data from a Metal texture to a bytes object.
+
+    Parameters:
+    - texture (Any): The source Metal texture to copy pixel data from.
+    - buffer (Optional[Any]): The buffer to store the result. If None, a new buffer will be created.
+
+    Returns:
+    - bytes: The resulting pixel data as bytes.
 
-    if len(buffer) != bytes_per_image:
-        raise Exception(f"Buffer is not big enough (expected: {bytes_per_image}, actual: {len(buffer)})")
+    Raises:
+    - Exception: If the pixel format of the texture is not MTLPixelFormatBGRA8Unorm or MTLPixelFormatRGBA8Unorm.
+    - Exception: If the provided buffer is not big enough.
+    """
+    if buffer is None:
+        buffer = ctypes.create_string_buffer(texture.width() * texture.height() * 4)
 
-    texture.getBytes_bytesPerRow_bytesPerImage_fromRegion_mipmapLevel_slice_(buffer,
-                                                                             bytes_per_row,
-                                                                             bytes_per_image,
-                                                                             region,
-                                                                             mipmap_level,
-                                                                             slice_number)
+    copy_mtl_texture_to_buffer(texture, buffer)
 
     raw_bytes = bytes(buffer.raw)
     return raw_bytes
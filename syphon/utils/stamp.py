@@ -0,0 +1,85 @@
+import struct
+from typing import Optional, Tuple
+
+import numpy as np
+
+STAMP_MAGIC = 0x5359
+"""
+Marker at the start of every frame stamp, used to detect if a frame carries a stamp at all.
+"""
+
+_STAMP_STRUCT = struct.Struct(">HQQ")
+
+STAMP_WIDTH = _STAMP_STRUCT.size * 8
+"""
+The number of pixels of the stamp strip, one pixel per bit.
+"""
+
+
+def encode_frame_stamp(image: np.ndarray, sequence: int, timestamp_ns: int):
+    """
+    Embed a machine-readable sequence number and timestamp in the top-left pixel strip of an image.
+
+    Every bit of the stamp is written as one black or white opaque pixel in the first row, so it survives
+    any lossless texture transport.
+
+    Parameters:
+    - image (np.ndarray): The uint8 image of shape (height, width, 4) to stamp in place.
+    - sequence (int): The sequence number of the frame.
+    - timestamp_ns (int): The timestamp of the frame in nanoseconds (e.g. `time.monotonic_ns()`).
+
+    Raises:
+    - AssertionError: If the image has an incorrect shape or is narrower than the stamp.
+    """
+    assert len(image.shape) == 3 and image.shape[2] == 4, "Image has to be of shape (m, n, 4)"
+    assert image.shape[1] >= STAMP_WIDTH, f"Image has to be at least {STAMP_WIDTH} pixels wide"
+
+    data = _STAMP_STRUCT.pack(STAMP_MAGIC, sequence & 0xFFFFFFFFFFFFFFFF, timestamp_ns & 0xFFFFFFFFFFFFFFFF)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+    strip = image[0, :STAMP_WIDTH]
+    strip[:, :3] = (bits * 255)[:, np.newaxis]
+    strip[:, 3] = 255
+
+
+def decode_frame_stamp(image: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    Read the stamp written by `encode_frame_stamp()` from an image.
+
+    Both the first and the last row are checked, so stamps of frames published flipped are found as well.
+
+    Parameters:
+    - image (np.ndarray): The image of shape (height, width, 4), or just the stamp strip of shape (1, width, 4).
+
+    Returns:
+    - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None if there is no stamp.
+    """
+    if image.shape[1] < STAMP_WIDTH:
+        return None
+
+    for row in (0, image.shape[0] - 1):
+        stamp = decode_stamp_strip(image[row, :STAMP_WIDTH])
+        if stamp is not None:
+            return stamp
+
+    return None
+
+
+def decode_stamp_strip(strip: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    Decode a single stamp strip of shape (STAMP_WIDTH, 4).
+
+    Parameters:
+    - strip (np.ndarray): The pixels of the stamp strip.
+
+    Returns:
+    - Optional[Tuple[int, int]]: The sequence number and timestamp in nanoseconds, or None if there is no stamp.
+    """
+    # majority vote over the color channels, independent of the channel order (RGBA or BGRA)
+    bits = np.count_nonzero(strip[:, :3] > 127, axis=1) >= 2
+    magic, sequence, timestamp_ns = _STAMP_STRUCT.unpack(np.packbits(bits).tobytes())
+
+    if magic != STAMP_MAGIC:
+        return None
+
+    return sequence, timestamp_ns
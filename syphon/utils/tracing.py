@@ -0,0 +1,324 @@
+import collections
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, IO, List, NamedTuple, Optional, Sequence
+
+
+class TraceEvent(NamedTuple):
+    """
+    A completed span.
+
+    Attributes:
+    - name (str): The name of the span.
+    - category (str): The category of the span, e.g. `server` or `client`.
+    - start_us (float): The start time in microseconds (`time.perf_counter_ns()` based).
+    - duration_us (float): The duration in microseconds.
+    - thread_id (int): The id of the thread the span was recorded on.
+    - args (Optional[Dict[str, Any]]): Additional arguments, e.g. the name of the stream.
+    """
+    name: str
+    category: str
+    start_us: float
+    duration_us: float
+    thread_id: int
+    args: Optional[Dict[str, Any]]
+
+    def to_chrome(self, pid: int) -> Dict[str, Any]:
+        """
+        Convert the event into a Chrome trace-event ("complete" event).
+
+        Parameters:
+        - pid (int): The process id of the event.
+
+        Returns:
+        - Dict[str, Any]: The trace-event.
+        """
+        event = {"name": self.name, "cat": self.category, "ph": "X", "ts": self.start_us, "dur": self.duration_us,
+                 "pid": pid, "tid": self.thread_id}
+        if self.args:
+            event["args"] = self.args
+        return event
+
+
+TraceSink = Callable[[Sequence[TraceEvent]], None]
+
+
+class ChromeTraceSink:
+    """
+    Trace sink writing a Chrome trace-event JSON file, which can be loaded into Perfetto or `chrome://tracing`.
+
+    Attributes:
+    - path (str): The path of the trace file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a ChromeTraceSink.
+
+        Parameters:
+        - path (str): The path of the trace file.
+        """
+        self.path = path
+
+        self._pid = os.getpid()
+        self._file: Optional[IO[str]] = open(path, "w")
+        self._file.write("[\n")
+        self._first = True
+        self._thread_names: Dict[int, str] = {}
+
+    def __call__(self, events: Sequence[TraceEvent]):
+        if self._file is None:
+            return
+
+        records: List[Dict[str, Any]] = []
+        for event in events:
+            if event.thread_id not in self._thread_names:
+                name = _thread_name(event.thread_id)
+                self._thread_names[event.thread_id] = name
+                records.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": event.thread_id,
+                                "args": {"name": name}})
+            records.append(event.to_chrome(self._pid))
+
+        for record in records:
+            if not self._first:
+                self._file.write(",\n")
+            self._file.write(json.dumps(record))
+            self._first = False
+
+    def close(self):
+        """
+        Finish and close the trace file.
+        """
+        if self._file is None:
+            return
+
+        self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+
+class Tracer:
+    """
+    Records spans into a ring buffer and hands them to the sinks from a background thread.
+
+    Recording a span only appends a tuple to a bounded deque, so the hot path neither allocates buffers nor
+    serializes. If the sinks fall behind, the oldest events are overwritten and counted as dropped.
+
+    Attributes:
+    - capacity (int): The maximum number of buffered events.
+    - sinks (List[TraceSink]): The sinks the events are flushed to.
+    - flush_interval (float): The interval in seconds at which the buffer is flushed to the sinks.
+    """
+
+    def __init__(self, capacity: int = 65536, sinks: Sequence[TraceSink] = (), flush_interval: float = 0.25):
+        """
+        Initialize a Tracer.
+
+        Parameters:
+        - capacity (int, optional): The maximum number of buffered events. Defaults to 65536.
+        - sinks (Sequence[TraceSink], optional): The sinks the events are flushed to. Without sinks, the events
+          stay in the ring buffer and can be read with `events()`.
+        - flush_interval (float, optional): The flush interval in seconds. Defaults to 0.25.
+        """
+        self.capacity = capacity
+        self.sinks = list(sinks)
+        self.flush_interval = flush_interval
+
+        self._events: Deque[TraceEvent] = collections.deque(maxlen=capacity)
+        self._recorded = 0
+        self._flushed = 0
+        self._flush_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if self.sinks:
+            self._thread = threading.Thread(target=self._run, name="SyphonTracer", daemon=True)
+            self._thread.start()
+
+    @property
+    def dropped_events(self) -> int:
+        """
+        Get the number of events overwritten before they were flushed.
+
+        Returns:
+        - int: The number of dropped events.
+        """
+        if not self.sinks:
+            return max(0, self._recorded - self.capacity)
+        return max(0, self._recorded - self._flushed - len(self._events))
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]] = None):
+        """
+        Record a completed span.
+
+        Parameters:
+        - name (str): The name of the span.
+        - category (str): The category of the span.
+        - start_ns (int): The start time (`time.perf_counter_ns()`).
+        - end_ns (int): The end time (`time.perf_counter_ns()`).
+        - args (Dict[str, Any], optional): Additional arguments.
+        """
+        self._events.append(TraceEvent(name, category, start_ns / 1000.0, (end_ns - start_ns) / 1000.0,
+                                       threading.get_ident(), args))
+        self._recorded += 1
+
+    def events(self) -> List[TraceEvent]:
+        """
+        Get a snapshot of the buffered events.
+
+        Returns:
+        - List[TraceEvent]: The buffered events.
+        """
+        return list(self._events)
+
+    def flush(self):
+        """
+        Hand all buffered events to the sinks.
+        """
+        with self._flush_lock:
+            events = []
+            while True:
+                try:
+                    events.append(self._events.popleft())
+                except IndexError:
+                    break
+
+            if not events:
+                return
+
+            self._flushed += len(events)
+            for sink in self.sinks:
+                sink(events)
+
+    def save_chrome_trace(self, path: str):
+        """
+        Write the buffered events to a Chrome trace-event JSON file.
+
+        Parameters:
+        - path (str): The path of the trace file.
+        """
+        sink = ChromeTraceSink(path)
+        sink(self.events())
+        sink.close()
+
+    def close(self):
+        """
+        Stop the flush thread, flush the remaining events and close the sinks.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_category", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._tracer.record(self._name, self._category, self._start, time.perf_counter_ns(), self._args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional[Tracer] = None
+
+
+def enable_tracing(capacity: int = 65536,
+                   sinks: Sequence[TraceSink] = (),
+                   flush_interval: float = 0.25) -> Tracer:
+    """
+    Enable tracing of the publish and receive paths. A previously enabled tracer is closed.
+
+    Parameters:
+    - capacity (int, optional): The maximum number of buffered events. Defaults to 65536.
+    - sinks (Sequence[TraceSink], optional): The sinks the events are flushed to, e.g. a `ChromeTraceSink`.
+    - flush_interval (float, optional): The flush interval in seconds. Defaults to 0.25.
+
+    Returns:
+    - Tracer: The active tracer.
+    """
+    global _tracer
+    disable_tracing()
+
+    _tracer = Tracer(capacity, sinks, flush_interval)
+    return _tracer
+
+
+def disable_tracing():
+    """
+    Disable tracing and close the active tracer, which flushes the remaining events to its sinks.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+
+    if tracer is not None:
+        tracer.close()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the active tracer.
+
+    Returns:
+    - Optional[Tracer]: The active tracer, or None if tracing is disabled.
+    """
+    return _tracer
+
+
+def span(name: str, category: str = "syphon", **args: Any):
+    """
+    Create a context manager recording a span. If tracing is disabled, a shared no-op context manager is returned.
+
+    Parameters:
+    - name (str): The name of the span.
+    - category (str, optional): The category of the span. Defaults to `syphon`.
+    - **args: Additional arguments, e.g. the name of the stream.
+
+    Returns:
+    - A context manager recording the span.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args or None)
+
+
+def _thread_name(thread_id: int) -> str:
+    for thread in threading.enumerate():
+        if thread.ident == thread_id:
+            return thread.name
+    return f"Thread {thread_id}"
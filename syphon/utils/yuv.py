@@ -0,0 +1,330 @@
+import threading
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from syphon.utils.memory import MemoryKind, get_memory_registry
+
+
+class YUVStandard(Enum):
+    """
+    Enum representing the colour matrix of YUV (Y'CbCr) images as the (Kr, Kb) luma coefficients.
+
+    Enum Values:
+    - BT601: ITU-R BT.601, used by SD video.
+    - BT709: ITU-R BT.709, used by HD video.
+    """
+    BT601 = (0.299, 0.114)
+    BT709 = (0.2126, 0.0722)
+
+
+def yuv_to_rgb_coefficients(standard: YUVStandard = YUVStandard.BT709,
+                            full_range: bool = False) -> Tuple[float, float, np.ndarray]:
+    """
+    Get the coefficients to convert 8-bit YUV values to RGB: `rgb = (y - y_offset) * y_scale + matrix @ (cb, cr)`,
+    with cb and cr centered around 0.
+
+    Parameters:
+    - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+    - full_range (bool, optional): If True, all 8-bit values are used (JPEG), otherwise the limited video range
+      (16-235 for luma, 16-240 for chroma). Defaults to False.
+
+    Returns:
+    - Tuple[float, float, np.ndarray]: The luma offset, the luma scale and the (3, 2) chroma matrix for RGB.
+    """
+    kr, kb = standard.value
+    kg = 1.0 - kr - kb
+
+    matrix = np.array([
+        [0.0, 2.0 * (1.0 - kr)],
+        [-2.0 * kb * (1.0 - kb) / kg, -2.0 * kr * (1.0 - kr) / kg],
+        [2.0 * (1.0 - kb), 0.0],
+    ], dtype=np.float32)
+
+    if full_range:
+        return 0.0, 1.0, matrix
+
+    return 16.0, 255.0 / 219.0, matrix * np.float32(255.0 / 224.0)
+
+
+def split_nv12(frame: np.ndarray, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split a contiguous NV12 frame into its planes without copying.
+
+    Parameters:
+    - frame (np.ndarray): The uint8 frame with `width * height * 3 // 2` elements.
+    - width (int): The width of the image.
+    - height (int): The height of the image.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray]: The luma plane (height, width) and the interleaved chroma plane
+      (height / 2, width / 2, 2).
+    """
+    frame = frame.reshape(-1)
+    luma_size = width * height
+
+    y = frame[:luma_size].reshape(height, width)
+    uv = frame[luma_size:luma_size + luma_size // 2].reshape(height // 2, width // 2, 2)
+    return y, uv
+
+
+def split_i420(frame: np.ndarray, width: int, height: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split a contiguous I420 frame into its planes without copying.
+
+    Parameters:
+    - frame (np.ndarray): The uint8 frame with `width * height * 3 // 2` elements.
+    - width (int): The width of the image.
+    - height (int): The height of the image.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray, np.ndarray]: The luma plane (height, width) and the chroma planes
+      (height / 2, width / 2).
+    """
+    frame = frame.reshape(-1)
+    luma_size = width * height
+    chroma_size = luma_size // 4
+
+    y = frame[:luma_size].reshape(height, width)
+    u = frame[luma_size:luma_size + chroma_size].reshape(height // 2, width // 2)
+    v = frame[luma_size + chroma_size:luma_size + 2 * chroma_size].reshape(height // 2, width // 2)
+    return y, u, v
+
+
+class YUVConverter:
+    """
+    Vectorized YUV to RGBA converter, which keeps its intermediate buffers between calls.
+
+    The chroma contribution is computed once per chroma sample and broadcast over the luma rows it covers,
+    so chroma is never upsampled into a full-size array. The result is written into a (reusable) RGBA output.
+
+    Attributes:
+    - standard (YUVStandard): The colour matrix.
+    - full_range (bool): If True, the YUV values use the full 8-bit range, otherwise the limited video range.
+    """
+
+    def __init__(self, standard: YUVStandard = YUVStandard.BT709, full_range: bool = False):
+        """
+        Initialize a YUVConverter.
+
+        Parameters:
+        - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+        - full_range (bool, optional): If True, the full 8-bit range is used. Defaults to False (video range).
+        """
+        self.standard = standard
+        self.full_range = full_range
+
+        self._scratch: Dict[Tuple[str, Tuple[int, ...]], np.ndarray] = {}
+
+    def nv12_to_rgba(self, y: np.ndarray, uv: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert an NV12 image (4:2:0, interleaved chroma) to RGBA.
+
+        Parameters:
+        - y (np.ndarray): The uint8 luma plane of shape (height, width).
+        - uv (np.ndarray): The uint8 chroma plane of shape (height / 2, width / 2, 2) or (height / 2, width).
+        - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+
+        Returns:
+        - np.ndarray: The RGBA image.
+        """
+        height, width = y.shape
+        uv = uv.reshape(height // 2, width // 2, 2)
+        return self._convert(y, uv[..., 0], uv[..., 1], 2, 2, out)
+
+    def i420_to_rgba(self,
+                     y: np.ndarray,
+                     u: np.ndarray,
+                     v: np.ndarray,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert an I420 image (4:2:0, planar chroma) to RGBA.
+
+        Parameters:
+        - y (np.ndarray): The uint8 luma plane of shape (height, width).
+        - u (np.ndarray): The uint8 Cb plane of shape (height / 2, width / 2).
+        - v (np.ndarray): The uint8 Cr plane of shape (height / 2, width / 2).
+        - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+
+        Returns:
+        - np.ndarray: The RGBA image.
+        """
+        return self._convert(y, u, v, 2, 2, out)
+
+    def uyvy_to_rgba(self, data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert an UYVY image (4:2:2, packed as U Y0 V Y1) to RGBA.
+
+        Parameters:
+        - data (np.ndarray): The uint8 image of shape (height, width * 2) or (height, width / 2, 4).
+        - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+
+        Returns:
+        - np.ndarray: The RGBA image.
+        """
+        height = data.shape[0]
+        packed = data.reshape(height, -1, 4)
+        return self._convert(packed[..., 1::2], packed[..., 0], packed[..., 2], 1, 2, out)
+
+    def clear(self):
+        """
+        Release the intermediate buffers.
+        """
+        self._scratch.clear()
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        key = (name, shape)
+        buffer = self._scratch.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.float32)
+            get_memory_registry().track(buffer, buffer.nbytes, "yuv", MemoryKind.Buffer, "scratch")
+            self._scratch[key] = buffer
+        return buffer
+
+    def _convert(self,
+                 y: np.ndarray,
+                 u: np.ndarray,
+                 v: np.ndarray,
+                 sub_y: int,
+                 sub_x: int,
+                 out: Optional[np.ndarray]) -> np.ndarray:
+        chroma_height, chroma_width = u.shape
+        height, width = chroma_height * sub_y, chroma_width * sub_x
+
+        assert u.shape == v.shape, "Chroma planes have to be of the same shape"
+        assert y.size == height * width, f"Luma plane has to contain {height}x{width} samples"
+
+        if out is None:
+            out = np.empty((height, width, 4), dtype=np.uint8)
+
+        assert out.shape == (height, width, 4), f"Output array has to be of shape {(height, width, 4)}"
+        assert out.dtype == np.uint8, "Output array has to be of type uint8"
+
+        y_offset, y_scale, matrix = yuv_to_rgb_coefficients(self.standard, self.full_range)
+
+        # luma and output viewed as groups of the rows covered by one chroma row
+        rows_shape = (chroma_height, sub_y, width)
+        luma = self._buffer("luma", rows_shape)
+        np.multiply(y.reshape(rows_shape), np.float32(y_scale), out=luma)
+        # + 0.5 rounds the truncating cast to uint8 below
+        np.subtract(luma, np.float32(y_offset * y_scale - 0.5), out=luma)
+
+        cb = self._buffer("cb", u.shape)
+        cr = self._buffer("cr", v.shape)
+        np.subtract(u, np.float32(128.0), out=cb)
+        np.subtract(v, np.float32(128.0), out=cr)
+
+        chroma = self._buffer("chroma", u.shape)
+        channel = self._buffer("channel", rows_shape)
+        out_rows = out.reshape(chroma_height, sub_y, width, 4)
+
+        # chroma is only upsampled horizontally, the rows are broadcast along a contiguous axis
+        upsampled = self._buffer("upsampled", (chroma_height, width))
+        upsampled_samples = upsampled.reshape(chroma_height, chroma_width, sub_x)
+
+        for c in range(3):
+            cb_factor, cr_factor = matrix[c]
+
+            if cb_factor == 0.0:
+                np.multiply(cr, cr_factor, out=chroma)
+            elif cr_factor == 0.0:
+                np.multiply(cb, cb_factor, out=chroma)
+            else:
+                np.multiply(cb, cb_factor, out=chroma)
+                chroma += cr * cr_factor
+
+            np.copyto(upsampled_samples, chroma[..., None])
+            np.add(luma, upsampled[:, None, :], out=channel)
+            np.clip(channel, 0.0, 255.0, out=channel)
+            out_rows[..., c] = channel
+
+        out[..., 3] = 255
+        return out
+
+
+def nv12_to_rgba(y: np.ndarray,
+                 uv: np.ndarray,
+                 out: Optional[np.ndarray] = None,
+                 standard: YUVStandard = YUVStandard.BT709,
+                 full_range: bool = False) -> np.ndarray:
+    """
+    Convert an NV12 image (4:2:0, interleaved chroma) to RGBA.
+
+    Parameters:
+    - y (np.ndarray): The uint8 luma plane of shape (height, width).
+    - uv (np.ndarray): The uint8 chroma plane of shape (height / 2, width / 2, 2) or (height / 2, width).
+    - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+    - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+    - full_range (bool, optional): If True, the full 8-bit range is used. Defaults to False (video range).
+
+    Returns:
+    - np.ndarray: The RGBA image.
+    """
+    return _cached_converter(standard, full_range).nv12_to_rgba(y, uv, out)
+
+
+def i420_to_rgba(y: np.ndarray,
+                 u: np.ndarray,
+                 v: np.ndarray,
+                 out: Optional[np.ndarray] = None,
+                 standard: YUVStandard = YUVStandard.BT709,
+                 full_range: bool = False) -> np.ndarray:
+    """
+    Convert an I420 image (4:2:0, planar chroma) to RGBA.
+
+    Parameters:
+    - y (np.ndarray): The uint8 luma plane of shape (height, width).
+    - u (np.ndarray): The uint8 Cb plane of shape (height / 2, width / 2).
+    - v (np.ndarray): The uint8 Cr plane of shape (height / 2, width / 2).
+    - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+    - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+    - full_range (bool, optional): If True, the full 8-bit range is used. Defaults to False (video range).
+
+    Returns:
+    - np.ndarray: The RGBA image.
+    """
+    return _cached_converter(standard, full_range).i420_to_rgba(y, u, v, out)
+
+
+def uyvy_to_rgba(data: np.ndarray,
+                 out: Optional[np.ndarray] = None,
+                 standard: YUVStandard = YUVStandard.BT709,
+                 full_range: bool = False) -> np.ndarray:
+    """
+    Convert an UYVY image (4:2:2, packed as U Y0 V Y1) to RGBA.
+
+    Parameters:
+    - data (np.ndarray): The uint8 image of shape (height, width * 2) or (height, width / 2, 4).
+    - out (np.ndarray, optional): The uint8 output of shape (height, width, 4). If None, a new array is allocated.
+    - standard (YUVStandard, optional): The colour matrix. Defaults to BT709.
+    - full_range (bool, optional): If True, the full 8-bit range is used. Defaults to False (video range).
+
+    Returns:
+    - np.ndarray: The RGBA image.
+    """
+    return _cached_converter(standard, full_range).uyvy_to_rgba(data, out)
+
+
+_converters = threading.local()
+
+
+def _cached_converter(standard: YUVStandard, full_range: bool) -> YUVConverter:
+    # one converter per thread and colour matrix, so the scratch buffers are reused but never shared across threads
+    cache = getattr(_converters, "cache", None)
+    if cache is None:
+        cache = _converters.cache = {}
+
+    converter = cache.get((standard, full_range))
+    if converter is None:
+        converter = cache[(standard, full_range)] = YUVConverter(standard, full_range)
+    return converter
+
+
+def clear_cached_converters():
+    """
+    Release the intermediate buffers of the converters used by the module-level conversion functions
+    of the calling thread.
+    """
+    for converter in getattr(_converters, "cache", {}).values():
+        converter.clear()
@@ -0,0 +1,106 @@
+import pytest
+
+from syphon.adaptive import ResolutionController
+
+BUDGET = 0.010
+
+
+def create_controller(**kwargs) -> ResolutionController:
+    return ResolutionController(BUDGET, scales=(1.0, 0.5), smoothing=1.0, **kwargs)
+
+
+def test_steps_down_after_down_frames():
+    controller = create_controller(down_frames=3)
+
+    assert controller.update(0.020) == 1.0
+    assert controller.update(0.020) == 1.0
+    assert controller.update(0.020) == 0.5
+
+    stats = controller.stats
+    assert stats.level == 1
+    assert stats.step_downs == 1
+    assert stats.frames == 3
+
+
+def test_single_slow_frame_does_not_step_down():
+    controller = create_controller(down_frames=3)
+
+    for _ in range(10):
+        controller.update(0.020)
+        controller.update(0.005)
+
+    assert controller.scale == 1.0
+    assert controller.stats.step_downs == 0
+
+
+def test_does_not_step_below_lowest_scale():
+    controller = create_controller(down_frames=1)
+
+    for _ in range(5):
+        controller.update(0.050)
+
+    assert controller.scale == 0.5
+    assert controller.stats.step_downs == 1
+
+
+def test_step_up_hysteresis():
+    controller = create_controller(down_frames=1, up_frames=5, headroom=0.75)
+    controller.update(0.020)
+    assert controller.scale == 0.5
+
+    # at half scale, 2.5 ms predicts 10 ms at full scale, which is within budget but not within the headroom
+    for _ in range(20):
+        controller.update(0.0025)
+    assert controller.scale == 0.5
+
+    # 1.5 ms predicts 6 ms, the resolution is only increased after up_frames such frames
+    for _ in range(4):
+        assert controller.update(0.0015) == 0.5
+    assert controller.update(0.0015) == 1.0
+    assert controller.stats.step_ups == 1
+
+
+def test_step_up_counter_restarts_without_headroom():
+    controller = create_controller(down_frames=1, up_frames=3)
+    controller.update(0.020)
+
+    controller.update(0.0015)
+    controller.update(0.0015)
+    controller.update(0.0025)
+    controller.update(0.0015)
+    controller.update(0.0015)
+    assert controller.scale == 0.5
+
+    controller.update(0.0015)
+    assert controller.scale == 1.0
+
+
+def test_reset():
+    controller = create_controller(down_frames=1)
+    controller.update(0.020)
+    assert controller.scale == 0.5
+
+    controller.reset()
+
+    stats = controller.stats
+    assert controller.scale == 1.0
+    assert stats.frames == 0
+    assert stats.step_downs == 0
+    assert stats.frame_time == 0.0
+    assert stats.budget == BUDGET
+
+
+def test_scaled_size():
+    controller = create_controller(down_frames=1)
+    assert controller.scaled_size(1920, 1080) == (1920, 1080)
+
+    controller.update(0.020)
+    assert controller.scaled_size(1920, 1080) == (960, 540)
+    assert controller.scaled_size(1, 1) == (1, 1)
+
+
+@pytest.mark.parametrize("budget, scales", [(0.0, (1.0, 0.5)), (BUDGET, (0.5, 1.0)), (BUDGET, ()),
+                                            (BUDGET, (1.0, 0.0))])
+def test_invalid_parameters(budget, scales):
+    with pytest.raises(ValueError):
+        ResolutionController(budget, scales)
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from syphon.atlas import ImageAtlas, ShelfPacker, decode_atlas_layout, slice_tile, slice_tiles
+
+
+def _overlaps(a, b) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+@pytest.mark.parametrize("padding", [0, 2])
+def test_packed_regions_do_not_overlap(padding):
+    rng = random.Random(11)
+    packer = ShelfPacker(512, 512, padding)
+
+    regions = []
+    for _ in range(300):
+        width, height = rng.randint(8, 64), rng.randint(8, 64)
+        region = packer.pack(width, height)
+        if region is None:
+            continue
+
+        x, y, w, h = region
+        assert (w, h) == (width, height)
+        assert x >= 0 and y >= 0 and x + w <= 512 and y + h <= 512
+        regions.append(region)
+
+    assert len(regions) > 50
+    for i, a in enumerate(regions):
+        padded = (a[0], a[1], a[2] + padding, a[3] + padding)
+        for b in regions[i + 1:]:
+            assert not _overlaps(padded, b)
+
+
+def test_full_packer_returns_none():
+    packer = ShelfPacker(64, 64)
+    assert packer.pack(128, 8) is None
+
+    for _ in range(4):
+        assert packer.pack(64, 16) is not None
+    assert packer.pack(1, 1) is None
+
+    packer.reset()
+    assert packer.pack(64, 64) == (0, 0, 64, 64)
+
+
+def test_full_atlas_raises():
+    atlas = ImageAtlas(64, 32)
+    atlas.add_tile("a", 64, 32)
+
+    with pytest.raises(ValueError):
+        atlas.add_tile("b", 1, 1)
+
+    with pytest.raises(KeyError):
+        atlas.add_tile("a", 1, 1)
+
+    assert list(atlas.tiles) == ["a"]
+
+
+def test_only_changed_tiles_are_dirty():
+    atlas = ImageAtlas(256, 256)
+    for key in "abcd":
+        atlas.add_tile(key, 32, 32)
+    atlas.clear_dirty()
+    assert atlas.dirty_region is None
+
+    atlas.update("b", np.ones((32, 32, 4), dtype=np.uint8))
+    assert atlas.dirty_region == atlas.tiles["b"].region
+
+    atlas.update("d", np.ones((32, 32, 4), dtype=np.uint8))
+    b, d = atlas.tiles["b"].region, atlas.tiles["d"].region
+    assert atlas.dirty_region == (b[0], b[1], d[0] + d[2] - b[0], 32)
+
+    atlas.clear_dirty()
+    atlas.mark_dirty("a")
+    assert atlas.dirty_region == atlas.tiles["a"].region
+
+    atlas.mark_dirty()
+    assert atlas.dirty_region == (0, 0, 256, 256)
+
+
+def test_layout_round_trip():
+    rng = np.random.default_rng(5)
+    atlas = ImageAtlas(128, 128, padding=1)
+
+    images = {}
+    for i, (width, height) in enumerate([(20, 10), (30, 30), (8, 40), (50, 12)]):
+        images[f"feed {i}"] = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+        atlas.update(f"feed {i}", images[f"feed {i}"])
+
+    layout = decode_atlas_layout(atlas.layout_json())
+    assert layout == atlas.layout
+
+    tiles = slice_tiles(atlas.image, layout)
+    assert tiles.keys() == images.keys()
+    for key, image in images.items():
+        assert np.array_equal(tiles[key], image)
+        assert np.shares_memory(tiles[key], atlas.image)
+
+    # a vertically flipped atlas is sliced into upright tiles
+    flipped = atlas.image[::-1].copy()
+    for key, image in images.items():
+        assert np.array_equal(slice_tile(flipped, layout[key], is_flipped=True), image)
@@ -0,0 +1,38 @@
+from syphon.base import BaseSyphonServer
+
+
+class RecordingServer(BaseSyphonServer):
+    """
+    Third-party style subclass implementing only the abstract methods, without overriding `prepare()`.
+    """
+
+    def __init__(self):
+        super().__init__("Recording")
+        self.published = []
+
+    def publish_frame_texture(self, texture, region=None, size=None, is_flipped=False, **kwargs):
+        self.published.append((texture, region, size, is_flipped, kwargs))
+
+    def publish(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @property
+    def has_clients(self) -> bool:
+        return False
+
+    def _get_texture_size(self, texture):
+        return 4, 4
+
+
+def test_default_prepare_publishes_texture():
+    server = RecordingServer()
+    texture = object()
+
+    handle = server.prepare(texture, region=(0, 0, 2, 2), is_flipped=True, command_buffer="buffer")
+    handle.publish()
+    handle.publish()
+
+    assert server.published == [(texture, (0, 0, 2, 2), None, True, {"command_buffer": "buffer"})] * 2
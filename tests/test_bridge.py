@@ -0,0 +1,152 @@
+import socket
+import threading
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+from syphon.bridge import FrameCodec, FrameReceiver, FrameSender, LatestFrameSink, ZlibCodec, _HEADER
+
+
+def _image(value: int, shape=(48, 64, 4)) -> np.ndarray:
+    image = np.zeros(shape, dtype=np.uint8)
+    image[..., 0] = value
+    image[..., 1] = np.arange(shape[1], dtype=np.uint8)
+    return image
+
+
+@pytest.fixture
+def receiver_factory():
+    receivers = []
+
+    def create(sink, codec=None):
+        receiver = FrameReceiver(("127.0.0.1", 0), sink, codec)
+        receiver.start()
+        receivers.append(receiver)
+        return receiver
+
+    yield create
+
+    for receiver in receivers:
+        receiver.close()
+
+
+@pytest.mark.parametrize("codec_type", [FrameCodec, ZlibCodec])
+@pytest.mark.parametrize("threaded", [True, False])
+def test_round_trip(receiver_factory, codec_type, threaded):
+    sink = LatestFrameSink()
+    receiver = receiver_factory(sink, codec_type())
+    sender = FrameSender(receiver.address, codec_type(), threaded=threaded)
+    try:
+        for i in range(3):
+            image = _image(i)
+            sender.send(image, timestamp=float(i))
+            sender.flush()
+
+            received = sink.wait(after=i - 1, timeout=5.0)
+            assert received is not None
+            frame, info = received
+            assert np.array_equal(frame, image)
+            assert (info.sequence, info.timestamp) == (i, float(i))
+            assert (info.width, info.height, info.channels) == (64, 48, 4)
+    finally:
+        sender.close()
+
+    assert receiver.errors == 0
+
+
+def test_non_uint8_frames_are_rejected(receiver_factory):
+    receiver = receiver_factory(LatestFrameSink())
+    sender = FrameSender(receiver.address)
+    try:
+        with pytest.raises(AssertionError):
+            sender.send(np.zeros((4, 4, 4), dtype=np.float32))
+    finally:
+        sender.close()
+
+
+def test_busy_sender_drops_frames(receiver_factory):
+    gate = threading.Event()
+    sink = LatestFrameSink()
+
+    def blocking_sink(image, info):
+        gate.wait(5.0)
+        sink(image, info)
+
+    receiver = receiver_factory(blocking_sink)
+    sender = FrameSender(receiver.address)
+    count = 50
+    try:
+        # large frames fill the socket buffers while the sink blocks
+        for i in range(count):
+            sender.send(_image(i, (512, 512, 4)))
+        gate.set()
+        sender.flush(timeout=10.0)
+
+        assert sender.frames_dropped > 0
+        assert sender.frames_sent + sender.frames_dropped == count
+
+        received = sink.wait(after=sender.frames_sent - 2, timeout=5.0)
+        assert received is not None
+        assert received[0][0, 0, 0] == count - 1
+    finally:
+        gate.set()
+        sender.close()
+
+
+def test_bad_magic_drops_connection(receiver_factory):
+    sink = LatestFrameSink()
+    receiver = receiver_factory(sink)
+
+    with socket.create_connection(receiver.address) as connection:
+        connection.sendall(_HEADER.pack(b"NOPE", 0, 0.0, 4, 4, 4, 0, 64))
+        # the receiver closes the connection after the invalid header
+        connection.settimeout(5.0)
+        assert connection.recv(1) == b""
+
+    assert receiver.errors == 1
+    assert isinstance(receiver.last_error, ConnectionError)
+
+    # the receiver accepts the next connection
+    sender = FrameSender(receiver.address)
+    try:
+        sender.send(_image(7))
+        sender.flush()
+        assert sink.wait(timeout=5.0) is not None
+    finally:
+        sender.close()
+
+
+def test_codec_and_sink_errors_skip_frames(receiver_factory):
+    calls = []
+
+    def failing_sink(image, info):
+        calls.append(info.sequence)
+        if info.sequence == 1:
+            raise ValueError("sink failed")
+
+    class BrokenCodec(ZlibCodec):
+        def decode(self, payload, out):
+            if not calls:
+                calls.append(None)
+                raise zlib.error("corrupt")
+            super().decode(payload, out)
+
+    receiver = receiver_factory(failing_sink, BrokenCodec())
+    sender = FrameSender(receiver.address, ZlibCodec(), threaded=False)
+    try:
+        for i in range(3):
+            sender.send(_image(i))
+    finally:
+        sender.close()
+
+    for _ in range(500):
+        if len(calls) == 3 and receiver.errors == 2:
+            break
+        time.sleep(0.01)
+
+    # the first frame fails to decode, the second fails in the sink, the third is delivered
+    assert calls == [None, 1, 2]
+    assert receiver.errors == 2
+    assert isinstance(receiver.last_error, ValueError)
@@ -0,0 +1,158 @@
+import pytest
+
+client_manager = pytest.importorskip("syphon.client_manager")
+
+from syphon.client_manager import ClientManager, FeedState
+from syphon.loopback import SyphonLoopbackClient, SyphonLoopbackServer, loopback_servers
+
+
+class LoopbackDirectory:
+    def __init__(self):
+        self.observers = {}
+
+    @property
+    def servers(self):
+        return loopback_servers()
+
+    def add_observer(self, notification, handler):
+        token = object()
+        self.observers[token] = handler
+        return token
+
+    def remove_observer(self, token):
+        del self.observers[token]
+
+
+class FlakyFactory:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, description, device):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("server not ready")
+        return SyphonLoopbackClient(description)
+
+
+def test_failed_feed_is_retried(monkeypatch):
+    monkeypatch.setattr(client_manager, "_MIN_RETRY_INTERVAL", 0.0)
+
+    server = SyphonLoopbackServer("Flaky")
+    factory = FlakyFactory(failures=2)
+    manager = ClientManager(directory=LoopbackDirectory(), device=object(), client_factory=factory)
+    try:
+        # the reconcile attempt and the immediate retry both fail
+        manager.update()
+        feed = manager.status(server.description.uuid)
+        assert feed.state == FeedState.Failed
+        assert feed.retries == 2
+
+        manager.update()
+        feed = manager.status(server.description.uuid)
+        assert factory.calls == 3
+        assert feed.state == FeedState.Connected
+        assert feed.errors == 2
+        assert feed.retries == 0
+        assert manager.client(server.description.uuid) is not None
+    finally:
+        manager.stop()
+        server.stop()
+
+
+def test_failed_feed_waits_for_back_off():
+    server = SyphonLoopbackServer("Flaky")
+    factory = FlakyFactory(failures=1)
+    manager = ClientManager(directory=LoopbackDirectory(), device=object(), client_factory=factory)
+    try:
+        manager.update()
+        manager.update()
+        assert factory.calls == 1
+        assert manager.status(server.description.uuid).state == FeedState.Failed
+    finally:
+        manager.stop()
+        server.stop()
+
+
+def test_failed_feed_of_gone_server_is_retired(monkeypatch):
+    monkeypatch.setattr(client_manager, "_MIN_RETRY_INTERVAL", 0.0)
+
+    server = SyphonLoopbackServer("Flaky")
+    uuid = server.description.uuid
+    factory = FlakyFactory(failures=10)
+    manager = ClientManager(directory=LoopbackDirectory(), device=object(), client_factory=factory)
+    try:
+        manager.update()
+        server.stop()
+        manager.update()
+        assert manager.status(uuid).state == FeedState.Retired
+
+        calls = factory.calls
+        manager.update()
+        assert factory.calls == calls
+    finally:
+        manager.stop()
+
+
+def test_stop_removes_observers():
+    directory = LoopbackDirectory()
+    manager = ClientManager(directory=directory, device=object(), client_factory=FlakyFactory(failures=0))
+
+    manager.start()
+    count = len(directory.observers)
+    assert count > 0
+
+    # starting twice neither registers the observers again nor starts a second thread
+    thread = manager._thread
+    manager.start()
+    assert len(directory.observers) == count
+    assert manager._thread is thread
+
+    manager.stop()
+    assert len(directory.observers) == 0
+
+    manager.start()
+    assert len(directory.observers) == count
+    manager.stop()
+
+
+def test_client_is_stopped_if_listener_fails():
+    clients = []
+
+    class BrokenClient(SyphonLoopbackClient):
+        def add_frame_listener(self, listener):
+            raise RuntimeError("no listener")
+
+    def factory(description, device):
+        clients.append(BrokenClient(description))
+        return clients[-1]
+
+    server = SyphonLoopbackServer("Broken")
+    manager = ClientManager(directory=LoopbackDirectory(), device=object(), client_factory=factory)
+    try:
+        manager.update()
+        assert manager.status(server.description.uuid).state == FeedState.Failed
+        assert len(clients) == 1
+        assert not clients[0].is_valid
+    finally:
+        manager.stop()
+        server.stop()
+
+
+def test_retired_feeds_are_bounded(monkeypatch):
+    monkeypatch.setattr(client_manager, "_MAX_RETIRED_FEEDS", 3)
+
+    manager = ClientManager(directory=LoopbackDirectory(), device=object(), client_factory=FlakyFactory(failures=0))
+    try:
+        uuids = []
+        for i in range(5):
+            server = SyphonLoopbackServer(f"Feed {i}")
+            uuids.append(server.description.uuid)
+            manager.update()
+            server.stop()
+            manager.update()
+
+        assert list(manager.feeds) == uuids[2:]
+        assert all(f.state == FeedState.Retired for f in manager.feeds.values())
+    finally:
+        manager.stop()
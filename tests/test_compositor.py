@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from syphon.compositor import BlendMode, Compositor
+
+SIZE = 32
+
+
+def _opaque(image: np.ndarray) -> np.ndarray:
+    image = image.copy()
+    image[..., 3] = 255
+    return image
+
+
+def _reference(src: np.ndarray, dst: np.ndarray, mode: BlendMode, opacity: float) -> np.ndarray:
+    s = src.astype(np.float64)
+    d = dst.astype(np.float64)
+    alpha = s[..., 3:4] / 255 * opacity
+
+    if mode == BlendMode.Normal:
+        blend = s
+    elif mode == BlendMode.Add:
+        blend = np.minimum(s + d, 255)
+    elif mode == BlendMode.Multiply:
+        blend = s * d / 255
+    else:
+        blend = 255 - (255 - s) * (255 - d) / 255
+
+    return blend * alpha + d * (1 - alpha)
+
+
+@pytest.mark.parametrize("mode", list(BlendMode))
+@pytest.mark.parametrize("opacity", [1.0, 0.6])
+def test_blend_modes_match_float_reference(mode, opacity):
+    rng = np.random.default_rng(7)
+    background = _opaque(rng.integers(0, 256, (SIZE, SIZE, 4), dtype=np.uint8))
+    foreground = rng.integers(0, 256, (SIZE, SIZE, 4), dtype=np.uint8)
+
+    compositor = Compositor(SIZE, SIZE)
+    compositor.add_layer("background")
+    compositor.update("background", background)
+    compositor.add_layer("foreground", blend=mode, opacity=opacity)
+    compositor.update("foreground", foreground)
+
+    output = compositor.compose()
+    error = np.abs(output.astype(np.float64) - _reference(foreground, background, mode, opacity))
+    assert error.max() <= 1.3
+
+
+def test_unchanged_layers_are_skipped():
+    compositor = Compositor(SIZE, SIZE)
+    compositor.add_layer("a", x=4, y=8)
+    compositor.update("a", np.full((4, 6, 4), 255, dtype=np.uint8))
+
+    compositor.compose()
+    assert compositor.dirty_region == (0, 0, SIZE, SIZE)
+
+    compositor.compose()
+    assert compositor.dirty_region is None
+
+    # moving the layer redraws the old and the new area
+    compositor.layer("a").x = 10
+    compositor.compose()
+    assert compositor.dirty_region == (4, 8, 12, 4)
+
+    compositor.update("a", np.zeros((4, 6, 4), dtype=np.uint8))
+    compositor.compose()
+    assert compositor.dirty_region == (10, 8, 6, 4)
+
+
+def test_removed_layer_is_cleared():
+    compositor = Compositor(SIZE, SIZE)
+    compositor.add_layer("a", x=2, y=2)
+    compositor.update("a", np.full((4, 4, 4), 255, dtype=np.uint8))
+    compositor.compose()
+
+    compositor.remove_layer("a")
+    output = compositor.compose()
+    assert compositor.dirty_region == (2, 2, 4, 4)
+    assert np.array_equal(output[2:6, 2:6], np.broadcast_to(compositor.background, (4, 4, 4)))
+
+
+def test_re_added_layer_is_redrawn():
+    white = np.full((4, 4, 4), 255, dtype=np.uint8)
+    red = np.zeros((4, 4, 4), dtype=np.uint8)
+    red[..., 0] = red[..., 3] = 255
+
+    compositor = Compositor(SIZE, SIZE)
+    compositor.add_layer("a")
+    compositor.update("a", white)
+    compositor.compose()
+
+    # same key, same number of updates and same transform as before
+    compositor.remove_layer("a")
+    compositor.add_layer("a")
+    compositor.update("a", red)
+    output = compositor.compose()
+
+    assert compositor.dirty_region == (0, 0, 4, 4)
+    assert np.array_equal(output[:4, :4], red)
+
+
+@pytest.mark.parametrize("x, y", [(-3, -2), (SIZE - 2, SIZE - 1), (-3, SIZE - 1)])
+def test_layers_are_clipped(x, y):
+    image = np.random.default_rng(3).integers(0, 256, (5, 6, 4), dtype=np.uint8)
+    image[..., 3] = 255
+
+    compositor = Compositor(SIZE, SIZE)
+    compositor.add_layer("a", x=x, y=y)
+    compositor.update("a", image)
+    output = compositor.compose()
+
+    expected = np.zeros((SIZE, SIZE, 4), dtype=np.uint8)
+    expected[..., 3] = 255
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + 6, SIZE), min(y + 5, SIZE)
+    expected[y0:y1, x0:x1] = image[y0 - y:y1 - y, x0 - x:x1 - x]
+    assert np.array_equal(output, expected)
+
+
+def test_layer_outside_of_output_is_not_drawn():
+    compositor = Compositor(SIZE, SIZE)
+    compositor.compose()
+
+    compositor.add_layer("a", x=SIZE + 5, y=-20)
+    compositor.update("a", np.full((4, 4, 4), 255, dtype=np.uint8))
+    output = compositor.compose()
+
+    assert compositor.dirty_region is None
+    assert np.all(output[..., :3] == 0)
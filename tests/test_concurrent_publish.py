@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, List, Tuple
+
+import pytest
+
+from syphon.base import BaseSyphonServer
+from syphon.loopback import SyphonLoopbackClient, SyphonLoopbackServer
+
+Frame = Tuple[int, int]
+
+THREADS = 8
+FRAMES = 200
+
+
+class StandInGPU:
+    """
+    Executes command buffers in the order they were enqueued, like a Metal command queue.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enqueued: List["StandInCommandBuffer"] = []
+        self.executed: List[Frame] = []
+
+    def execute_committed(self):
+        with self.lock:
+            while self.enqueued and self.enqueued[0].committed:
+                self.executed.extend(self.enqueued.pop(0).frames)
+
+
+class StandInCommandBuffer:
+    def __init__(self, gpu: StandInGPU):
+        self.gpu = gpu
+        self.frames: List[Frame] = []
+        self.committed = False
+        self.is_enqueued = False
+
+    def enqueue(self):
+        with self.gpu.lock:
+            self.gpu.enqueued.append(self)
+        self.is_enqueued = True
+
+    def commitAndWaitUntilSubmitted(self):
+        if not self.is_enqueued:
+            self.enqueue()
+
+        # widen the race window between encoding and committing
+        time.sleep(random.random() * 0.0002)
+        self.committed = True
+        self.gpu.execute_committed()
+
+
+class StandInCommandQueue:
+    def __init__(self, gpu: StandInGPU):
+        self.gpu = gpu
+
+    def commandBuffer(self) -> StandInCommandBuffer:
+        return StandInCommandBuffer(self.gpu)
+
+
+class StandInContext:
+    def __init__(self):
+        self.encoded: List[Frame] = []
+
+    def publishFrameTexture_onCommandBuffer_imageRegion_flipped_(self, texture: Any, command_buffer: Any,
+                                                                 region: Any, flipped: bool):
+        self.encoded.append(texture.frame)
+        command_buffer.frames.append(texture.frame)
+
+
+class StandInTexture:
+    def __init__(self, frame: Frame):
+        self.frame = frame
+
+    def width(self) -> int:
+        return 64
+
+    def height(self) -> int:
+        return 64
+
+
+def hammer(publish: Callable[[Frame], Any], threads: int = THREADS, frames: int = FRAMES):
+    barrier = threading.Barrier(threads)
+    errors = []
+
+    def worker(index: int):
+        barrier.wait()
+        try:
+            for i in range(frames):
+                publish((index, i))
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert not errors
+
+
+def assert_complete_and_ordered(frames: List[Frame]):
+    per_thread = defaultdict(list)
+    for thread, index in frames:
+        per_thread[thread].append(index)
+
+    assert len(frames) == THREADS * FRAMES
+    assert all(indices == list(range(FRAMES)) for indices in per_thread.values())
+
+
+def test_metal_server_concurrent_publish():
+    server_module = pytest.importorskip("syphon.server")
+
+    gpu = StandInGPU()
+    server = server_module.SyphonMetalServer.__new__(server_module.SyphonMetalServer)
+    BaseSyphonServer.__init__(server, "Stress")
+    server.device = None
+    server.command_queue = StandInCommandQueue(gpu)
+    server.context = StandInContext()
+    server._publish_lock = threading.Lock()
+
+    hammer(lambda frame: server.publish_frame_texture(StandInTexture(frame)))
+
+    assert_complete_and_ordered(server.context.encoded)
+    assert gpu.executed == server.context.encoded
+
+
+def test_loopback_server_concurrent_publish():
+    server = SyphonLoopbackServer("Stress")
+    client = SyphonLoopbackClient(server.description)
+    notifications = []
+    client.add_frame_listener(lambda c: notifications.append(c))
+
+    try:
+        hammer(server.publish_frame_texture)
+
+        assert server.frame_count == THREADS * FRAMES
+        assert len(notifications) == server.frame_count
+        assert client.has_new_frame
+    finally:
+        client.stop()
+        server.stop()
+
+
+def test_concurrent_publish_frame_sequences_are_unique():
+    server = SyphonLoopbackServer("Sequences")
+    sequences = []
+    lock = threading.Lock()
+
+    def publish(frame: Frame):
+        metadata = server.publish_frame(frame)
+        with lock:
+            sequences.append(metadata.sequence)
+
+    try:
+        hammer(publish)
+    finally:
+        server.stop()
+
+    assert sorted(sequences) == list(range(THREADS * FRAMES))
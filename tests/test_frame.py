@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from syphon.frame import Frame
+from syphon.utils.pool import ImageBufferPool
+
+
+def create_pooled_frame(pool: ImageBufferPool, value: int = 0) -> Frame:
+    buffer = pool.acquire((4, 8, 4))
+    buffer[:] = value
+    return Frame(buffer, 8, 4, 4, on_release=pool.release)
+
+
+def test_frame_from_byte_buffer():
+    buffer = bytearray(range(2 * 3 * 4))
+    frame = Frame(buffer, 3, 2)
+
+    assert frame.shape == (2, 3, 4)
+    assert frame.nbytes == len(buffer)
+
+    # views share the memory of the buffer
+    frame.array()[0, 0, 0] = 42
+    assert buffer[0] == 42
+
+
+def test_release_returns_buffer_to_pool():
+    pool = ImageBufferPool()
+    frame = create_pooled_frame(pool)
+
+    assert pool.buffers_in_use == 1
+    frame.release()
+    frame.release()
+
+    assert frame.is_released
+    assert pool.buffers_in_use == 0
+
+
+def test_release_raises_while_array_is_alive():
+    frame = Frame(bytearray(4 * 8 * 4), 8, 4)
+    view = frame.array()
+
+    with pytest.raises(BufferError):
+        frame.release()
+
+    del view
+    frame.release()
+    assert frame.is_released
+
+
+def test_release_raises_while_asarray_view_is_alive():
+    pool = ImageBufferPool()
+    frame = create_pooled_frame(pool, value=1)
+    view = np.asarray(frame)
+
+    assert frame.export_count == 1
+    assert np.shares_memory(view, frame.array())
+
+    with pytest.raises(BufferError):
+        frame.release()
+
+    # the buffer has not been handed to another frame
+    other = create_pooled_frame(pool, value=99)
+    assert view[0, 0, 0] == 1
+    other.release()
+
+    del view
+    frame.release()
+
+
+def test_asarray_copy_and_dtype_are_not_tracked():
+    frame = Frame(bytearray(4 * 8 * 4), 8, 4)
+
+    floats = np.asarray(frame, dtype=np.float32)
+    copy = frame.copy()
+
+    assert floats.dtype == np.float32
+    frame.release()
+
+    # copies stay valid after the release
+    assert copy.shape == (4, 8, 4)
+
+
+def test_forced_release_and_released_access():
+    frame = Frame(bytearray(4 * 8 * 4), 8, 4)
+    view = frame.array()
+
+    frame.release(force=True)
+
+    with pytest.raises(BufferError):
+        frame.array()
+
+    with pytest.raises(BufferError):
+        np.asarray(frame)
+
+    del view
+
+
+def test_dlpack_export_is_tracked():
+    frame = Frame(bytearray(4 * 8 * 4), 8, 4)
+
+    if not hasattr(np, "from_dlpack"):
+        pytest.skip("NumPy does not support DLPack")
+
+    imported = np.from_dlpack(frame)
+    assert imported.shape == (4, 8, 4)
+
+    with pytest.raises(BufferError):
+        frame.release()
+
+    del imported
+    frame.release()
+
+
+def test_context_manager_releases_frame():
+    pool = ImageBufferPool()
+
+    with create_pooled_frame(pool) as frame:
+        assert not frame.is_released
+
+    assert frame.is_released
+    assert pool.buffers_in_use == 0
@@ -0,0 +1,144 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from syphon.utils.frame_ring import SharedFrameRing
+
+
+@pytest.fixture
+def ring_factory():
+    rings = []
+
+    def create(**kwargs) -> SharedFrameRing:
+        ring = SharedFrameRing(8, 4, **kwargs)
+        rings.append(ring)
+        return ring
+
+    yield create
+
+    for ring in rings:
+        ring.close()
+        ring.unlink()
+
+
+def _image(value: int) -> np.ndarray:
+    return np.full((4, 8, 4), value, dtype=np.uint8)
+
+
+def test_acquire_latest_pins_and_releases(ring_factory):
+    ring = ring_factory(slot_count=3)
+    assert ring.acquire_latest() is None
+
+    assert ring.write_image(_image(1), timestamp=1.0) == 0
+    assert ring.write_image(_image(2), timestamp=2.0) == 1
+
+    frame = ring.acquire_latest()
+    assert (frame.sequence, frame.timestamp) == (1, 2.0)
+    assert np.array_equal(frame.image, _image(2))
+    assert ring._slots["pins"][frame.slot] == 1
+
+    # nothing newer than the acquired frame
+    assert ring.acquire_latest(after=frame.sequence) is None
+
+    frame.release()
+    frame.release()
+    assert ring._slots["pins"][frame.slot] == 0
+
+
+def test_pinned_slot_is_not_reused(ring_factory):
+    ring = ring_factory(slot_count=3)
+    ring.write_image(_image(0))
+
+    with ring.acquire_latest() as pinned:
+        for value in range(1, 20):
+            assert ring.write_image(_image(value)) is not None
+            assert np.array_equal(pinned.image, _image(0))
+            assert ring.latest_sequence == value
+
+    assert ring.dropped_frames == 0
+
+
+def test_frames_are_dropped_when_every_slot_is_pinned(ring_factory):
+    ring = ring_factory(slot_count=2)
+
+    ring.write_image(_image(0))
+    first = ring.acquire_latest()
+    ring.write_image(_image(1))
+    second = ring.acquire_latest()
+
+    # one slot is pinned, the other one is pinned and the latest frame
+    assert ring.write_image(_image(2)) is None
+    assert ring.dropped_frames == 1
+    assert ring.latest_sequence == 1
+    assert np.array_equal(first.image, _image(0))
+
+    first.release()
+    assert ring.write_image(_image(3)) == 2
+    second.release()
+
+
+def test_failed_write_frees_the_slot(ring_factory):
+    ring = ring_factory(slot_count=2)
+
+    def fail(slot: np.ndarray):
+        raise RuntimeError("fill failed")
+
+    with pytest.raises(RuntimeError):
+        ring.write(fail)
+
+    assert ring.latest_sequence == -1
+    assert ring.write_image(_image(1)) == 0
+    assert ring.write_image(_image(2)) == 1
+
+
+def _child(ring: SharedFrameRing, results):
+    with ring.acquire_latest(timeout=5.0) as frame:
+        results.put((frame.sequence, int(frame.image.sum())))
+
+    ring.write_image(np.full((ring.height, ring.width, ring.channels), 7, dtype=np.uint8), timestamp=42.0)
+    ring.close()
+
+
+def test_ring_is_shared_with_child_process(ring_factory):
+    ring = ring_factory(slot_count=3)
+    ring.write_image(_image(3))
+
+    # the default context of the ring, on macOS the ring is pickled into the spawned child
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    process = context.Process(target=_child, args=(ring, results))
+    process.start()
+    try:
+        assert results.get(timeout=30.0) == (0, 3 * 8 * 4 * 4)
+    finally:
+        process.join(30.0)
+
+    assert process.exitcode == 0
+
+    frame = ring.acquire_latest(after=0)
+    assert (frame.sequence, frame.timestamp) == (1, 42.0)
+    assert np.array_equal(frame.image, _image(7))
+    frame.release()
+    assert ring._slots["pins"].sum() == 0
+
+
+def test_attached_ring_shares_memory(ring_factory):
+    ring = ring_factory(slot_count=3)
+    ring.write_image(_image(5), timestamp=5.0)
+
+    # the state a child process unpickles the ring from
+    attached = SharedFrameRing.__new__(SharedFrameRing)
+    attached.__setstate__(ring.__getstate__())
+    try:
+        assert (attached.width, attached.height, attached.channels, attached.slot_count) == (8, 4, 4, 3)
+
+        with attached.acquire_latest() as frame:
+            assert (frame.sequence, frame.timestamp) == (0, 5.0)
+            assert np.array_equal(frame.image, _image(5))
+            assert ring._slots["pins"][frame.slot] == 1
+
+        attached.write_image(_image(6))
+        assert ring.latest_sequence == 1
+    finally:
+        attached.close()
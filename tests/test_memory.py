@@ -0,0 +1,119 @@
+import gc
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from syphon.utils.memory import MemoryBudgetExceededException, MemoryKind, MemoryRegistry
+from syphon.utils.pool import ImageBufferPool
+
+
+def test_track_and_untrack():
+    registry = MemoryRegistry()
+    handle = registry.track(None, 100, "server:a", MemoryKind.Texture, "frame")
+    registry.track(None, 50, "client:b")
+
+    stats = registry.stats()
+    assert stats.total_bytes == 150
+    assert stats.by_owner == {"server:a": 100, "client:b": 50}
+    assert stats.by_kind == {"texture": 100, "buffer": 50}
+    assert [a.label for a in registry.allocations("server:a")] == ["frame"]
+
+    registry.untrack(handle)
+    registry.untrack(handle)
+    assert registry.total_bytes == 50
+    assert registry.stats().peak_bytes == 150
+
+
+def test_freed_objects_are_untracked():
+    registry = MemoryRegistry()
+    buffer = np.empty(1000, dtype=np.uint8)
+    registry.track(buffer, buffer.nbytes, "pool:test")
+    assert registry.total_bytes == 1000
+
+    del buffer
+    gc.collect()
+    assert registry.total_bytes == 0
+
+
+def test_budget_is_enforced():
+    registry = MemoryRegistry(budget=100)
+    registry.track(None, 80, "a")
+
+    with pytest.raises(MemoryBudgetExceededException) as info:
+        registry.track(None, 30, "b")
+
+    assert info.value.requested == 30
+    assert info.value.total == 80
+    assert registry.total_bytes == 80
+
+
+def test_evictors_free_idle_memory():
+    registry = MemoryRegistry(budget=100)
+    idle = [registry.track(None, 40, "pool"), registry.track(None, 40, "pool")]
+    requests = []
+
+    def evictor(nbytes: int) -> int:
+        requests.append(nbytes)
+        registry.untrack(idle.pop())
+        return 40
+
+    registry.add_evictor(evictor)
+    registry.track(None, 50, "frame")
+
+    assert requests == [30]
+    assert registry.total_bytes == 90
+    assert registry.stats().evicted_bytes == 40
+
+
+def test_pool_evicts_idle_buffers():
+    import syphon.utils.memory as memory
+
+    registry = MemoryRegistry()
+    previous, memory._registry = memory._registry, registry
+    try:
+        pool = ImageBufferPool(name="evict")
+        pool.release(pool.acquire((10, 10, 4)))
+        assert registry.total_bytes == 400
+
+        registry.budget = 1000
+        buffer = pool.acquire((20, 10, 4))
+        gc.collect()
+
+        assert registry.total_bytes == buffer.nbytes
+    finally:
+        memory._registry = previous
+
+
+def test_budget_holds_under_concurrency():
+    budget = 1000
+    registry = MemoryRegistry(budget=budget)
+    barrier = threading.Barrier(16)
+    accepted = []
+    peaks = []
+
+    def worker():
+        barrier.wait()
+        for _ in range(20):
+            try:
+                accepted.append(registry.track(None, 100, "thread"))
+            except MemoryBudgetExceededException:
+                pass
+            peaks.append(registry.total_bytes)
+
+    # switch threads as often as possible to interleave the budget checks
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(accepted) == budget // 100
+    assert max(peaks) <= budget
+    assert registry.stats().peak_bytes <= budget
@@ -0,0 +1,113 @@
+import pytest
+
+from syphon import pacing
+from syphon.pacing import FramePacer
+
+FPS = 60.0
+PERIOD = 1.0 / FPS
+
+
+class Clock:
+    """
+    Patched clock where sleeping oversleeps a little and every read takes a tick, so spinning ends.
+    """
+
+    def __init__(self, oversleep: float = 0.0005, tick: float = 0.00001):
+        self.now = 100.0
+        self.oversleep = oversleep
+        self.tick = tick
+
+    def perf_counter(self) -> float:
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, duration: float):
+        self.now += duration + self.oversleep
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pacing.time, "perf_counter", clock.perf_counter)
+    monkeypatch.setattr(pacing.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_blocking_schedule_does_not_drift(clock):
+    pacer = FramePacer(FPS)
+
+    assert pacer.wait()
+    origin = clock.now
+
+    for n in range(1, 1001):
+        # the producer takes a varying part of the frame time
+        clock.now += PERIOD * (n % 7) / 10
+        assert pacer.wait()
+        assert clock.now - (origin + n * PERIOD) < 0.0002
+
+    stats = pacer.stats
+    assert stats.frames == 1001
+    assert stats.deadline_misses == 0
+    assert stats.achieved_fps == pytest.approx(FPS, rel=1e-3)
+
+
+def test_non_blocking_drops_early_frames(clock):
+    # a binary frame period and no clock ticks keep the producer exactly in phase with the deadlines
+    clock.tick = 0.0
+    period = 1.0 / 64
+    pacer = FramePacer(64, blocking=False)
+
+    accepted = 0
+    for _ in range(1200):
+        accepted += pacer.wait()
+        # the producer runs at twice the target rate
+        clock.now += period / 2
+
+    stats = pacer.stats
+    assert accepted == stats.frames
+    assert stats.frames + stats.dropped_frames == 1200
+    assert stats.frames == pytest.approx(600, abs=2)
+    assert stats.deadline_misses == 0
+
+
+def test_resynchronizes_after_stall(clock):
+    pacer = FramePacer(FPS)
+    pacer.wait()
+    origin = clock.now
+    for _ in range(10):
+        pacer.wait()
+
+    # a stall of one second skips the missed deadlines instead of catching up with a burst
+    clock.now += 1.0
+    before = clock.now
+    assert pacer.wait()
+    assert clock.now - before < 0.001
+    assert pacer.stats.deadline_misses >= 59
+
+    # the following frames stay on the original grid
+    next_deadline = pacer.next_deadline
+    assert 0 < next_deadline - clock.now <= PERIOD
+    assert (next_deadline - origin) / PERIOD == pytest.approx(round((next_deadline - origin) / PERIOD), abs=1e-6)
+
+    pacer.wait()
+    assert clock.now - next_deadline < 0.0002
+    assert pacer.stats.deadline_misses < 62
+
+
+def test_reset_restarts_the_grid(clock):
+    pacer = FramePacer(FPS)
+    pacer.wait()
+    pacer.wait()
+    pacer.reset()
+
+    assert pacer.next_deadline is None
+    clock.now += 0.3
+    pacer.wait()
+    assert pacer.next_deadline == pytest.approx(clock.now + PERIOD, abs=1e-4)
+    assert pacer.stats.frames == 1
+    assert pacer.stats.deadline_misses == 0
+
+
+def test_invalid_frame_rate():
+    with pytest.raises(ValueError):
+        FramePacer(0)
@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from syphon.processing import (EveryNthFrame, FrameProcessor, FrameScheduler, FrameSource, LatestOnly,
+                               SyntheticFrameSource, TimeSampling)
+
+
+class ListFrameSource(FrameSource):
+    def __init__(self, frames: List[np.ndarray]):
+        self.frames = list(frames)
+
+    def read(self, timeout: float):
+        if not self.frames:
+            return None
+        return self.frames.pop(0), 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.frames)
+
+
+def frame_value(image: np.ndarray) -> int:
+    return int(image[0, 0, 0])
+
+
+def fail_on_frame_two(image: np.ndarray) -> int:
+    value = frame_value(image)
+    if value == 2:
+        raise ValueError("frame two")
+    return value
+
+
+def complete(scheduler: FrameScheduler, index: int, result: int):
+    scheduler.complete(index, result, worker_id=1, submitted_at=0.0, started_at=0.0, finished_at=0.0)
+
+
+def test_scheduler_releases_results_in_order():
+    scheduler = FrameScheduler(max_in_flight=3)
+    indices = [scheduler.admit(float(t)) for t in range(3)]
+
+    assert indices == [0, 1, 2]
+    assert not scheduler.has_capacity
+    assert scheduler.admit(3.0) is None
+    assert scheduler.stats.dropped == 1
+
+    complete(scheduler, 2, 20)
+    complete(scheduler, 1, 10)
+    assert scheduler.pop_ready() == []
+
+    complete(scheduler, 0, 0)
+    assert scheduler.pop_ready() == [(0, 0), (1, 10), (2, 20)]
+    assert scheduler.in_flight == 0
+    assert scheduler.stats.completed == 3
+
+
+def test_scheduler_skips_cancelled_and_failed_frames():
+    scheduler = FrameScheduler(max_in_flight=4)
+    for t in range(3):
+        scheduler.admit(float(t))
+
+    scheduler.cancel(0)
+    error = ValueError("failed")
+    scheduler.fail(1, error)
+    complete(scheduler, 2, 20)
+
+    assert scheduler.pop_ready() == [(2, 20)]
+    assert scheduler.in_flight == 0
+    assert scheduler.stats.failed == 1
+    assert scheduler.stats.last_error is error
+    assert scheduler.stats.submitted == 2
+
+
+def test_policies():
+    every_second = FrameScheduler(max_in_flight=10, policy=EveryNthFrame(2))
+    admitted = [every_second.admit(float(t)) for t in range(6)]
+    assert admitted == [0, None, 1, None, 2, None]
+    assert every_second.stats.skipped == 3
+
+    sampling = FrameScheduler(max_in_flight=10, policy=TimeSampling(1.0))
+    admitted = [sampling.admit(t) for t in (0.0, 0.5, 1.0, 1.2, 2.5)]
+    assert admitted == [0, None, 1, None, 2]
+
+    assert LatestOnly.drop_when_busy
+
+
+def test_processor_delivers_synthetic_frames_in_order():
+    results = []
+    source = SyntheticFrameSource(8, 4, fps=0, frame_count=12)
+    processor = FrameProcessor(source, frame_value, workers=3, executor_factory=ThreadPoolExecutor,
+                               on_result=lambda index, result: results.append(result))
+
+    processor.run()
+    processor.close()
+
+    assert results == list(range(12))
+    assert processor.stats.completed == 12
+
+
+def test_processor_continues_after_failed_frame():
+    results = []
+    errors = []
+    source = SyntheticFrameSource(8, 4, fps=0, frame_count=8)
+    processor = FrameProcessor(source, fail_on_frame_two, workers=2, executor_factory=ThreadPoolExecutor,
+                               on_result=lambda index, result: results.append(result),
+                               on_error=lambda index, error: errors.append(index))
+
+    processor.run()
+    processor.close()
+
+    assert results == [0, 1, 3, 4, 5, 6, 7]
+    assert errors == [2]
+    assert processor.stats.failed == 1
+    assert isinstance(processor.stats.last_error, ValueError)
+    assert processor.scheduler.in_flight == 0
+
+
+def test_latest_only_admits_one_frame_per_worker():
+    source = SyntheticFrameSource(8, 4, fps=0, frame_count=1)
+    processor = FrameProcessor(source, frame_value, workers=3, policy=LatestOnly(),
+                               executor_factory=ThreadPoolExecutor)
+    assert processor.scheduler.max_in_flight == 3
+
+    processor = FrameProcessor(source, frame_value, workers=3, policy=LatestOnly(), max_in_flight=10,
+                               executor_factory=ThreadPoolExecutor)
+    assert processor.scheduler.max_in_flight == 3
+
+    processor = FrameProcessor(source, frame_value, workers=3, executor_factory=ThreadPoolExecutor)
+    assert processor.scheduler.max_in_flight == 6
+
+
+def test_latest_only_drops_frames_while_workers_are_busy():
+    gate = threading.Event()
+
+    def blocking(image: np.ndarray) -> int:
+        gate.wait(5.0)
+        return frame_value(image)
+
+    frames = [np.full((4, 8, 4), i, dtype=np.uint8) for i in range(6)]
+    processor = FrameProcessor(ListFrameSource(frames), blocking, workers=2, policy=LatestOnly(),
+                               executor_factory=ThreadPoolExecutor)
+    try:
+        for _ in range(6):
+            processor.step(timeout=0)
+        assert processor.scheduler.in_flight == 2
+        assert processor.stats.dropped == 4
+    finally:
+        gate.set()
+        processor.close()
+
+
+def test_results_in_flight_during_resize_are_returned():
+    def slow(image: np.ndarray) -> int:
+        # the first frames are still in flight when the frame size changes
+        time.sleep(0.05)
+        return frame_value(image)
+
+    frames = [np.full((4, 8, 4), i, dtype=np.uint8) for i in range(3)]
+    frames += [np.full((6, 10, 4), i, dtype=np.uint8) for i in range(3, 6)]
+    processor = FrameProcessor(ListFrameSource(frames), slow, workers=2, max_in_flight=4,
+                               executor_factory=ThreadPoolExecutor)
+
+    released = []
+    while processor.source.is_open:
+        released.extend(processor.step(timeout=0))
+    released.extend(processor.flush())
+    processor.close()
+
+    assert [result for _, result in released] == list(range(6))
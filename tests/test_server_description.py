@@ -0,0 +1,76 @@
+import gc
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from syphon.server_description import SyphonServerDescription
+
+
+def create_raw(uuid: str, name: str = "Server", app_name: str = "App"):
+    return {
+        "SyphonServerDescriptionUUIDKey": uuid,
+        "SyphonServerDescriptionNameKey": name,
+        "SyphonServerDescriptionAppNameKey": app_name,
+        "SyphonServerDescriptionIconKey": None,
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_interned():
+    SyphonServerDescription.prune_interned(())
+    yield
+    SyphonServerDescription.prune_interned(())
+
+
+def test_from_raw_reads_fields_lazily():
+    description = SyphonServerDescription.from_raw(create_raw("a", "Camera", "Capture"))
+
+    assert description.uuid == "a"
+    assert description.name == "Camera"
+    assert description.app_name == "Capture"
+    assert description.icon is None
+
+
+def test_descriptions_are_immutable_and_compare_by_uuid():
+    description = SyphonServerDescription("a", "Camera")
+
+    with pytest.raises(FrozenInstanceError):
+        description.name = "Other"
+
+    assert description == SyphonServerDescription("a", "Renamed")
+    assert len({description, SyphonServerDescription("a", "Renamed")}) == 1
+
+
+def test_interned_across_polls_without_references():
+    first_id = id(SyphonServerDescription.from_raw(create_raw("a")))
+    first = SyphonServerDescription.from_raw(create_raw("a"))
+    del first
+    gc.collect()
+
+    # the caller dropped every reference, the next poll still returns the interned instance
+    kept = SyphonServerDescription._interned["a"]
+    assert id(kept) == first_id
+    assert SyphonServerDescription.from_raw(create_raw("a")) is kept
+
+
+def test_changed_information_creates_new_description():
+    first = SyphonServerDescription.from_raw(create_raw("a", "Camera"))
+    renamed = SyphonServerDescription.from_raw(create_raw("a", "Renamed"))
+
+    assert renamed is not first
+    assert renamed.name == "Renamed"
+    assert SyphonServerDescription.from_raw(create_raw("a", "Renamed")) is renamed
+
+
+def test_prune_and_forget_interned():
+    a = SyphonServerDescription.from_raw(create_raw("a"))
+    SyphonServerDescription.from_raw(create_raw("b"))
+    SyphonServerDescription.from_raw(create_raw("c"))
+
+    SyphonServerDescription.prune_interned(["a", "b"])
+    assert set(SyphonServerDescription._interned) == {"a", "b"}
+
+    SyphonServerDescription.forget_interned("b")
+    SyphonServerDescription.forget_interned("unknown")
+    assert set(SyphonServerDescription._interned) == {"a"}
+    assert SyphonServerDescription.from_raw(create_raw("a")) is a
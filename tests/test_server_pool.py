@@ -0,0 +1,95 @@
+import threading
+import time
+
+from syphon.loopback import SyphonLoopbackServer, loopback_servers
+from syphon.server_pool import ServerPool
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def test_acquire_renames_ready_server():
+    with ServerPool(size=2, factory=SyphonLoopbackServer) as pool:
+        assert wait_until(lambda: pool.available == 2)
+
+        server = pool.acquire("Output")
+        assert server.name == "Output"
+        assert server.description.name == "Output"
+        assert pool.stats.hits == 1
+
+        # the pool is refilled in the background
+        assert wait_until(lambda: pool.available == 2)
+        pool.release(server)
+        assert pool.stats.recycled == 1
+
+    assert not [s for s in loopback_servers() if s.name == "Standby"]
+
+
+def test_acquire_without_ready_server_creates_one():
+    pool = ServerPool(size=1, factory=SyphonLoopbackServer, start=False)
+
+    server = pool.acquire("Output")
+    assert server.name == "Output"
+    assert pool.stats.misses == 1
+
+    server.stop()
+    pool.close()
+
+
+def test_released_servers_are_reused():
+    allow_creation = threading.Event()
+    created = []
+
+    def factory(name: str) -> SyphonLoopbackServer:
+        # only the first server is created right away, the refill after acquire() is held back
+        if created:
+            allow_creation.wait()
+        created.append(SyphonLoopbackServer(name))
+        return created[-1]
+
+    with ServerPool(size=1, factory=factory, recycle=False) as pool:
+        assert wait_until(lambda: pool.available == 1)
+        server = pool.acquire("Output")
+
+        pool.release(server)
+        assert server.name == "Standby"
+        assert pool.stats.reused == 1
+        assert pool.acquire("Again") is server
+
+        pool.release(server)
+        allow_creation.set()
+
+
+def test_refill_retries_after_factory_errors():
+    failures = [RuntimeError("no device"), RuntimeError("no device")]
+
+    def factory(name: str) -> SyphonLoopbackServer:
+        if failures:
+            raise failures.pop(0)
+        return SyphonLoopbackServer(name)
+
+    with ServerPool(size=1, factory=factory) as pool:
+        assert wait_until(lambda: pool.available == 1)
+
+        stats = pool.stats
+        assert stats.errors == 2
+        assert isinstance(stats.last_error, RuntimeError)
+        assert stats.created == 1
+
+
+def test_close_interrupts_retry_back_off():
+    def factory(name: str) -> SyphonLoopbackServer:
+        raise RuntimeError("no device")
+
+    pool = ServerPool(size=1, factory=factory)
+    assert wait_until(lambda: pool.stats.errors >= 3)
+
+    start = time.monotonic()
+    pool.close()
+    assert time.monotonic() - start < 1.0
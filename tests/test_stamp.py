@@ -0,0 +1,98 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from syphon.loopback import SyphonLoopbackClient, SyphonLoopbackServer
+from syphon.metadata import FrameMetadata, LatencyHistogram
+from syphon.utils.stamp import STAMP_WIDTH, decode_frame_stamp, decode_stamp_strip, encode_frame_stamp
+
+
+def create_image(width: int = STAMP_WIDTH + 8, height: int = 4) -> np.ndarray:
+    return np.full((height, width, 4), 77, dtype=np.uint8)
+
+
+def test_stamp_round_trip():
+    image = create_image()
+    encode_frame_stamp(image, 1234, 987654321)
+
+    assert decode_frame_stamp(image) == (1234, 987654321)
+
+    # only the stamp strip is written
+    assert (image[0, STAMP_WIDTH:] == 77).all()
+    assert (image[1:] == 77).all()
+
+
+def test_stamp_wraps_to_64_bit():
+    image = create_image()
+    encode_frame_stamp(image, 2 ** 64 + 5, -1)
+
+    assert decode_frame_stamp(image) == (5, 2 ** 64 - 1)
+
+
+def test_stamp_is_found_in_flipped_and_bgra_images():
+    image = create_image()
+    encode_frame_stamp(image, 7, 42)
+
+    assert decode_frame_stamp(image[::-1]) == (7, 42)
+    assert decode_frame_stamp(image[..., [2, 1, 0, 3]]) == (7, 42)
+
+
+def test_images_without_stamp():
+    assert decode_frame_stamp(create_image()) is None
+    assert decode_frame_stamp(create_image(width=STAMP_WIDTH - 1)) is None
+    assert decode_stamp_strip(np.zeros((STAMP_WIDTH, 4), dtype=np.uint8)) is None
+
+
+def test_encode_rejects_narrow_images():
+    with pytest.raises(AssertionError):
+        encode_frame_stamp(create_image(width=STAMP_WIDTH - 1), 0, 0)
+
+
+def test_metadata_round_trip_through_loopback():
+    server = SyphonLoopbackServer("Stamped")
+    client = SyphonLoopbackClient(server.description)
+
+    try:
+        image = create_image()
+        metadata = server.new_frame_metadata()
+        encode_frame_stamp(image, metadata.sequence, metadata.timestamp_ns)
+        server.publish_frame(image, metadata=metadata)
+
+        frame, received = client.wait_for_frame(timeout=1.0, decode_stamp=True)
+
+        assert received.sequence == metadata.sequence
+        assert received.produced_at == pytest.approx(metadata.produced_at, abs=1e-6)
+        assert received.latency is not None and received.latency >= 0
+        assert client.latency.count == 1
+    finally:
+        client.stop()
+        server.stop()
+
+
+def test_metadata_timestamps():
+    now = time.monotonic()
+    metadata = FrameMetadata(3, produced_at=now, received_at=now + 0.25)
+
+    assert metadata.timestamp_ns == int(round(now * 1e9))
+    assert metadata.latency == pytest.approx(0.25)
+    assert FrameMetadata(0).latency is None
+    assert FrameMetadata(0).timestamp_ns == 0
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(minimum=0.001, maximum=1.0, bins_per_decade=1)
+    for value in (0.0005, 0.005, 0.005, 0.05, 5.0):
+        histogram.add(value)
+
+    assert histogram.count == 5
+    assert histogram.mean == pytest.approx(sum((0.0005, 0.005, 0.005, 0.05, 5.0)) / 5)
+    assert histogram.maximum == 5.0
+    assert histogram.percentile(50) == pytest.approx(0.01)
+    assert histogram.percentile(100) == 5.0
+    assert histogram.items()[-1] == (math.inf, 1)
+
+    histogram.reset()
+    assert histogram.count == 0
+    assert histogram.percentile(50) == 0.0
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from syphon import thumbnails
+from syphon.loopback import SyphonLoopbackClient, SyphonLoopbackServer, loopback_servers
+from syphon.thumbnails import ThumbnailSampler
+
+
+class LoopbackDirectory:
+    @property
+    def servers(self):
+        return loopback_servers()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(thumbnails.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def servers():
+    created = []
+
+    def create(name: str, publish: bool = True) -> SyphonLoopbackServer:
+        server = SyphonLoopbackServer(name)
+        if publish:
+            server.publish_frame_texture(np.full((360, 640, 4), len(created), dtype=np.uint8))
+        created.append(server)
+        return server
+
+    yield create
+
+    for server in created:
+        server.stop()
+
+
+def create_sampler(**kwargs) -> ThumbnailSampler:
+    options = dict(samples_per_second=100.0, min_interval=0.0, idle_timeout=1.0, connect_timeout=0.5,
+                   refresh_interval=0.0, client_factory=lambda description, _: SyphonLoopbackClient(description))
+    options.update(kwargs)
+    return ThumbnailSampler(LoopbackDirectory(), **options)
+
+
+def test_open_clients_are_bounded(clock, servers):
+    for i in range(10):
+        servers(f"Feed {i}")
+
+    sampler = create_sampler(max_clients=3)
+    max_open = 0
+    for _ in range(40):
+        sampler.update()
+        max_open = max(max_open, sampler.stats.open_clients)
+        clock.now += 0.01
+    sampler.stop()
+
+    assert max_open == 3
+    assert len(sampler.thumbnails) == 10
+    assert {t.image.shape for t in sampler.thumbnails.values()} == {(90, 160, 4)}
+    assert {t.source_size for t in sampler.thumbnails.values()} == {(640, 360)}
+
+
+def test_idle_clients_are_released(clock, servers):
+    servers("Feed")
+    sampler = create_sampler(min_interval=10.0)
+
+    assert sampler.update()
+    assert sampler.stats.open_clients == 1
+
+    clock.now += 0.5
+    sampler.update()
+    assert sampler.stats.open_clients == 1
+
+    clock.now += 1.0
+    sampler.update()
+    stats = sampler.stats
+    assert stats.open_clients == 0
+    assert stats.clients_released == 1
+
+    # the thumbnail stays until the server retires
+    assert len(sampler.thumbnails) == 1
+
+
+def test_retired_servers_are_pruned(clock, servers):
+    kept = servers("Kept")
+    retired = servers("Retired")
+    sampler = create_sampler()
+
+    for _ in range(4):
+        sampler.update()
+        clock.now += 0.01
+    assert set(sampler.thumbnails) == {kept.description.uuid, retired.description.uuid}
+
+    retired.stop()
+    sampler.update()
+    sampler.stop()
+
+    assert set(sampler.thumbnails) == {kept.description.uuid}
+    assert sampler.stats.servers == 1
+    assert sampler.stats.open_clients == 0
+
+
+def test_failed_server_is_retried(clock, servers):
+    server = servers("Late", publish=False)
+    sampler = create_sampler(min_interval=1.0)
+
+    # the client waits for the first frame until the connect timeout passed
+    assert not sampler.update()
+    assert sampler.stats.open_clients == 1
+
+    clock.now += 0.6
+    assert not sampler.update()
+    stats = sampler.stats
+    assert stats.failures == 1
+    assert stats.open_clients == 0
+
+    # the server is not retried before the regular interval
+    server.publish_frame_texture(np.zeros((40, 80, 4), dtype=np.uint8))
+    clock.now += 0.5
+    assert not sampler.update()
+    assert sampler.stats.clients_opened == 1
+
+    clock.now += 0.5
+    sampler.update()
+    sampler.update()
+    sampler.stop()
+
+    thumbnail = sampler.thumbnail(server.description.uuid)
+    assert thumbnail is not None
+    assert thumbnail.image.shape == (40, 80, 4)
+    assert sampler.stats.clients_opened == 2
@@ -0,0 +1,102 @@
+import threading
+
+import numpy as np
+import pytest
+
+from syphon.utils import yuv
+from syphon.utils.yuv import YUVConverter, YUVStandard, i420_to_rgba, nv12_to_rgba, split_i420, split_nv12, \
+    uyvy_to_rgba
+
+# (y, cb, cr) -> rgb reference values of 100% colour bars
+REFERENCE_VALUES = [
+    (YUVStandard.BT709, False, (235, 128, 128), (255, 255, 255)),
+    (YUVStandard.BT709, False, (16, 128, 128), (0, 0, 0)),
+    (YUVStandard.BT709, False, (63, 102, 240), (255, 0, 0)),
+    (YUVStandard.BT709, False, (173, 42, 26), (0, 255, 0)),
+    (YUVStandard.BT709, False, (32, 240, 118), (0, 0, 255)),
+    (YUVStandard.BT601, False, (81, 90, 240), (255, 0, 0)),
+    (YUVStandard.BT601, False, (145, 54, 34), (0, 255, 0)),
+    (YUVStandard.BT601, True, (76, 85, 255), (255, 0, 0)),
+    (YUVStandard.BT601, True, (255, 128, 128), (255, 255, 255)),
+]
+
+
+@pytest.mark.parametrize("standard, full_range, ycbcr, expected", REFERENCE_VALUES)
+def test_reference_values(standard, full_range, ycbcr, expected):
+    y, cb, cr = ycbcr
+    rgba = YUVConverter(standard, full_range).i420_to_rgba(np.full((2, 2), y, np.uint8),
+                                                           np.full((1, 1), cb, np.uint8),
+                                                           np.full((1, 1), cr, np.uint8))
+
+    assert np.abs(rgba[..., :3].astype(np.int32) - expected).max() <= 2
+    assert (rgba[..., 3] == 255).all()
+
+
+def test_formats_agree():
+    rng = np.random.default_rng(0)
+    width, height = 8, 4
+    y = rng.integers(0, 256, (height, width), dtype=np.uint8)
+    u = rng.integers(0, 256, (height // 2, width // 2), dtype=np.uint8)
+    v = rng.integers(0, 256, (height // 2, width // 2), dtype=np.uint8)
+
+    i420 = i420_to_rgba(y, u, v)
+    nv12 = nv12_to_rgba(y, np.stack([u, v], axis=-1))
+    np.testing.assert_array_equal(i420, nv12)
+
+    # the same chroma in 4:2:2 (one chroma row per luma row)
+    uyvy = np.empty((height, width // 2, 4), dtype=np.uint8)
+    uyvy[..., 0] = np.repeat(u, 2, axis=0)
+    uyvy[..., 1] = y[:, 0::2]
+    uyvy[..., 2] = np.repeat(v, 2, axis=0)
+    uyvy[..., 3] = y[:, 1::2]
+    np.testing.assert_array_equal(uyvy_to_rgba(uyvy.reshape(height, width * 2)), i420)
+
+
+def test_chroma_is_not_shared_between_columns():
+    y = np.full((2, 4), 128, np.uint8)
+    u = np.array([[128, 240]], np.uint8)
+    v = np.array([[128, 128]], np.uint8)
+
+    rgba = i420_to_rgba(y, u, v)
+
+    np.testing.assert_array_equal(rgba[:, 0], rgba[:, 1])
+    assert rgba[0, 2, 2] > rgba[0, 0, 2]
+
+
+def test_split_planes_are_views():
+    width, height = 4, 2
+    frame = np.arange(width * height * 3 // 2, dtype=np.uint8)
+
+    y, u, v = split_i420(frame, width, height)
+    assert y.shape == (2, 4) and u.shape == (1, 2) and v.shape == (1, 2)
+    assert np.shares_memory(y, frame) and np.shares_memory(v, frame)
+
+    y, uv = split_nv12(frame, width, height)
+    assert uv.shape == (1, 2, 2)
+    assert uv[0, 1, 1] == frame[-1]
+
+
+def test_functions_reuse_scratch_buffers():
+    y = np.zeros((4, 8), np.uint8)
+    uv = np.full((2, 4, 2), 128, np.uint8)
+    out = np.empty((4, 8, 4), np.uint8)
+
+    nv12_to_rgba(y, uv, out)
+    scratch = dict(yuv._cached_converter(YUVStandard.BT709, False)._scratch)
+    nv12_to_rgba(y, uv, out)
+
+    converter = yuv._cached_converter(YUVStandard.BT709, False)
+    assert converter._scratch.keys() == scratch.keys()
+    assert all(converter._scratch[key] is buffer for key, buffer in scratch.items())
+
+    yuv.clear_cached_converters()
+    assert not converter._scratch
+
+
+def test_cached_converters_are_per_thread():
+    converters = []
+    thread = threading.Thread(target=lambda: converters.append(yuv._cached_converter(YUVStandard.BT709, False)))
+    thread.start()
+    thread.join()
+
+    assert converters[0] is not yuv._cached_converter(YUVStandard.BT709, False)